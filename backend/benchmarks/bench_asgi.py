@@ -0,0 +1,118 @@
+"""
+Concurrency: WSGI (thread pool) vs ASGI, both serving the same sync views.
+
+The applications are called in-process, so only the Django stack is measured:
+WSGI requests run on ``concurrency`` threads, ASGI requests are ``concurrency``
+concurrent coroutines on one event loop. Set DATABASE_URL to run against Postgres.
+
+    python -m benchmarks.bench_asgi [concurrency] [requests] [tasks]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.utils import test_database
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from rest_framework.authtoken.models import Token
+
+from todo_app.models import Task
+
+PATHS = ['/api/v1/tasks/', '/api/v1/tasks/?page_size=20&ordering=title', '/api/v1/auth/me/']
+
+
+def wsgi_get(app, path, token):
+    url, _, query = path.partition('?')
+    environ = {'PATH_INFO': url, 'QUERY_STRING': query, 'HTTP_AUTHORIZATION': f'Token {token}',
+               'HTTP_HOST': 'localhost'}
+    setup_testing_defaults(environ)
+    status = []
+    body = b''.join(app(environ, lambda code, headers, exc_info=None: status.append(code)))
+    return int(status[0].split()[0]), body
+
+
+async def asgi_get(app, path, token):
+    url, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': url, 'raw_path': url.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'authorization', f'Token {token}'.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    messages = []
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # Django waits for a disconnect while the view runs and cancels the wait once it responds
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return messages[0]['status'], body
+
+
+def summarize(name, timings, elapsed, statuses):
+    timings.sort()
+    errors = sum(1 for status in statuses if status != 200)
+    print(
+        f'{name:<28} {len(timings) / elapsed:>9.1f} req/s  p50 {statistics.median(timings) * 1000:>8.2f} ms  '
+        f'p95 {timings[int(len(timings) * 0.95) - 1] * 1000:>8.2f} ms  errors {errors}'
+    )
+
+
+def run_wsgi(app, token, concurrency, requests):
+    def one(i):
+        start = time.perf_counter()
+        status, _ = wsgi_get(app, PATHS[i % len(PATHS)], token)
+        return time.perf_counter() - start, status
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - start
+    return [timing for timing, _ in results], elapsed, [status for _, status in results]
+
+
+async def run_asgi(app, token, concurrency, requests):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            status, _ = await asgi_get(app, PATHS[i % len(PATHS)], token)
+            return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return [timing for timing, _ in results], elapsed, [status for _, status in results]
+
+
+def main(concurrency=64, requests=3000, count=500):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        token = Token.objects.create(user=user).key
+        Task.objects.bulk_create([Task(title=f'Task {i}', user=user) for i in range(count)])
+        print(f'{count} tasks, {requests} requests, concurrency {concurrency}')
+
+        wsgi = WSGIHandler()
+        run_wsgi(wsgi, token, concurrency, len(PATHS) * 2)
+        summarize('WSGI threads', *run_wsgi(wsgi, token, concurrency, requests))
+
+        asgi = ASGIHandler()
+        asyncio.run(run_asgi(asgi, token, concurrency, len(PATHS) * 2))
+        summarize('ASGI', *asyncio.run(run_asgi(asgi, token, concurrency, requests)))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
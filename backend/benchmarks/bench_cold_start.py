@@ -0,0 +1,143 @@
+"""
+Cold start of the Vercel entry points: full profile (taskmaster_project.wsgi) vs API-only
+profile (taskmaster_project.wsgi_api, settings_api).
+
+Every run is a fresh interpreter started with ``python -X importtime`` that imports the
+entry point and serves one token-authenticated GET /api/v1/tasks/ from a migrated SQLite
+file, as a serverless function does on its first invocation. Reported per profile (median
+of --runs): process wall time, entry point import, first request, peak RSS and modules
+loaded, then an import-time profile (self time summed per package) and the packages only
+the full profile imports.
+
+    python -m benchmarks.bench_cold_start [--runs 5] [--top 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    'full': ('taskmaster_project.wsgi', 'taskmaster_project.settings'),
+    'api-only': ('taskmaster_project.wsgi_api', 'taskmaster_project.settings_api'),
+}
+
+SETUP = """
+from rest_framework.authtoken.models import Token
+from users.models import User
+user = User.objects.create_user(username='coldstart', password='coldstart-password')
+print(Token.objects.create(user=user).key)
+"""
+
+FIRST_REQUEST = """
+import io, json, resource, sys, time
+start = time.perf_counter()
+from {module} import app
+imported = time.perf_counter()
+environ = {{
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/v1/tasks/', 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'HTTP_AUTHORIZATION': 'Token {token}', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+    'wsgi.url_scheme': 'http',
+}}
+status = []
+b''.join(app(environ, lambda code, headers, exc_info=None: status.append(code)))
+assert status == ['200 OK'], status
+done = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'first_request_ms': (done - imported) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+}}))
+"""
+
+
+def package(module):
+    # django.contrib.admin.options -> django.contrib.admin, django.db.models.base -> django.db
+    parts = module.split('.')
+    if parts[0] == 'django':
+        return '.'.join(parts[:3] if len(parts) > 2 and parts[1] == 'contrib' else parts[:2])
+    return parts[0]
+
+
+def parse_importtime(stderr):
+    """Self time (ms) summed per package from ``-X importtime`` output."""
+    self_ms = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        self_ms[package(name.strip())] += int(own) / 1000
+    return self_ms
+
+
+def run(env, *args):
+    result = subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise SystemExit(result.stderr)
+    return result
+
+
+def cold_start(module, token, env):
+    start = time.perf_counter()
+    result = run(env, '-X', 'importtime', '-c', FIRST_REQUEST.format(module=module, token=token))
+    stats = json.loads(result.stdout.splitlines()[-1])
+    stats['process_ms'] = (time.perf_counter() - start) * 1000
+    return stats, parse_importtime(result.stderr)
+
+
+def main(runs=5, top=15):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'DATABASE_URL': f"sqlite:///{Path(tmp) / 'coldstart.sqlite3'}",
+            'DEBUG': 'False',
+            'REQUEST_METRICS_SLOW_REQUEST_MS': '100000',
+        }
+        env.pop('DJANGO_SETTINGS_MODULE', None)
+        run(env, 'manage.py', 'migrate', '--verbosity', '0')
+        token = run(env, 'manage.py', 'shell', '-c', SETUP).stdout.strip()
+
+        profiles = {}
+        for name, (module, _settings) in PROFILES.items():
+            # One untimed run so both profiles start with warm OS file caches and bytecode
+            cold_start(module, token, env)
+            samples = [cold_start(module, token, env) for _ in range(runs)]
+            profiles[name] = (
+                {key: statistics.median(stats[key] for stats, _ in samples) for key in samples[0][0]},
+                Counter({key: statistics.median(times[key] for _, times in samples) for key in samples[0][1]}),
+            )
+
+    print(f'median of {runs} cold starts, GET /api/v1/tasks/ as first request')
+    print(f"{'':<10}{'process':>10}{'import':>10}{'request':>10}{'rss':>9}{'modules':>9}")
+    for name, (stats, _) in profiles.items():
+        print(
+            f"{name:<10}{stats['process_ms']:>8.0f}ms{stats['import_ms']:>8.0f}ms"
+            f"{stats['first_request_ms']:>8.0f}ms{stats['rss_mb']:>7.1f}MB{stats['modules']:>9.0f}"
+        )
+
+    full, lean = profiles['full'][1], profiles['api-only'][1]
+    print(f'\nimport time by package, api-only profile (top {top}, self time)')
+    for name, ms in lean.most_common(top):
+        print(f'  {name:<36}{ms:>8.1f} ms')
+    print(f'  {"total":<36}{sum(lean.values()):>8.1f} ms')
+
+    print('\nimported only by the full profile')
+    for name in sorted(full.keys() - lean.keys(), key=full.get, reverse=True):
+        print(f'  {name:<36}{full[name]:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+    main(args.runs, args.top)
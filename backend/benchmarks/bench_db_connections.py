@@ -0,0 +1,74 @@
+"""
+Per-request connection overhead with DB_CONNECTIONS=none vs persistent (vs pool on psycopg 3).
+
+Requests go through the real WSGI handler, which opens and closes connections on
+request_started/request_finished exactly as in production (the test client skips
+that). Run it against Postgres with DATABASE_URL to see TCP + auth setup costs, and
+install requirements-pool.txt for the pool; on SQLite a file database is used so
+connections are really closed.
+
+    python -m benchmarks.bench_db_connections [iterations]
+"""
+import os
+import sys
+import tempfile
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.db.backends.signals import connection_created
+from rest_framework.authtoken.models import Token
+
+from benchmarks.bench_asgi import wsgi_get
+from taskmaster_project.database import connection_settings, pool_available
+from users.authentication import get_token_cache
+
+
+def use(mode):
+    connection.close()
+    if hasattr(connection, 'close_pool'):
+        connection.close_pool()
+    settings = connection_settings({'DB_CONNECTIONS': mode})
+    connection.settings_dict.update(settings, OPTIONS={
+        **{key: value for key, value in connection.settings_dict['OPTIONS'].items() if key != 'pool'},
+        **settings['OPTIONS'],
+    })
+
+
+def main(iterations=1000):
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == 'sqlite':
+            # The default in-memory test database ignores close()
+            connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+
+        with test_database():
+            user = get_user_model().objects.create_user(username='bench', password='bench-password')
+            token = Token.objects.create(user=user).key
+            app = WSGIHandler()
+
+            opened = 0
+
+            def count_connections(**kwargs):
+                nonlocal opened
+                opened += 1
+
+            connection_created.connect(count_connections)
+            pool = connection.vendor == 'postgresql' and pool_available()
+            modes = ['none', 'persistent'] + (['pool'] if pool else [])
+            print(f'{connection.vendor}, {iterations} requests per mode')
+            for mode in modes:
+                use(mode)
+                for path in ('/api/v1/auth/me/', '/api/v1/tasks/'):
+                    # Keep the token lookup in every request so each one hits the database
+                    request = lambda: (get_token_cache().clear(), wsgi_get(app, path, token))
+                    opened = 0
+                    stats = measure(request, iterations)
+                    report(f'GET {path} {mode}', stats)
+                    print(f'{"":<40} {opened / (iterations + 10):.2f} connections opened per request')
+            use('none')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,151 @@
+"""
+Idle connections and fan-out of the real-time event stream (taskmaster_project.event_stream).
+
+Opens ``connections`` Server-Sent Events streams to the ASGI application in-process,
+spread over ``users`` users, and reports the memory each idle connection holds
+(tracemalloc, Python allocations only), then the latency from publishing an event on a
+worker thread, as a sync view does after its commit, until the last of that user's
+connections has written it, and until every connection has one when all users get an event.
+
+    python -m benchmarks.bench_event_stream [connections] [users] [rounds]
+"""
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.utils import test_database
+
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+
+from taskmaster_project.asgi import application
+from todo_app.events import get_event_broker
+
+User = get_user_model()
+
+
+class Connection:
+
+    def __init__(self, token):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': '/api/v1/events/', 'query_string': f'token={token}'.encode(), 'headers': [],
+        }
+        self.requested = False
+        self.open = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.waiter = None
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b''}
+        await self.closing.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        body = message.get('body', b'')
+        if body.startswith(b'retry:'):
+            self.open.set()
+        elif body.startswith(b'event:') and self.waiter is not None:
+            self.waiter.arrived()
+
+
+class Waiter:
+    """Resolves once ``count`` connections have written the event."""
+
+    def __init__(self, count):
+        self.remaining = count
+        self.done = asyncio.Event()
+
+    def arrived(self):
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.done.set()
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return statistics.median(timings) * 1000, timings[int(len(timings) * 0.95) - 1] * 1000
+
+
+async def fan_out(broker, connections, user_ids, rounds):
+    one_user, all_users = [], []
+    targets = [connection for connection in connections if connection.user_id == user_ids[0]]
+
+    for pk in range(rounds):
+        waiter = Waiter(len(targets))
+        for connection in targets:
+            connection.waiter = waiter
+        start = time.perf_counter()
+        await asyncio.to_thread(broker.publish, user_ids[0], {'type': 'task.updated', 'id': pk})
+        await waiter.done.wait()
+        one_user.append(time.perf_counter() - start)
+
+    for pk in range(rounds):
+        waiter = Waiter(len(connections))
+        for connection in connections:
+            connection.waiter = waiter
+        start = time.perf_counter()
+        await asyncio.to_thread(lambda: [
+            broker.publish(user_id, {'type': 'task.updated', 'id': pk}) for user_id in user_ids
+        ])
+        await waiter.done.wait()
+        all_users.append(time.perf_counter() - start)
+
+    return one_user, all_users
+
+
+async def run(tokens, connections_count, rounds):
+    broker = get_event_broker()
+    user_ids = list(tokens)
+    connections = []
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = []
+    for index in range(connections_count):
+        user_id = user_ids[index % len(user_ids)]
+        connection = Connection(tokens[user_id])
+        connection.user_id = user_id
+        connections.append(connection)
+        tasks.append(asyncio.create_task(application(connection.scope, connection.receive, connection.send)))
+    await asyncio.gather(*(connection.open.wait() for connection in connections))
+    # Idle state: every stream is parked on its queue and heartbeat timer
+    await asyncio.sleep(0.1)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / connections_count
+    tracemalloc.stop()
+
+    print(f'{connections_count} idle connections ({len(user_ids)} users, {broker.connection_count()} subscribed)')
+    print(f'{"memory per idle connection":<40} {per_connection / 1024:>8.1f} KiB')
+
+    one_user, all_users = await fan_out(broker, connections, user_ids, rounds)
+    per_user = connections_count // len(user_ids)
+    for name, timings in ((f'event to one user ({per_user} connections)', one_user),
+                          (f'event to every user ({connections_count} connections)', all_users)):
+        p50, p95 = percentiles(timings)
+        print(f'{name:<40} p50 {p50:>8.2f} ms  p95 {p95:>8.2f} ms')
+
+    for connection in connections:
+        connection.closing.set()
+    await asyncio.gather(*tasks)
+    assert broker.connection_count() == 0
+
+
+def main():
+    connections_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    with test_database():
+        tokens = {}
+        for index in range(users):
+            user = User.objects.create_user(username=f'stream{index}', password='stream-password')
+            tokens[user.pk] = Token.objects.create(user=user).key
+        asyncio.run(run(tokens, connections_count, rounds))
+
+
+if __name__ == '__main__':
+    main()
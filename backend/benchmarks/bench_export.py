@@ -0,0 +1,94 @@
+"""
+Memory of GET /api/v1/tasks/export/ under WSGI and under ASGI (taskmaster_project.asgi).
+
+One user with COUNT tasks, exported as NDJSON by the applications called in-process.
+The body is thrown away as it arrives, the way a server writes it to the socket, and
+tracemalloc reports the peak of Python allocations during the request. Under ASGI the
+export is measured twice: with export_tasks(), the sync generator that Django collects
+into a list before sending, and with aexport_tasks(), the async generator the view
+hands the ASGI server. The peak of export_tasks() under ASGI grows with COUNT; the others
+stay at a few chunks of tasks, as the garbage collector reclaims them.
+
+    python -m benchmarks.bench_export [count]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from unittest import mock
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.utils import test_database
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from rest_framework.authtoken.models import Token
+
+from taskmaster_project.asgi import application
+from todo_app.export import export_tasks
+from todo_app.models import Task
+
+PATH = '/api/v1/tasks/export/'
+
+
+def wsgi_export(app, token):
+    environ = {'PATH_INFO': PATH, 'QUERY_STRING': 'format=ndjson', 'HTTP_AUTHORIZATION': f'Token {token}',
+               'HTTP_HOST': 'localhost'}
+    setup_testing_defaults(environ)
+    response = app(environ, lambda status, headers, exc_info=None: None)
+    size = sum(len(chunk) for chunk in response)
+    response.close()
+    return size
+
+
+async def asgi_export(app, token):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': PATH, 'raw_path': PATH.encode(), 'query_string': b'format=ndjson', 'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'authorization', f'Token {token}'.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    size = 0
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal size
+        size += len(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return size
+
+
+def profile(name, export):
+    export()
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = export()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{name:<32} {size / 2 ** 20:>7.1f} MiB body  peak {peak / 2 ** 20:>7.1f} MiB  {elapsed:>7.2f} s')
+
+
+def main(count=50000):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        token = Token.objects.create(user=user).key
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', description='Some description ' * 10, user=user) for i in range(count)
+        ], batch_size=5000)
+        print(f'exporting {count} tasks as NDJSON')
+
+        profile('WSGI, export_tasks()', lambda: wsgi_export(WSGIHandler(), token))
+        with mock.patch('todo_app.views.aexport_tasks', export_tasks):
+            profile('ASGI, export_tasks()', lambda: asyncio.run(asgi_export(application, token)))
+        profile('ASGI, aexport_tasks()', lambda: asyncio.run(asgi_export(application, token)))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,103 @@
+"""
+Importing tasks: TaskSerializer.create per row vs the batched TaskImporter (NDJSON and CSV).
+
+    python -m benchmarks.bench_import [tasks]
+"""
+import csv
+import io
+import json
+import sys
+import time
+
+from benchmarks.utils import test_database
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+
+from todo_app.importer import TaskImporter
+from todo_app.models import Tag
+from todo_app.serializers import TaskSerializer
+
+FIELDS = ['title', 'description', 'status', 'priority', 'due_date', 'category', 'tags']
+
+
+def make_rows(count):
+    return [
+        {
+            'title': f'Task {i}',
+            'description': 'Lorem ipsum dolor sit amet ' * 4,
+            'status': ['pending', 'in_progress', 'completed'][i % 3],
+            'priority': ['low', 'medium', 'high'][i % 3],
+            'due_date': '2025-05-01T10:00:00Z' if i % 2 else None,
+            'category': f'Category {i % 25}',
+            'tags': [f'tag-{(i + k) % 200}' for k in range(i % 4)],
+        }
+        for i in range(count)
+    ]
+
+
+def to_ndjson(rows):
+    return b''.join(json.dumps(row).encode() + b'\n' for row in rows)
+
+
+def to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for row in rows:
+        writer.writerow([';'.join(row['tags']) if name == 'tags' else row[name] for name in FIELDS])
+    return buffer.getvalue().encode()
+
+
+def serializer_create(user, rows):
+    # The pre-existing path: one TaskSerializer.create (INSERT + tags.set) per task
+    request = APIRequestFactory().post('/api/v1/tasks/')
+    request.user = user
+    tags = {}
+    with transaction.atomic():
+        for row in rows:
+            tag_ids = []
+            for name in row['tags']:
+                if name not in tags:
+                    tags[name] = Tag.objects.get_or_create(user=user, name=name)[0].pk
+                tag_ids.append(tags[name])
+            data = {key: row[key] for key in ('title', 'description', 'status', 'priority', 'due_date')}
+            serializer = TaskSerializer(data={**data, 'tag_ids': tag_ids}, context={'request': request})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+
+def timed(name, count, func):
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    with connection.execute_wrapper(count_queries):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<40} {elapsed:>8.2f} s  {count / elapsed:>10.0f} tasks/s  {queries:>7} queries')
+
+
+def main(count=50_000):
+    rows = make_rows(count)
+    ndjson, csv_content = to_ndjson(rows), to_csv(rows)
+    User = get_user_model()
+
+    with test_database():
+        print(f'{count} tasks')
+        baseline = min(count, 5000)
+        timed(f'TaskSerializer.create ({baseline} tasks)', baseline,
+              lambda: serializer_create(User.objects.create_user(username='serializer'), rows[:baseline]))
+        timed('TaskImporter ndjson', count,
+              lambda: TaskImporter(User.objects.create_user(username='ndjson')).run(io.BytesIO(ndjson), 'ndjson'))
+        timed('TaskImporter csv', count,
+              lambda: TaskImporter(User.objects.create_user(username='csv')).run(io.BytesIO(csv_content), 'csv'))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,47 @@
+"""
+JSON throughput: DRF's JSONRenderer/JSONParser vs the orjson-backed ORJSONRenderer/ORJSONParser.
+
+    python -m benchmarks.bench_json [tasks] [iterations]
+"""
+import io
+import sys
+
+from benchmarks.bench_serializer import seed
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from taskmaster_project.parsers import ORJSONParser
+from taskmaster_project.renderers import ORJSONRenderer
+from todo_app.models import Task
+from todo_app.serializers import TaskReadSerializer
+
+
+def main(count=10_000, iterations=20):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        seed(user, count)
+        data = TaskReadSerializer(Task.objects.for_user(user).with_related(), many=True).data
+
+    body = JSONRenderer().render(data)
+    print(f'{count} tasks, {len(body) / 1024:.0f} KiB')
+
+    for renderer_class in (JSONRenderer, ORJSONRenderer):
+        renderer = renderer_class()
+        stats = measure(lambda: renderer.render(data), iterations, warmup=2)
+        report(f'render {renderer_class.__name__}', stats)
+        print(f"{'':<40} {len(body) * stats['ops_per_sec'] / 2 ** 20:>10.1f} MiB/s")
+
+    for parser_class in (JSONParser, ORJSONParser):
+        parser = parser_class()
+        stats = measure(lambda: parser.parse(io.BytesIO(body), parser_context={}), iterations, warmup=2)
+        report(f'parse {parser_class.__name__}', stats)
+        print(f"{'':<40} {len(body) * stats['ops_per_sec'] / 2 ** 20:>10.1f} MiB/s")
+
+    assert ORJSONRenderer().render(data) == body, 'outputs differ'
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,73 @@
+"""
+Manual ordering: renumbering integer positions vs fractional keys (todo_app.positions).
+
+One user's column of COUNT tasks, other users' tasks around it. Every move puts a
+task at a random place in the column. With integer positions
+(stored zero-padded in the same column, so both sides read and write the same index)
+every task after the new place is renumbered; move_task() writes the moved task alone.
+
+    python -m benchmarks.bench_positions [count] [users] [iterations]
+"""
+import random
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from todo_app.models import Task
+from todo_app.positions import column, move_task, spread_keys
+
+
+def seed(count, user_count):
+    User = get_user_model()
+    users = User.objects.bulk_create([User(username=f'bench{i}', password='!') for i in range(user_count)])
+    keys = spread_keys(count)
+    Task.objects.bulk_create([
+        Task(title=f'Task {i}', user_id=user.pk, position=keys[i])
+        for user in users for i in range(count)
+    ], batch_size=5000)
+    return users[0]
+
+
+def renumber(user, rng):
+    with transaction.atomic():
+        pks = list(column(user.pk, 'pending').values_list('pk', flat=True))
+        index = rng.randrange(len(pks))
+        pks.insert(index, pks.pop())
+        moved = [Task(pk=pk, position=f'{position:08d}') for position, pk in enumerate(pks) if position >= index]
+        Task.objects.bulk_update(moved, ['position'], batch_size=500)
+    return len(moved)
+
+
+def move_one(pks, rng):
+    task, before = rng.sample(pks, 2)
+    move_task(Task.objects.get(pk=task), 'pending', before=before)
+
+
+def set_keys(user, keys):
+    pks = list(column(user.pk, 'pending').values_list('pk', flat=True))
+    Task.objects.bulk_update([Task(pk=pk, position=key) for pk, key in zip(pks, keys)], ['position'], batch_size=500)
+    return pks
+
+
+def main(count=5000, user_count=20, iterations=50):
+    with test_database():
+        user = seed(count, user_count)
+        print(f'{user_count} users with a column of {count} tasks each, moving within one column')
+        rng = random.Random(0)
+
+        set_keys(user, [f'{position:08d}' for position in range(count)])
+        rows = [renumber(user, rng) for _ in range(10)]
+        print(f'integer positions rewrite {sum(rows) // len(rows)} rows per move on average')
+        report('integer positions, renumber', measure(lambda: renumber(user, rng), iterations, warmup=1))
+
+        pks = set_keys(user, spread_keys(count))
+        report('fractional keys, move_task()', measure(lambda: move_one(pks, rng), iterations * 10))
+        longest = max(len(key) for key in column(user.pk, 'pending').values_list('position', flat=True))
+        print(f'longest key after the random moves: {longest} characters')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""
+Recurring tasks: expanding the occurrences of thousands of series over a year.
+
+A user with ``series`` recurring tasks (10% daily, 50% weekly on one to three days,
+30% monthly by day or nth weekday, 10% yearly) and a year-long window. Reported: every
+occurrence of every series and the first 100 in due order (expand() only), loading the
+rules from the database, and the first page of 100 as /tasks/occurrences/ computes it
+(get_occurrences(), with its queries). The number of rows eager materialization would store is printed for scale.
+
+    python -m benchmarks.bench_recurrence [series] [iterations]
+"""
+import datetime
+import itertools
+import random
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from todo_app.models import Task, TaskRecurrence
+from todo_app.recurrence import expand, get_occurrences, get_series
+
+
+def seed(user, count):
+    rng = random.Random(0)
+    start = timezone.now().replace(microsecond=0) - datetime.timedelta(days=400)
+    tasks = Task.objects.bulk_create([
+        Task(title=f'Series {i}', user=user, due_date=start + datetime.timedelta(days=rng.randint(0, 365), hours=i % 24))
+        for i in range(count)
+    ])
+    rules = []
+    for task in tasks:
+        frequency = rng.choices(['daily', 'weekly', 'monthly', 'yearly'], weights=[10, 50, 30, 10])[0]
+        rule = TaskRecurrence(task=task, frequency=frequency, interval=rng.choice([1, 1, 1, 2, 3]))
+        if frequency == 'weekly':
+            rule.weekdays = sorted(rng.sample(range(7), rng.randint(1, 3)))
+        elif frequency == 'monthly' and rng.random() < 0.5:
+            rule.weekdays, rule.week_of_month = [rng.randrange(7)], rng.choice([1, 2, 3, 4, -1])
+        rules.append(rule)
+    TaskRecurrence.objects.bulk_create(rules)
+
+
+def main(count=2000, iterations=20):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        seed(user, count)
+        tasks = Task.objects.for_user(user)
+        start = timezone.now()
+        end = start + datetime.timedelta(days=365)
+        rules = get_series(tasks, start, end)
+        total = sum(len(list(rule.between(start, end))) for rule in rules)
+        print(f'{count} recurring tasks, {total} occurrences in the next 365 days (rows eager materialization stores)')
+
+        report('expand(), every occurrence', measure(lambda: list(expand(rules, start, end)), iterations, warmup=2))
+        report('expand(), first 100', measure(
+            lambda: list(itertools.islice(expand(rules, start, end), 100)), iterations * 5
+        ))
+        report('get_series(), load the rules', measure(lambda: get_series(tasks, start, end), iterations * 5))
+        report('get_occurrences(), page of 100', measure(
+            lambda: get_occurrences(tasks, start, end, 100), iterations * 5
+        ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,68 @@
+"""
+Due-date reminders: a cron-style scan of every task vs ReminderScheduler's index range scan.
+
+Tasks of many users with the seeding distributions (todo_app.seeding): about a third
+without a due date, a third closed, the rest due between a month ago and two months
+ahead. Both sides find the open tasks due in the next LEAD minutes since the worker started;
+the scan reads every task, the scheduler reads ``batch_size`` rows of
+task_reminder_due_idx.
+
+    python -m benchmarks.bench_reminders [tasks] [users] [iterations]
+"""
+import datetime
+import random
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from todo_app.models import Task
+from todo_app.reminders import ReminderScheduler
+from todo_app.seeding import DUE_DATE_RANGE_DAYS, NO_DUE_DATE_RATIO, STATUS_WEIGHTS, weighted
+
+LEAD = datetime.timedelta(minutes=15)
+
+
+def seed(count, user_count):
+    rng = random.Random(0)
+    User = get_user_model()
+    users = User.objects.bulk_create([User(username=f'bench{i}', password='!') for i in range(user_count)])
+    now = timezone.now()
+    low, high = (days * 24 * 60 for days in DUE_DATE_RANGE_DAYS)
+    Task.objects.bulk_create([
+        Task(
+            title=f'Task {i}',
+            user_id=users[i % user_count].pk,
+            status=weighted(rng, STATUS_WEIGHTS),
+            due_date=None if rng.random() < NO_DUE_DATE_RATIO else now + datetime.timedelta(
+                minutes=rng.randint(low, high)
+            ),
+        )
+        for i in range(count)
+    ], batch_size=5000)
+
+
+def scan_every_task(since, until):
+    return [
+        pk for pk, due_date, status in Task.objects.values_list('id', 'due_date', 'status').iterator(2000)
+        if due_date is not None and since < due_date <= until and status not in ('completed', 'archived')
+    ]
+
+
+def main(count=200_000, user_count=2000, iterations=20):
+    with test_database():
+        seed(count, user_count)
+        scheduler = ReminderScheduler(lead=LEAD, handler=lambda tasks: None)
+        since = scheduler.cursor.due_date
+        until = timezone.now() + LEAD
+        due = len(scan_every_task(since, until))
+        print(f'{count} tasks, {user_count} users, {due} open tasks due in the next {LEAD}')
+
+        report('scan every task', measure(lambda: scan_every_task(since, until), iterations, warmup=1))
+        report('ReminderScheduler.upcoming()', measure(lambda: list(scheduler.upcoming()), iterations * 10))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
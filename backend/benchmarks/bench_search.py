@@ -0,0 +1,72 @@
+"""
+Task search: DRF icontains SearchFilter vs the full-text TaskSearchFilter.
+
+    python -m benchmarks.bench_search [tasks] [iterations]
+"""
+import random
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from todo_app.models import Task
+from todo_app.search import TaskSearchFilter
+from todo_app.views import TaskViewSet
+
+COMMON_WORDS = (
+    'buy milk call mom report quarterly review budget meeting email client invoice '
+    'fix bug deploy release write docs plan trip book flight pay rent clean garage'
+).split()
+
+
+def vocabulary(rng, size=5000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = COMMON_WORDS + [''.join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(size)]
+    # Zipf-like: a few words are everywhere, most are rare
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def seed(user, count):
+    rng = random.Random(42)
+    words, weights = vocabulary(rng)
+    batch = []
+    for _ in range(count):
+        batch.append(Task(
+            title=' '.join(rng.choices(words, weights, k=4)),
+            description=' '.join(rng.choices(words, weights, k=25)),
+            user=user,
+        ))
+        if len(batch) == 5000:
+            Task.objects.bulk_create(batch)
+            batch = []
+    Task.objects.bulk_create(batch)
+    return words
+
+
+def main(count=100_000, iterations=50):
+    factory = APIRequestFactory()
+    view = TaskViewSet()
+
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        words = seed(user, count)
+        print(f'{count} tasks')
+
+        # From "in almost every task" down to selective words, prefixes and no match at all
+        terms = ['buy', 'invoice', 'inv', 'deploy release', words[300], words[3000][:4], 'zzzz']
+        for term in terms:
+            request = Request(factory.get('/api/v1/tasks/', {'search': term}))
+            for backend in (filters.SearchFilter(), TaskSearchFilter()):
+                def run():
+                    queryset = backend.filter_queryset(request, Task.objects.for_user(user), view)
+                    return list(queryset[:50])
+                report(f'{type(backend).__name__} {term!r}', measure(run, iterations, warmup=2))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,66 @@
+"""
+Serializing a task listing: TaskSerializer vs the read-only TaskReadSerializer.
+
+    python -m benchmarks.bench_serializer [tasks] [iterations]
+"""
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from todo_app.models import Category, Tag, Task
+from todo_app.serializers import TaskReadSerializer, TaskSerializer
+
+
+def seed(user, count):
+    categories = [Category.objects.create(name=f'Category {i}', user=user) for i in range(10)]
+    tags = [Tag.objects.create(name=f'tag-{i}', user=user) for i in range(20)]
+    now = timezone.now()
+    Task.objects.bulk_create([
+        Task(
+            title=f'Task {i}',
+            description='Lorem ipsum dolor sit amet ' * 4,
+            priority=['low', 'medium', 'high'][i % 3],
+            due_date=now if i % 2 else None,
+            category=categories[i % 10] if i % 3 else None,
+            user=user,
+        )
+        for i in range(count)
+    ], batch_size=5000)
+    through = Task.tags.through
+    through.objects.bulk_create([
+        through(task_id=task_id, tag_id=tags[(n + k) % 20].id)
+        for n, task_id in enumerate(Task.objects.values_list('id', flat=True))
+        for k in range(n % 4)
+    ], batch_size=5000)
+
+
+def main(count=10_000, iterations=10):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        seed(user, count)
+        request = APIRequestFactory().get('/api/v1/tasks/')
+        request.user = user
+        context = {'request': request}
+
+        # Rows and their prefetched tags are loaded once, only serialization is measured
+        tasks = list(Task.objects.for_user(user).with_related())
+        print(f'{count} tasks')
+
+        outputs = {}
+        for serializer_class in (TaskSerializer, TaskReadSerializer):
+            def run():
+                outputs[serializer_class] = JSONRenderer().render(
+                    serializer_class(tasks, many=True, context=context).data
+                )
+            report(f'{serializer_class.__name__} + render', measure(run, iterations, warmup=1))
+
+        assert outputs[TaskSerializer] == outputs[TaskReadSerializer], 'outputs differ'
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
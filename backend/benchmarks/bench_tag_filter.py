@@ -0,0 +1,60 @@
+"""
+Tag filtering: JOIN + DISTINCT (the previous ?tags= implementation) vs TaskFilterSet's semi-joins.
+
+A user with thousands of tags and Zipf-distributed tag usage, filtering by a few
+popular and rare tags. Both the first 50 rows in the default ordering and the
+whole result are measured.
+
+    python -m benchmarks.bench_tag_filter [tasks] [tags] [iterations]
+"""
+import random
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+
+from todo_app.filters import TaskFilterSet
+from todo_app.models import Tag, Task
+
+
+def seed(user, count, tag_count):
+    rng = random.Random(0)
+    tags = Tag.objects.bulk_create([Tag(name=f'tag-{i}', user=user) for i in range(tag_count)])
+    weights = [1 / rank for rank in range(1, tag_count + 1)]
+    tasks = Task.objects.bulk_create([Task(title=f'Task {i}', user=user) for i in range(count)], batch_size=5000)
+    through = Task.tags.through
+    through.objects.bulk_create([
+        through(task_id=task.pk, tag_id=tag.pk)
+        for task in tasks
+        for tag in {rng.choices(tags, weights=weights)[0] for _ in range(rng.randint(0, 5))}
+    ], batch_size=5000)
+    return tags
+
+
+def main(count=20_000, tag_count=2000, iterations=50):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        tags = seed(user, count, tag_count)
+        print(f'{count} tasks, {tag_count} tags, {Task.tags.through.objects.count()} task/tag rows')
+        base = Task.objects.for_user(user)
+
+        for label, tag_ids in (('3 popular tags', tags[:3]), ('3 rare tags', tags[-3:])):
+            tag_ids = [tag.pk for tag in tag_ids]
+            querysets = {
+                'JOIN + DISTINCT': base.filter(tags__id__in=tag_ids).distinct(),
+                **{
+                    f'tags_mode={mode}': TaskFilterSet(
+                        {'tags': ','.join(map(str, tag_ids)), 'tags_mode': mode}, queryset=base
+                    ).qs
+                    for mode in ('any', 'all', 'none')
+                },
+            }
+            print(label)
+            for name, queryset in querysets.items():
+                report(f'  {name} first 50', measure(lambda: list(queryset[:50]), iterations))
+                report(f'  {name} all rows', measure(lambda: list(queryset.all()), max(iterations // 10, 1)))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
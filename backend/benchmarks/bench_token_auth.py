@@ -0,0 +1,39 @@
+"""
+Requests/sec of an authenticated endpoint with TokenAuthentication vs CachedTokenAuthentication.
+
+    python -m benchmarks.bench_token_auth [iterations]
+"""
+import sys
+
+from benchmarks.utils import measure, report, test_database
+
+from django.contrib.auth import get_user_model
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from users.authentication import CachedTokenAuthentication, get_token_cache
+from users.views import UserViewSet
+
+
+def main(iterations=2000):
+    with test_database():
+        user = get_user_model().objects.create_user(username='bench', password='bench-password')
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        # authentication_classes is read from settings at import time, so swap it on the view
+        default = UserViewSet.authentication_classes
+        try:
+            for auth_class in (TokenAuthentication, CachedTokenAuthentication):
+                UserViewSet.authentication_classes = [auth_class]
+                get_token_cache().clear()
+                stats = measure(lambda: client.get('/api/v1/auth/me/'), iterations)
+                report(f'GET /auth/me/ {auth_class.__name__}', stats)
+        finally:
+            UserViewSet.authentication_classes = default
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
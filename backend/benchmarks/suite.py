@@ -0,0 +1,191 @@
+"""
+Endpoint benchmark suite with a regression check against a stored baseline.
+
+Seeds a throwaway test database with todo_app.seeding (SQLite, or Postgres when
+DATABASE_URL is set), measures each scenario through the API and compares p50
+latency and queries per request with benchmarks/baseline.json for the same
+database vendor. Query counts must not grow; latency may not exceed the baseline
+by more than --tolerance. Exits with status 1 on a regression.
+
+Listings are measured with the collection cache disabled, so they cover the
+query and serialization path rather than a cache hit.
+
+    python -m benchmarks.suite                   # compare with the baseline
+    python -m benchmarks.suite --save-baseline   # record a new baseline
+    python -m benchmarks.suite --only list,search --iterations 500
+"""
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.utils import measure, test_database
+
+from django.db import connection
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from todo_app.models import Category, Tag, Task
+from todo_app.seeding import seed_benchmark_data
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+
+SUITE_SETTINGS = {
+    'CACHES': {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'benchmark-no-cache': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    },
+    'COLLECTION_CACHE': {'BACKEND': 'benchmark-no-cache', 'TTL': 0},
+    # Metrics stay on as in production, only the slow-request log is silenced
+    'REQUEST_METRICS': {'SLOW_REQUEST_MS': float('inf')},
+}
+
+
+class Scenarios:
+    """Each scenario returns a callable that performs one request and checks its status."""
+
+    def __init__(self, client, user):
+        self.client = client
+        self.user = user
+        self.task_ids = itertools.cycle(Task.objects.filter(user=user).values_list('id', flat=True)[:500])
+        self.category = Category.objects.filter(user=user).first()
+        self.tag = Tag.objects.filter(user=user).order_by('id').first()
+        self.statuses = itertools.cycle(['pending', 'in_progress', 'completed'])
+        self.counter = itertools.count()
+
+    def get(self, path, expected=200):
+        def request():
+            response = self.client.get(path)
+            assert response.status_code == expected, (path, response.status_code)
+        return request
+
+    def list(self):
+        return self.get('/api/v1/tasks/?page_size=50')
+
+    def list_all(self):
+        return self.get('/api/v1/tasks/')
+
+    def filter(self):
+        return self.get('/api/v1/tasks/?page_size=50&status=pending&priority=high')
+
+    def search(self):
+        return self.get('/api/v1/tasks/?page_size=50&search=report')
+
+    def tag_filter(self):
+        return self.get(f'/api/v1/tasks/?page_size=50&tags={self.tag.pk}')
+
+    def create(self):
+        def request():
+            response = self.client.post('/api/v1/tasks/', {
+                'title': f'Benchmark task {next(self.counter)}',
+                'priority': 'high',
+                'category': self.category.pk,
+                'tag_ids': [self.tag.pk],
+            }, format='json')
+            assert response.status_code == 201, response.status_code
+        return request
+
+    def update(self):
+        def request():
+            response = self.client.patch(
+                f'/api/v1/tasks/{next(self.task_ids)}/', {'title': f'Renamed {next(self.counter)}'}, format='json'
+            )
+            assert response.status_code == 200, response.status_code
+        return request
+
+    def change_status(self):
+        def request():
+            response = self.client.post(
+                f'/api/v1/tasks/{next(self.task_ids)}/change_status/', {'status': next(self.statuses)}, format='json'
+            )
+            assert response.status_code == 200, response.status_code
+        return request
+
+
+SCENARIOS = ['list', 'list_all', 'filter', 'search', 'tag_filter', 'create', 'update', 'change_status']
+
+
+def run(scenarios, iterations, users, tasks, rounds):
+    results = {}
+    with test_database(), override_settings(**SUITE_SETTINGS):
+        user = seed_benchmark_data(users, tasks)[0]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        factory = Scenarios(client, user)
+        print(f'{connection.vendor}: {users} users x {tasks} tasks, best of {rounds} x {iterations} requests per scenario')
+        for name in scenarios:
+            # The token lookup is cached after the first request, as in production.
+            # The fastest of several rounds is kept, it is the least disturbed by other load.
+            request = getattr(factory, name)()
+            stats = min((measure(request, iterations) for _ in range(rounds)), key=lambda stats: stats['p50'])
+            results[name] = {
+                'p50_ms': round(stats['p50'] * 1000, 3),
+                'p95_ms': round(stats['p95'] * 1000, 3),
+                'queries': round(stats['queries'], 2),
+            }
+            row = results[name]
+            print(f"{name:<16} p50 {row['p50_ms']:>8.3f} ms  p95 {row['p95_ms']:>8.3f} ms  {row['queries']:>5.2f} queries")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a message per regression of ``results`` against ``baseline``."""
+    regressions = []
+    for name, row in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if row['queries'] > expected['queries']:
+            regressions.append(f"{name}: {row['queries']} queries per request, baseline {expected['queries']}")
+        limit = expected['p50_ms'] * (1 + tolerance)
+        if row['p50_ms'] > limit:
+            regressions.append(
+                f"{name}: p50 {row['p50_ms']:.3f} ms exceeds baseline {expected['p50_ms']:.3f} ms "
+                f"+{tolerance:.0%} ({limit:.3f} ms)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--tasks', type=int, default=2000, help='Tasks per user.')
+    parser.add_argument('--iterations', type=int, default=100, help='Requests per round.')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--only', help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed p50 slowdown, 0.5 = +50%%.')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    scenarios = args.only.split(',') if args.only else SCENARIOS
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = run(scenarios, args.iterations, args.users, args.tasks, args.rounds)
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        stored[connection.vendor] = {**stored.get(connection.vendor, {}), **results}
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + '\n')
+        print(f'Baseline for {connection.vendor} saved to {args.baseline}')
+        return 0
+
+    baseline = stored.get(connection.vendor)
+    if not baseline:
+        print(f'No {connection.vendor} baseline in {args.baseline}, run with --save-baseline first.')
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if not regressions:
+        print('No regressions.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Run a benchmark from the backend directory, e.g.::
+
+    python -m benchmarks.bench_token_auth
+
+Each script works on a throwaway test database so the development data is never touched.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmaster_project.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+
+@contextmanager
+def test_database():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, iterations=1000, warmup=10):
+    """Call ``func`` repeatedly and return per-call latency stats (seconds) and queries per call."""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    # execute_wrapper keeps counting across request_started, which resets connection.queries
+    with connection.execute_wrapper(count_queries):
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'iterations': iterations,
+        'total': total,
+        'ops_per_sec': iterations / total if total else float('inf'),
+        'p50': statistics.median(timings),
+        'p95': timings[int(len(timings) * 0.95) - 1],
+        'queries': queries / iterations,
+    }
+
+
+def report(name, stats):
+    print(
+        f"{name:<40} {stats['ops_per_sec']:>10.1f} ops/s  "
+        f"p50 {stats['p50'] * 1000:>7.3f} ms  p95 {stats['p95'] * 1000:>7.3f} ms  "
+        f"{stats['queries']:>6.2f} queries/op"
+    )
@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import caches
+
+from users.authentication import get_token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Test databases reuse primary keys, so cached entries must not outlive a test
+    for cache in caches.all():
+        cache.clear()
+    get_token_cache().clear()
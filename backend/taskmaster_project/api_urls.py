@@ -0,0 +1,16 @@
+"""
+API routes, without the admin and static files.
+
+Root URLconf of the API-only profile (taskmaster_project.settings_api), included
+by taskmaster_project.urls in the full one.
+"""
+from django.urls import include, path
+
+from taskmaster_project.metrics import RequestMetricsView
+
+urlpatterns = [
+    path('api/v1/', include('todo_app.urls')),
+    path('api/v1/', include('users.urls')),
+    path('api/v1/users/', include('users.urls')),
+    path('api/v1/metrics/requests/', RequestMetricsView.as_view(), name='request-metrics'),
+]
@@ -2,6 +2,8 @@
 ASGI config for taskmaster_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The API is served by the same sync views as under WSGI; only the real-time events
+stream at /api/v1/events/ is handled on the event loop (taskmaster_project.event_stream).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -12,5 +14,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmaster_project.settings')
+# Persistent connections are per thread and never reused here (see taskmaster_project.database)
+os.environ.setdefault('DB_CONNECTIONS', 'none')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from taskmaster_project.event_stream import EventStream  # noqa: E402  (needs the apps loaded)
+
+application = EventStream(django_application)
@@ -0,0 +1,71 @@
+"""
+Postgres connection reuse, configured from the environment.
+
+DB_CONNECTIONS selects the mode:
+
+- ``persistent`` (default under WSGI): each worker thread keeps its connection for
+  DB_CONN_MAX_AGE seconds. With DB_CONN_HEALTH_CHECKS a reused connection is
+  checked first and replaced if the server dropped it, e.g. while a serverless
+  instance was frozen between invocations.
+- ``pool``: psycopg 3's connection pool (``pip install -r requirements-pool.txt``;
+  Django then uses psycopg 3 instead of psycopg2), sized by DB_POOL_MIN_SIZE /
+  DB_POOL_MAX_SIZE. A request waits up to DB_POOL_TIMEOUT seconds for a free connection.
+- ``none``: a new connection per request, Django's default, and the default under
+  ASGI (taskmaster_project.asgi). There each request runs its sync code on a thread
+  of its own, so a persistent connection is never reused, only left open; use
+  ``pool`` to reuse connections under ASGI.
+
+Behind a transaction-mode pooler (PgBouncer, Supabase, Neon) set
+DB_DISABLE_SERVER_SIDE_CURSORS=True: the cursors ``QuerySet.iterator()`` opens
+(task export) do not survive transaction pooling.
+"""
+import importlib.util
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+CONNECTION_MODES = ('persistent', 'pool', 'none')
+
+
+def connection_settings(environ=os.environ):
+    mode = environ.get('DB_CONNECTIONS', 'persistent').lower()
+    if mode not in CONNECTION_MODES:
+        raise ImproperlyConfigured(
+            f"DB_CONNECTIONS must be one of {', '.join(CONNECTION_MODES)}, got {mode!r}"
+        )
+
+    settings = {
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        'DISABLE_SERVER_SIDE_CURSORS': environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True',
+        'OPTIONS': {},
+    }
+    if mode == 'persistent':
+        settings['CONN_MAX_AGE'] = int(environ.get('DB_CONN_MAX_AGE', 60))
+        settings['CONN_HEALTH_CHECKS'] = environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+    elif mode == 'pool':
+        if not pool_available():
+            raise ImproperlyConfigured(
+                'DB_CONNECTIONS=pool needs psycopg 3 and psycopg-pool: pip install -r requirements-pool.txt'
+            )
+        # Django returns the connection to the pool at the end of each request
+        settings['OPTIONS']['pool'] = {
+            'min_size': int(environ.get('DB_POOL_MIN_SIZE', 1)),
+            'max_size': int(environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': float(environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+    return settings
+
+
+def pool_available():
+    return all(importlib.util.find_spec(name) is not None for name in ('psycopg', 'psycopg_pool'))
+
+
+def postgres_database(config, environ=os.environ):
+    """Return the ``DATABASES`` entry ``config`` with the connection settings applied."""
+    connection = connection_settings(environ)
+    return {
+        **config,
+        **connection,
+        'OPTIONS': {**config.get('OPTIONS', {}), **connection['OPTIONS']},
+    }
@@ -0,0 +1,153 @@
+"""
+Real-time task changes for the ASGI application (taskmaster_project.asgi).
+
+``/api/v1/events/`` streams the requesting user's change events (todo_app.events),
+as Server-Sent Events over HTTP or as JSON text messages over a WebSocket:
+
+    GET /api/v1/events/          Authorization: Token <key>  (or ?token=<key>)
+    event: task.status_changed
+    data: {"type": "task.status_changed", "id": 12, "status": "completed"}
+
+Browsers can't set headers on EventSource or WebSocket connections, hence ``?token=``.
+Events only say what changed; clients refetch the item (or use /tasks/changes/ after
+a reconnect) and reload everything on ``resync``.
+
+It is a plain ASGI app in front of Django rather than a Django view, so an idle
+connection is a pending queue read and a heartbeat timer on the event loop: no
+middleware, thread or database connection is held while it waits.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from todo_app.events import get_event_broker
+from users.authentication import CachedTokenAuthentication
+
+
+class EventStream:
+    """ASGI app serving ``path``; every other connection goes to ``app`` (Django)."""
+    path = '/api/v1/events/'
+
+    def __init__(self, app):
+        self.app = app
+        self.heartbeat = getattr(settings, 'TASK_EVENTS', {}).get('HEARTBEAT_SECONDS', 15)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == self.path:
+            return await self.server_sent_events(scope, receive, send)
+        if scope['type'] == 'websocket' and scope['path'] == self.path:
+            return await self.websocket(scope, receive, send)
+        return await self.app(scope, receive, send)
+
+    async def server_sent_events(self, scope, receive, send):
+        headers = self.cors_headers(scope)
+        if scope['method'] not in ('GET', 'HEAD'):
+            return await self.respond(send, 405, {'detail': f"Method \"{scope['method']}\" not allowed."}, headers)
+
+        user = await self.authenticate(scope)
+        if user is None:
+            return await self.respond(send, 401, {'detail': 'Invalid or missing token.'}, headers)
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                # Keeps reverse proxies (nginx) from buffering the stream
+                (b'x-accel-buffering', b'no'),
+                *headers,
+            ],
+        })
+        if scope['method'] == 'HEAD':
+            return await send({'type': 'http.response.body', 'body': b''})
+
+        async def send_event(event):
+            if event is None:
+                chunk = b': heartbeat\n\n'
+            else:
+                chunk = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+        # Clients reconnect after 5 seconds if the stream drops
+        await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n', 'more_body': True})
+        await self.stream(user, receive, send_event, 'http.disconnect')
+
+    async def websocket(self, scope, receive, send):
+        message = await receive()
+        if message['type'] != 'websocket.connect':
+            return
+        user = await self.authenticate(scope)
+        if user is None:
+            # Closing before accepting rejects the handshake with 403
+            return await send({'type': 'websocket.close', 'code': 4401})
+        await send({'type': 'websocket.accept'})
+
+        async def send_event(event):
+            await send({'type': 'websocket.send', 'text': json.dumps(event or {'type': 'heartbeat'})})
+
+        await self.stream(user, receive, send_event, 'websocket.disconnect')
+
+    async def stream(self, user, receive, send_event, disconnect):
+        broker = get_event_broker()
+        subscription = broker.subscribe(user.pk)
+
+        async def wait_for_disconnect():
+            # Incoming WebSocket messages are ignored, the stream only goes one way
+            while (await receive())['type'] != disconnect:
+                pass
+            subscription.close()
+
+        watcher = asyncio.create_task(wait_for_disconnect())
+        try:
+            while True:
+                try:
+                    event = await subscription.get(self.heartbeat)
+                except TimeoutError:
+                    event = None
+                else:
+                    if event is None:
+                        break
+                await send_event(event)
+        except OSError:
+            # The server could not write to a client that went away
+            pass
+        finally:
+            watcher.cancel()
+            broker.unsubscribe(subscription)
+
+    async def authenticate(self, scope):
+        headers = dict(scope['headers'])
+        keyword, _, credentials = headers.get(b'authorization', b'').decode('latin-1').partition(' ')
+        if keyword.lower() == 'token' and credentials:
+            key = credentials.strip()
+        else:
+            key = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('token', [None])[0]
+        if not key:
+            return None
+        try:
+            user, _ = await CachedTokenAuthentication().aauthenticate_credentials(key)
+        except AuthenticationFailed:
+            return None
+        return user
+
+    @staticmethod
+    def cors_headers(scope):
+        # Requests to this app skip Django, and so corsheaders' CorsMiddleware
+        origin = dict(scope['headers']).get(b'origin')
+        if origin is not None and origin.decode('latin-1') in settings.CORS_ALLOWED_ORIGINS:
+            return [(b'access-control-allow-origin', origin), (b'vary', b'origin')]
+        return []
+
+    @staticmethod
+    async def respond(send, status, data, headers):
+        body = json.dumps(data).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()), *headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
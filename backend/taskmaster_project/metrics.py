@@ -0,0 +1,189 @@
+"""
+Per-request metrics collected by ``RequestMetricsMiddleware``.
+
+Queries are counted and timed by an execute wrapper installed on every database
+connection, which adds to the metrics of the request running in the current
+context (a ContextVar, so queries run through sync_to_async under ASGI are
+attributed too). Finished requests are aggregated per endpoint into fixed
+latency buckets, in memory and per process, and served to staff users by
+``RequestMetricsView``.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+current_request = ContextVar('current_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('start', 'queries', 'db', 'render_start', 'render_end', 'end')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.render_start = None
+        self.render_end = None
+        self.end = None
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    @property
+    def total_ms(self):
+        return (self.end - self.start) * 1000
+
+    @property
+    def db_ms(self):
+        return self.db * 1000
+
+    @property
+    def render_ms(self):
+        # Only DRF/template responses are rendered after the view returns; DRF serializers
+        # run inside the view and count as app
+        if self.render_start is None or self.render_end is None:
+            return 0.0
+        return (self.render_end - self.render_start) * 1000
+
+    @property
+    def app_ms(self):
+        return max(self.total_ms - self.db_ms - self.render_ms, 0.0)
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'app;dur={self.app_ms:.1f}',
+            f'render;dur={self.render_ms:.1f};desc="renderer"',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_request.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorders():
+    """Instrument the connections of this thread and every connection opened later."""
+    connection_created.connect(install_query_recorder, dispatch_uid='request-metrics')
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+class EndpointStats:
+    __slots__ = ('count', 'errors', 'buckets', 'total_ms', 'max_ms', 'db_ms', 'queries')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+
+    def add(self, metrics, status_code):
+        total_ms = metrics.total_ms
+        self.count += 1
+        self.errors += status_code >= 500
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, total_ms)] += 1
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.db_ms += metrics.db_ms
+        self.queries += metrics.queries
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the percentile (None past the last bucket)."""
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': round(self.total_ms / self.count, 2),
+            'max_ms': round(self.max_ms, 2),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'avg_db_ms': round(self.db_ms / self.count, 2),
+            'avg_queries': round(self.queries / self.count, 2),
+            'total_ms': round(self.total_ms, 2),
+            'buckets': self.buckets,
+        }
+
+
+class RequestMetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def record(self, endpoint, metrics, status_code):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.add(metrics, status_code)
+
+    def clear(self):
+        with self._lock:
+            self._endpoints = {}
+            self.since = timezone.now()
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = [
+                {'endpoint': endpoint, **stats.as_dict()}
+                for endpoint, stats in self._endpoints.items()
+            ]
+            since = self.since
+        endpoints.sort(key=lambda row: row['total_ms'], reverse=True)
+        return {
+            'since': since,
+            'buckets_ms': list(LATENCY_BUCKETS_MS),
+            'endpoints': endpoints,
+        }
+
+
+registry = RequestMetricsRegistry()
+
+
+class RequestMetricsView(APIView):
+    """Latency histogram per endpoint since the process started or the last DELETE."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registry.snapshot())
+
+    def delete(self, request):
+        registry.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,122 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.functional import SimpleLazyObject, empty
+
+from taskmaster_project.metrics import RequestMetrics, current_request, install_query_recorders, registry
+
+request_logger = logging.getLogger('taskmaster_project.requests')
+
+
+class RequestMetricsMiddleware:
+    """
+    Query count, DB time, render time and total latency of each request.
+
+    They are aggregated per endpoint for ``RequestMetricsView`` and logged as JSON
+    on ``taskmaster_project.requests`` when the request takes longer than
+    REQUEST_METRICS['SLOW_REQUEST_MS']. Staff users, or everyone when DEBUG is on,
+    also get them in a ``Server-Timing`` header; it tells how much of a request is
+    spent in the database, so it is not shown to other clients. The body of a
+    streaming response is not included in its timings.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = getattr(settings, 'REQUEST_METRICS', {})
+        if not options.get('ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = options.get('SERVER_TIMING', True)
+        self.slow_request_ms = options.get('SLOW_REQUEST_MS', 500)
+        install_query_recorders()
+
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django runs a sync hook in a thread under ASGI
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        self.time_render(response)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        self.time_render(response)
+        return response
+
+    @staticmethod
+    def time_render(response):
+        # First in MIDDLEWARE, so the last template response hook before response.render()
+        metrics = current_request.get()
+        if metrics is not None:
+            metrics.render_start = time.perf_counter()
+            response.add_post_render_callback(lambda response: setattr(metrics, 'render_end', time.perf_counter()))
+
+    def finish(self, request, response, metrics):
+        metrics.finish()
+        endpoint = self.get_endpoint(request)
+        registry.record(endpoint, metrics, response.status_code)
+        if self.server_timing and (settings.DEBUG or getattr(self.get_user(request), 'is_staff', False)):
+            response['Server-Timing'] = metrics.server_timing()
+        if metrics.total_ms >= self.slow_request_ms:
+            self.log_slow_request(request, response, endpoint, metrics)
+        return response
+
+    @staticmethod
+    def get_endpoint(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return f'{request.method} <unresolved>'
+        return f'{request.method} {match.view_name or match.route}'
+
+    @staticmethod
+    def get_user(request):
+        user = getattr(request, 'user', None)
+        if type(user) is SimpleLazyObject:
+            # Never load the session user just for the metrics (and not from the event loop)
+            user = None if user._wrapped is empty else user._wrapped
+        return user if getattr(user, 'is_authenticated', False) else None
+
+    def get_user_id(self, request):
+        user = self.get_user(request)
+        return None if user is None else user.pk
+
+    def log_slow_request(self, request, response, endpoint, metrics):
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'user_id': self.get_user_id(request),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_ms, 1),
+            'app_ms': round(metrics.app_ms, 1),
+            'render_ms': round(metrics.render_ms, 1),
+            'total_ms': round(metrics.total_ms, 1),
+        }
+        request_logger.warning('slow request %s', json.dumps(fields), extra={'request_metrics': fields})
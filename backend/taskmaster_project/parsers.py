@@ -0,0 +1,39 @@
+import io
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+# orjson decodes integers outside the 64-bit range as floats; every such literal has
+# at least 19 digits (below -2**63 or at least 2**64), the stdlib keeps them exact
+LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser that decodes UTF-8 bodies with orjson when it is installed.
+
+    Bodies orjson rejects are handed to JSONParser, so invalid JSON gets the same
+    400 response and anything the stdlib accepts (e.g. lone surrogates) still parses.
+    So are bodies with 19 or more digits in a row: they may hold an integer orjson
+    would turn into a float, and the stdlib parses it exactly.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_DIGITS.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
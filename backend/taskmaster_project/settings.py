@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+import dj_database_url
+
+from taskmaster_project.database import postgres_database
 
 
 
@@ -29,7 +32,7 @@ load_dotenv(ENV_FILE_PATH)
 SECRET_KEY = os.environ.get('SECRET_KEY','django-insecure-sp&3&icoj^t)nwjfcs25lcghi=^zi(n66_bk-fbl)qm_9@p0uo')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
 
 IS_PRODUCTION = os.environ.get('IS_PRODUCTION', 'False') == 'True'
@@ -57,9 +60,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'taskmaster_project.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'taskmaster_project.static_middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -83,7 +87,7 @@ ALLOWED_HOSTS = ['.vercel.app', 'localhost', '127.0.0.1']
 # Django Rest Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -91,8 +95,74 @@ REST_FRAMEWORK = {
        'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    # orjson-backed JSON when installed, same output as DRF's JSONRenderer/JSONParser
+    'DEFAULT_RENDERER_CLASSES': [
+        'taskmaster_project.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'taskmaster_project.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Token lookups cached by users.authentication.CachedTokenAuthentication.
+# BACKEND is the CACHES alias that carries entries and revocations between processes;
+# it must be a shared cache (Redis, Memcached, database) when running more than one.
+TOKEN_AUTH_CACHE = {
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 300)),
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'BACKEND': os.environ.get('TOKEN_AUTH_CACHE_BACKEND', 'default'),
+}
+
+# Cached list payloads and ETags for tasks/categories/tags (todo_app.caching)
+COLLECTION_CACHE = {
+    'BACKEND': os.environ.get('COLLECTION_CACHE_BACKEND', 'default'),
+    'TTL': int(os.environ.get('COLLECTION_CACHE_TTL', 300)),
 }
 
+# Server-Timing header, per-endpoint histogram (/api/v1/metrics/requests/, staff only)
+# and JSON logs on taskmaster_project.requests for requests slower than SLOW_REQUEST_MS
+REQUEST_METRICS = {
+    'ENABLED': os.environ.get('REQUEST_METRICS_ENABLED', 'True') == 'True',
+    'SERVER_TIMING': os.environ.get('REQUEST_METRICS_SERVER_TIMING', 'True') == 'True',
+    'SLOW_REQUEST_MS': int(os.environ.get('REQUEST_METRICS_SLOW_REQUEST_MS', 500)),
+}
+
+# Change events streamed by /api/v1/events/ under ASGI (todo_app.events, taskmaster_project.event_stream).
+# BACKEND carries events between processes, the in-process one only reaches this process' connections.
+TASK_EVENTS = {
+    'BACKEND': os.environ.get('TASK_EVENTS_BACKEND', 'todo_app.events.InProcessBackend'),
+    'QUEUE_SIZE': int(os.environ.get('TASK_EVENTS_QUEUE_SIZE', 100)),
+    'HEARTBEAT_SECONDS': int(os.environ.get('TASK_EVENTS_HEARTBEAT_SECONDS', 15)),
+}
+
+# Due-date reminders sent by manage.py run_reminders (todo_app.reminders): LEAD_MINUTES before due_date,
+# at most BATCH_SIZE tasks per query and HANDLER call, new and rescheduled tasks seen every REFILL_SECONDS.
+REMINDERS = {
+    'LEAD_MINUTES': int(os.environ.get('REMINDERS_LEAD_MINUTES', 15)),
+    'BATCH_SIZE': int(os.environ.get('REMINDERS_BATCH_SIZE', 500)),
+    'REFILL_SECONDS': int(os.environ.get('REMINDERS_REFILL_SECONDS', 60)),
+    'HANDLER': os.environ.get('REMINDERS_HANDLER', 'todo_app.reminders.publish_reminders'),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'taskmaster_project.requests': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# Deleted-task tombstones kept for /tasks/changes/, older watermarks need a full resync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+# Longest a write can take to commit: /tasks/changes/ re-reads this much (todo_app.sync)
+SYNC_COMMIT_WINDOW_SECONDS = int(os.environ.get('SYNC_COMMIT_WINDOW_SECONDS', 60))
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
@@ -119,27 +189,23 @@ WSGI_APPLICATION = 'taskmaster_project.wsgi.app'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 
+# Connection reuse (DB_CONNECTIONS, DB_CONN_MAX_AGE, DB_POOL_*) is documented in
+# taskmaster_project/database.py and applies to both Postgres configurations.
+
 if IS_PRODUCTION:
     DATABASES = {
-        'default': {
+        'default': postgres_database({
             'ENGINE': 'django.db.backends.postgresql',
             'NAME': os.environ.get('DB_NAME'),
             'USER': os.environ.get('DB_USER'),
             'PASSWORD': os.environ.get('DB_PASSWORD'),
             'HOST': os.environ.get('DB_HOST'),
             'PORT': os.environ.get('DB_PORT'),
-        }
+        })
     }
 elif os.environ.get('DATABASE_URL'):
     DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': os.environ.get('DB_NAME'),
-            'USER': os.environ.get('DB_USER'),
-            'PASSWORD': os.environ.get('DB_PASSWORD'),
-            'HOST': os.environ.get('DB_HOST'),
-            'PORT': os.environ.get('DB_PORT'),
-        }
+        'default': postgres_database(dj_database_url.parse(os.environ['DATABASE_URL']))
     }
 else:
     DATABASES = {
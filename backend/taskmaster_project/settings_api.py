@@ -0,0 +1,54 @@
+"""
+API-only settings profile for serverless deployments (taskmaster_project.wsgi_api).
+
+Same configuration as taskmaster_project.settings without what a token-authenticated
+JSON API never uses: the admin, sessions, messages and static files apps, their
+middleware, the browsable API and translation catalogs. Each cold start then imports
+and initializes less; run ``python -m benchmarks.bench_cold_start`` to compare both
+profiles.
+
+Migrations and the admin still need the full profile (manage.py uses it by default).
+"""
+from taskmaster_project.settings import *  # noqa: F401,F403
+from taskmaster_project.settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+
+    #Third party apps
+    'rest_framework',
+    'rest_framework.authtoken',
+    'django_filters',
+    'corsheaders',
+
+    # Local apps
+    'users',
+    'todo_app',
+]
+
+# No sessions, cookies or HTML: CSRF, messages, clickjacking and session auth do not apply.
+# DRF authenticates the request itself and sets request.user for RequestMetricsMiddleware.
+MIDDLEWARE = [
+    'taskmaster_project.middleware.RequestMetricsMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'taskmaster_project.api_urls'
+
+WSGI_APPLICATION = 'taskmaster_project.wsgi_api.app'
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'taskmaster_project.renderers.ORJSONRenderer',
+    ],
+}
+
+# Only used by the browsable API and Django's HTML error pages, which fall back to plain text
+TEMPLATES = []
+
+# Every message is English (LANGUAGE_CODE), loading the gettext catalogs of each app is wasted work
+USE_I18N = False
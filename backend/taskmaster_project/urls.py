@@ -15,16 +15,16 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import path
 
 from django.conf import settings
 from django.conf.urls.static import static
 
+from taskmaster_project.api_urls import urlpatterns as api_urlpatterns
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/v1/', include('todo_app.urls')),
-    path('api/v1/', include('users.urls')),
-    path('api/v1/users/', include('users.urls')),
+    *api_urlpatterns,
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
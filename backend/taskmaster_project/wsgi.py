@@ -2,6 +2,8 @@
 WSGI config for taskmaster_project project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+``app`` is the Vercel entry point: a warm instance keeps its database connection
+between invocations (see taskmaster_project.database).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
@@ -0,0 +1,15 @@
+"""
+WSGI entry point of the API-only profile (taskmaster_project.settings_api).
+
+``app`` is the Vercel entry point (see vercel.json); taskmaster_project.wsgi
+still serves the full profile, with the admin.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmaster_project.settings_api')
+
+application = get_wsgi_application()
+app = application
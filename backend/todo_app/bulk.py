@@ -0,0 +1,187 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from .caching import bump_collection_version
+from .events import publish_event
+from .models import Task
+from .positions import place_at_bottom
+from .serializers import TaskSerializer
+
+
+class BulkTaskOperations:
+    """
+    Validates a batch of task operations with the TaskSerializer rules and applies them
+    in one transaction using bulk_create / bulk_update and a queryset delete().
+    A task deleted by another request between is_valid() and save() fails the batch
+    like a missing one: save() returns None and sets ``errors``.
+    """
+
+    def __init__(self, operations, context):
+        self.operations = operations
+        self.context = context
+        self.user = context['request'].user
+        self.errors = []
+
+    def is_valid(self):
+        ids = [operation['id'] for operation in self.operations if operation['op'] != 'create']
+        self.tasks = Task.objects.for_user(self.user).in_bulk(ids)
+        self.validated = []
+        seen = set()
+
+        for index, operation in enumerate(self.operations):
+            op = operation['op']
+            task = None
+            if op != 'create':
+                task = self.tasks.get(operation['id'])
+                if task is None:
+                    self._add_error(index, operation, status.HTTP_404_NOT_FOUND, {'id': 'Not found.'})
+                    continue
+                if task.pk in seen:
+                    self._add_error(index, operation, status.HTTP_400_BAD_REQUEST,
+                                    {'id': 'Task appears in more than one operation.'})
+                    continue
+                seen.add(task.pk)
+
+            data = None
+            if op in ('create', 'update'):
+                serializer = TaskSerializer(
+                    task, data=operation['data'], partial=op == 'update', context=self.context
+                )
+                if not serializer.is_valid():
+                    self._add_error(index, operation, status.HTTP_400_BAD_REQUEST, serializer.errors)
+                    continue
+                data = dict(serializer.validated_data)
+
+            self.validated.append((index, operation, task, data))
+
+        return not self.errors
+
+    @transaction.atomic
+    def save(self):
+        if not self._lock_tasks():
+            return None
+
+        now = timezone.now()
+        through = Task.tags.through
+        created, updated = [], []
+        tag_sets = {}
+        statuses = defaultdict(list)
+        deleted = []
+
+        for index, operation, task, data in self.validated:
+            op = operation['op']
+            if op == 'create':
+                tags = data.pop('tag_ids', [])
+                task = Task(user=self.user, **data)
+                created.append((index, task, tags))
+            elif op == 'update':
+                tags = data.pop('tag_ids', None)
+                for attr, value in data.items():
+                    setattr(task, attr, value)
+                task.updated_at = now
+                updated.append((index, task, set(data)))
+                if tags is not None:
+                    tag_sets[task] = tags
+            elif op == 'change_status':
+                statuses[operation['status']].append(task)
+            else:
+                deleted.append(task.pk)
+
+        # Tasks entering a column go to its bottom (todo_app.positions), each write
+        # reads the last keys after the previous one
+        place_at_bottom([task for _, task, _ in created])
+        Task.objects.bulk_create([task for _, task, _ in created])
+        for _, task, tags in created:
+            tag_sets[task] = tags
+
+        if updated:
+            moved = [(task, fields) for _, task, fields in updated if task.status != task._loaded_status]
+            place_at_bottom([task for task, _ in moved])
+            for _, fields in moved:
+                fields.add('position')
+            fields = set().union(*(fields for _, _, fields in updated)) | {'updated_at'}
+            Task.objects.bulk_update([task for _, task, _ in updated], list(fields))
+
+        if tag_sets:
+            through.objects.filter(task_id__in=[task.pk for task in tag_sets]).delete()
+            through.objects.bulk_create([
+                through(task_id=task.pk, tag_id=tag.pk)
+                for task, tags in tag_sets.items()
+                for tag in tags
+            ])
+
+        if statuses:
+            changed = []
+            for status_value, tasks in statuses.items():
+                for task in tasks:
+                    task.status = status_value
+                    task.updated_at = now
+                    changed.append(task)
+            place_at_bottom([task for task in changed if task.status != task._loaded_status])
+            Task.objects.bulk_update(changed, ['status', 'position', 'updated_at'])
+
+        if deleted:
+            Task.objects.filter(pk__in=deleted).delete()
+
+        # bulk_create/bulk_update don't send model signals (delete() does)
+        bump_collection_version(self.user.pk)
+        self._publish_events(created, updated, statuses)
+        return self._results(created)
+
+    def _lock_tasks(self):
+        # The rows stay locked until the batch commits, so none can go away halfway
+        pks = [task.pk for _, _, task, _ in self.validated if task is not None]
+        found = set(Task.objects.select_for_update().filter(pk__in=pks).values_list('pk', flat=True))
+        for index, operation, task, _ in self.validated:
+            if task is not None and task.pk not in found:
+                self._add_error(index, operation, status.HTTP_404_NOT_FOUND, {'id': 'Not found.'})
+        return not self.errors
+
+    def _publish_events(self, created, updated, statuses):
+        for _, task, _ in created:
+            publish_event(self.user.pk, 'task.created', task.pk)
+        for _, task, fields in updated:
+            if 'status' in fields and task._loaded_status != task.status:
+                publish_event(self.user.pk, 'task.status_changed', task.pk, status=task.status)
+            else:
+                publish_event(self.user.pk, 'task.updated', task.pk)
+        for status_value, tasks in statuses.items():
+            for task in tasks:
+                publish_event(self.user.pk, 'task.status_changed', task.pk, status=status_value)
+
+    def _results(self, created):
+        pks = {index: task.pk for index, task, _ in created}
+        for index, operation, task, _ in self.validated:
+            if task is not None:
+                pks[index] = task.pk
+
+        tasks = Task.objects.with_related().in_bulk(
+            [pk for index, pk in pks.items() if self.operations[index]['op'] != 'delete']
+        )
+        codes = {
+            'create': status.HTTP_201_CREATED,
+            'update': status.HTTP_200_OK,
+            'change_status': status.HTTP_200_OK,
+            'delete': status.HTTP_204_NO_CONTENT,
+        }
+
+        results = []
+        for index, operation in enumerate(self.operations):
+            op = operation['op']
+            result = {'index': index, 'op': op, 'id': pks[index], 'status': codes[op]}
+            if op != 'delete':
+                result['data'] = TaskSerializer(tasks[pks[index]], context=self.context).data
+            results.append(result)
+        return results
+
+    def _add_error(self, index, operation, code, errors):
+        self.errors.append({
+            'index': index,
+            'op': operation['op'],
+            'id': operation.get('id'),
+            'status': code,
+            'errors': errors,
+        })
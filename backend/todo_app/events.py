@@ -0,0 +1,152 @@
+"""
+Per-user change events pushed to clients by taskmaster_project.event_stream.
+
+Writes become small events (``{"type": "task.updated", "id": 12}``) in the model
+signal receivers (todo_app.signals) and are published once the transaction commits,
+so a client that refetches on an event always sees the change. The ``EventBroker``
+fans them out to the connections of this process; its backend carries them there:
+
+- ``InProcessBackend`` (default) delivers straight away. Every server process only
+  sees the writes it handles itself, which is enough for a single ASGI process.
+- Any other backend (Redis pub/sub, Postgres LISTEN/NOTIFY, ...) is a class built
+  with ``(broker, **TASK_EVENTS['OPTIONS'])`` whose ``publish(user_id, event)`` sends
+  the event to every process, and which calls ``broker.deliver(user_id, event)`` for
+  the events it receives.
+
+Event types: ``task.created``, ``task.updated``, ``task.status_changed`` (with the new
+``status``), ``task.deleted``, the same ``created``/``updated``/``deleted`` for
+``category`` and ``tag``, ``task.reminder`` (with its ``due_date``, from todo_app.reminders)
+and ``resync`` when a client should reload everything (bulk imports, or events dropped
+because the connection could not keep up).
+"""
+import asyncio
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+RESYNC = {'type': 'resync'}
+
+
+class InProcessBackend:
+
+    def __init__(self, broker, **options):
+        self.broker = broker
+
+    def publish(self, user_id, event):
+        self.broker.deliver(user_id, event)
+
+
+class Subscription:
+    """The events of one user for one connection, consumed on the connection's event loop."""
+
+    def __init__(self, user_id, max_size):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_size)
+        self.closed = False
+
+    def put(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client that can't keep up gets one resync instead of an unbounded backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout):
+        """The next event, ``None`` once closed; raises TimeoutError after ``timeout`` seconds."""
+        if self.closed:
+            return None
+        # asyncio.timeout() rather than wait_for(), which wraps every read in a new Task
+        async with asyncio.timeout(timeout):
+            return await self.queue.get()
+
+    def close(self):
+        self.closed = True
+        if not self.queue.full():
+            # Wakes up a pending get(), a full queue returns right away anyway
+            self.queue.put_nowait(None)
+
+
+class EventBroker:
+
+    def __init__(self, backend='todo_app.events.InProcessBackend', queue_size=100, **options):
+        self.queue_size = queue_size
+        self.subscriptions = {}
+        self._lock = threading.Lock()
+        self.backend = import_string(backend)(self, **options)
+
+    def publish(self, user_id, event):
+        self.backend.publish(user_id, event)
+
+    def deliver(self, user_id, event):
+        """Hand ``event`` to this process' subscriptions of ``user_id``; safe from any thread."""
+        loops = {}
+        with self._lock:
+            for subscription in self.subscriptions.get(user_id, ()):
+                loops.setdefault(subscription.loop, []).append(subscription)
+        # One wake-up per event loop rather than one per connection
+        for loop, subscriptions in loops.items():
+            try:
+                loop.call_soon_threadsafe(self._put, subscriptions, event)
+            except RuntimeError:
+                # The event loop is gone
+                for subscription in subscriptions:
+                    self.unsubscribe(subscription)
+
+    @staticmethod
+    def _put(subscriptions, event):
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def subscribe(self, user_id):
+        """Must be called from the event loop that consumes the subscription."""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self.subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        with self._lock:
+            subscriptions = self.subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.user_id]
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self.subscriptions.values())
+
+
+_broker = None
+
+
+def get_event_broker():
+    global _broker
+    if _broker is None:
+        options = getattr(settings, 'TASK_EVENTS', {})
+        _broker = EventBroker(
+            backend=options.get('BACKEND', 'todo_app.events.InProcessBackend'),
+            queue_size=options.get('QUEUE_SIZE', 100),
+            **options.get('OPTIONS', {}),
+        )
+    return _broker
+
+
+def reset_event_broker():
+    global _broker
+    _broker = None
+
+
+def publish_event(user_id, event_type, pk=None, **data):
+    """Publish an event for ``user_id`` when the current transaction commits (right away outside one)."""
+    event = {'type': event_type, **({'id': pk} if pk is not None else {}), **data}
+    transaction.on_commit(partial(get_event_broker().publish, user_id, event))
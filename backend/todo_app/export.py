@@ -0,0 +1,116 @@
+"""
+Streaming task export (GET /tasks/export/?format=ndjson|csv).
+
+Tasks are read with ``QuerySet.iterator(chunk_size)``, which also runs the category/tag
+prefetch once per chunk, and every chunk is encoded and handed to the response before
+the next one is loaded. Memory stays bounded by the chunk size, not by the task count.
+
+Under ASGI, Django serves a synchronous streaming iterator by collecting it into a list
+first, so the view hands the ASGI server ``aexport_tasks()`` instead, which reads the
+chunks with ``QuerySet.aiterator(chunk_size)``.
+"""
+import csv
+import io
+from itertools import islice
+
+from rest_framework import renderers, serializers
+
+from taskmaster_project.renderers import ORJSONRenderer
+
+EXPORT_FIELDS = [
+    'id', 'title', 'description', 'status', 'priority', 'due_date',
+    'category', 'tags', 'created_at', 'updated_at',
+]
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """One JSON object per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    json_renderer = ORJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return self.render_rows(rows)
+
+    def render_header(self, fields):
+        return b''
+
+    def render_rows(self, rows):
+        return b''.join(self.json_renderer.render(row) + b'\n' for row in rows)
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """Flat rows with a header line; list values are joined with `;`."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return self.render_header(list(rows[0]) if rows else []) + self.render_rows(rows)
+
+    def render_header(self, fields):
+        return self._write([fields])
+
+    def render_rows(self, rows):
+        return self._write(
+            [';'.join(value) if isinstance(value, list) else value for value in row.values()]
+            for row in rows
+        )
+
+    def _write(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+
+def export_row(task, to_datetime):
+    category = task.category
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'status': task.status,
+        'priority': task.priority,
+        'due_date': to_datetime(task.due_date) if task.due_date else None,
+        'category': category.name if category else None,
+        'tags': [tag.name for tag in task.tags.all()],
+        'created_at': to_datetime(task.created_at),
+        'updated_at': to_datetime(task.updated_at),
+    }
+
+
+def export_tasks(queryset, renderer, chunk_size=1000):
+    """Yield ``queryset`` encoded by ``renderer``, one bytes block per ``chunk_size`` tasks."""
+    to_datetime = datetime_formatter()
+    yield renderer.render_header(EXPORT_FIELDS)
+    tasks = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(tasks, chunk_size)):
+        yield renderer.render_rows([export_row(task, to_datetime) for task in chunk])
+
+
+async def aexport_tasks(queryset, renderer, chunk_size=1000):
+    """export_tasks() as an async generator, for StreamingHttpResponse under ASGI."""
+    to_datetime = datetime_formatter()
+    yield renderer.render_header(EXPORT_FIELDS)
+    chunk = []
+    async for task in queryset.aiterator(chunk_size=chunk_size):
+        chunk.append(export_row(task, to_datetime))
+        if len(chunk) == chunk_size:
+            yield renderer.render_rows(chunk)
+            chunk = []
+    if chunk:
+        yield renderer.render_rows(chunk)
+
+
+def datetime_formatter():
+    # Same datetime format as the API, with the timezone resolved once
+    return serializers.DateTimeField(
+        default_timezone=serializers.DateTimeField().default_timezone()
+    ).to_representation
@@ -0,0 +1,59 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key of an object owned by the requesting user; ids of other users' objects
+    are rejected as if they did not exist. With ``many=True`` all the ids are resolved
+    with a single ``IN`` query (see ``ManyPrimaryKeyRelatedField``).
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is not None and hasattr(request, 'user'):
+            queryset = queryset.filter(user=request.user)
+        return queryset
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManyPrimaryKeyRelatedField(**list_kwargs)
+
+
+class ManyPrimaryKeyRelatedField(serializers.ManyRelatedField):
+    """
+    ManyRelatedField that looks all the ids up at once with ``in_bulk()`` instead of a
+    ``get()`` per id. Errors and the returned list (in input order, repeats included)
+    are the same as ManyRelatedField's.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        pks = [self.to_pk(item) for item in data]
+        objects = child.get_queryset().in_bulk(set(pks))
+        for pk in pks:
+            if pk not in objects:
+                child.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+    def to_pk(self, item):
+        child = self.child_relation
+        if child.pk_field is not None:
+            item = child.pk_field.to_internal_value(item)
+        if isinstance(item, bool):
+            child.fail('incorrect_type', data_type=type(item).__name__)
+        try:
+            return child.queryset.model._meta.pk.to_python(item)
+        except DjangoValidationError:
+            child.fail('incorrect_type', data_type=type(item).__name__)
@@ -0,0 +1,88 @@
+import django_filters
+from django import forms
+from django.db.models import Count, Exists, OuterRef
+from rest_framework import filters
+
+from .models import Task
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """
+    `?ordering=priority` sorts by the numeric `priority_rank` (low < medium < high)
+    instead of the label, so it matches the default ordering and its index.
+
+    `?ordering=position` breaks ties by id, the order moves are made in (todo_app.positions).
+    """
+    ordering_aliases = {'priority': 'priority_rank'}
+    tiebreakers = {'position': 'id'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = [self.resolve_alias(field) for field in ordering]
+        names = {field.lstrip('-') for field in ordering}
+        for field in list(ordering):
+            tiebreaker = self.tiebreakers.get(field.lstrip('-'))
+            if tiebreaker and tiebreaker not in names:
+                ordering.append(('-' if field.startswith('-') else '') + tiebreaker)
+                names.add(tiebreaker)
+        return ordering
+
+    def resolve_alias(self, field):
+        prefix = '-' if field.startswith('-') else ''
+        name = field.lstrip('-')
+        return prefix + self.ordering_aliases.get(name, name)
+
+
+class TagIdsFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    """Comma-separated tag ids, rejecting anything that is not an integer."""
+    field_class = forms.IntegerField
+
+
+class TaskFilterForm(forms.Form):
+    max_tags = 100
+
+    def clean_tags(self):
+        tag_ids = self.cleaned_data.get('tags')
+        if tag_ids and len(set(tag_ids)) > self.max_tags:
+            raise forms.ValidationError(f'Filter by at most {self.max_tags} tags.')
+        return tag_ids
+
+
+class TaskFilterSet(django_filters.FilterSet):
+    """
+    `?tags=1,2` keeps tasks with any of the tags, `&tags_mode=all` only tasks with
+    every one of them and `&tags_mode=none` tasks with none of them.
+
+    Every mode is a semi-join on the tags through table instead of a JOIN, so rows
+    are not multiplied and the result needs no DISTINCT. `any`/`all` use
+    `id IN (SELECT task_id ...)`, which starts from the tag index and stays cheap for
+    rarely used tags among thousands; `none` uses NOT EXISTS, probing the task/tag
+    unique index for each of the user's tasks.
+    """
+    TAG_MODES = [('any', 'Any'), ('all', 'All'), ('none', 'None')]
+
+    tags = TagIdsFilter(method='filter_tags')
+    tags_mode = django_filters.ChoiceFilter(choices=TAG_MODES, method='filter_tags_mode')
+
+    class Meta:
+        model = Task
+        form = TaskFilterForm
+        fields = ['status', 'priority', 'category', 'tags', 'tags_mode']
+
+    def filter_tags(self, queryset, name, value):
+        tag_ids = sorted(set(value))
+        tagged = Task.tags.through.objects.filter(tag_id__in=tag_ids)
+        mode = self.form.cleaned_data.get('tags_mode') or 'any'
+
+        if mode == 'none':
+            return queryset.filter(~Exists(tagged.filter(task_id=OuterRef('pk'))))
+        if mode == 'all' and len(tag_ids) > 1:
+            # (task, tag) is unique in the through table, so matching rows == requested tags
+            tagged = tagged.values('task_id').annotate(matched=Count('tag_id')).filter(matched=len(tag_ids))
+        return queryset.filter(pk__in=tagged.values('task_id'))
+
+    def filter_tags_mode(self, queryset, name, value):
+        # Read by filter_tags
+        return queryset
@@ -0,0 +1,254 @@
+"""
+Bulk task import from NDJSON or CSV files (POST /tasks/import/ and manage.py import_tasks).
+
+Rows use the export format (todo_app.export): category and tags are given by name and
+resolved or created per user. The file is parsed as a stream and written in batches,
+each with one bulk_create for tasks and one for their tag links, instead of an INSERT
+plus a tags.set() per task. Invalid rows are skipped and reported by line number; a CSV
+file that cannot be read at all (not UTF-8, broken quoting) is rejected as a whole.
+
+Rows are checked by ``validate_row()`` with the rules and messages of TaskSerializer
+for the same fields. A serializer per row spent most of the import in DRF's per-field
+machinery (a run_validation and the validators for every value).
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .caching import bump_collection_version
+from .events import publish_event
+from .models import Category, Tag, Task
+from .positions import place_at_bottom
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+
+json_loads = orjson.loads if orjson else json.loads
+
+STATUSES = dict(Task.STATUS_CHOICES)
+PRIORITIES = dict(Task.PRIORITY_CHOICES)
+TITLE_LENGTH = Task._meta.get_field('title').max_length
+CATEGORY_LENGTH = Category._meta.get_field('name').max_length
+TAG_LENGTH = Tag._meta.get_field('name').max_length
+
+# serializers.ListField has a max_length message of its own, only not_a_list is taken from it
+MESSAGES = {
+    **serializers.Field.default_error_messages,
+    **serializers.CharField.default_error_messages,
+    **serializers.ChoiceField.default_error_messages,
+    'not_a_list': serializers.ListField.default_error_messages['not_a_list'],
+}
+due_date_field = serializers.DateTimeField(allow_null=True)
+
+
+class InvalidImportFile(ValueError):
+    pass
+
+
+def _fail(key, **kwargs):
+    raise serializers.ValidationError(str(MESSAGES[key]).format(**kwargs), code=key)
+
+
+def _text(value, max_length=None, allow_blank=False):
+    # What serializers.CharField accepts: strings and numbers, with the whitespace trimmed
+    if value is None:
+        _fail('null')
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        _fail('invalid')
+    value = str(value).strip()
+    if not value and not allow_blank:
+        _fail('blank')
+    if max_length is not None and len(value) > max_length:
+        _fail('max_length', max_length=max_length)
+    return value
+
+
+def _choice(value, choices):
+    if value is None:
+        _fail('null')
+    if str(value) not in choices:
+        _fail('invalid_choice', input=value)
+    return str(value)
+
+
+def _due_date(value):
+    if value is None or value == '':
+        return None
+    return due_date_field.to_internal_value(value)
+
+
+def _tags(value):
+    if isinstance(value, (str, dict)) or not hasattr(value, '__iter__'):
+        _fail('not_a_list', input_type=type(value).__name__)
+    names, errors = [], {}
+    for index, name in enumerate(value):
+        try:
+            names.append(_text(name, TAG_LENGTH))
+        except serializers.ValidationError as exc:
+            errors[index] = exc.detail
+    if errors:
+        raise serializers.ValidationError(errors)
+    return names
+
+
+# (field, check) of the fields of an import row, in the order TaskSerializer reports them
+ROW_CHECKS = [
+    ('title', lambda value: _text(value, TITLE_LENGTH)),
+    ('description', lambda value: _text(value, allow_blank=True)),
+    ('status', lambda value: _choice(value, STATUSES)),
+    ('priority', lambda value: _choice(value, PRIORITIES)),
+    ('due_date', _due_date),
+    ('category', lambda value: _text(value, CATEGORY_LENGTH, allow_blank=True) if value is not None else None),
+    ('tags', _tags),
+]
+
+
+def validate_row(row):
+    """
+    The task fields of an import row (category and tags still as names), or a
+    ValidationError with the errors TaskSerializer would give for them.
+    """
+    data, errors = {}, {}
+    for name, check in ROW_CHECKS:
+        try:
+            if name in row:
+                data[name] = check(row[name])
+            elif name == 'title':
+                _fail('required')
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+    if errors:
+        raise serializers.ValidationError(errors)
+    return data
+
+
+def read_ndjson(stream):
+    """Yield ``(line, row)`` per line of a binary stream; ``row`` is None for invalid JSON."""
+    for line, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        try:
+            row = json_loads(text)
+        except ValueError:
+            row = None
+        yield line, row
+
+
+def read_csv(stream):
+    """Yield ``(line, row)`` per CSV record; empty cells are left out and tags split on `;`."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    records = iter(reader)
+    while True:
+        try:
+            record = next(records, None)
+        except UnicodeDecodeError:
+            raise InvalidImportFile('The file is not UTF-8 encoded.')
+        except csv.Error as exc:
+            raise InvalidImportFile(f'Invalid CSV on line {reader.line_num + 1}: {exc}')
+        if record is None:
+            return
+        row = {key: value for key, value in record.items() if key and value not in ('', None)}
+        if 'tags' in row:
+            row['tags'] = [name.strip() for name in row['tags'].split(';') if name.strip()]
+        yield reader.line_num, row
+
+
+class TaskImporter:
+    """Import tasks for ``user``; ``run(stream, format)`` returns the import report."""
+    batch_size = 1000
+
+    def __init__(self, user, batch_size=None):
+        self.user = user
+        self.batch_size = batch_size or self.batch_size
+        self.categories = {}
+        self.tags = {}
+        self.created = 0
+        self.categories_created = 0
+        self.tags_created = 0
+        self.errors = []
+
+    @transaction.atomic
+    def run(self, stream, format):
+        rows = read_csv(stream) if format == 'csv' else read_ndjson(stream)
+        while batch := list(islice(self.validate(rows), self.batch_size)):
+            self.save_batch(batch)
+
+        if self.created:
+            bump_collection_version(self.user.pk)
+            # One event for the whole import instead of one per row
+            publish_event(self.user.pk, 'resync')
+        return self.report
+
+    @property
+    def report(self):
+        return {
+            'created': self.created,
+            'categories_created': self.categories_created,
+            'tags_created': self.tags_created,
+            'errors': self.errors,
+        }
+
+    def validate(self, rows):
+        for line, row in rows:
+            if not isinstance(row, dict):
+                self.errors.append({'line': line, 'errors': {'non_field_errors': ['Invalid JSON object.']}})
+                continue
+            try:
+                yield validate_row(row)
+            except serializers.ValidationError as exc:
+                self.errors.append({'line': line, 'errors': exc.detail})
+
+    def save_batch(self, batch):
+        self.resolve_categories({row['category'] for row in batch if row.get('category')})
+        self.resolve_tags({name for row in batch for name in row.get('tags', ())})
+
+        tasks = []
+        task_tags = []
+        for row in batch:
+            category = row.pop('category', None)
+            task_tags.append({self.tags[name] for name in row.pop('tags', ())})
+            tasks.append(Task(user_id=self.user.pk, category_id=self.categories.get(category), **row))
+        # In file order at the bottom of their columns, one query per column (todo_app.positions)
+        place_at_bottom(tasks)
+        Task.objects.bulk_create(tasks)
+
+        through = Task.tags.through
+        through.objects.bulk_create([
+            through(task_id=task.pk, tag_id=tag_id)
+            for task, tag_ids in zip(tasks, task_tags)
+            for tag_id in tag_ids
+        ])
+        self.created += len(tasks)
+
+    def resolve_categories(self, names):
+        missing = names - self.categories.keys()
+        if not missing:
+            return
+        # Names are not unique for categories, the oldest one wins
+        for pk, name in Category.objects.filter(user=self.user, name__in=missing).order_by('-pk').values_list('pk', 'name'):
+            self.categories[name] = pk
+        new = [Category(user=self.user, name=name) for name in missing - self.categories.keys()]
+        Category.objects.bulk_create(new)
+        self.categories.update((category.name, category.pk) for category in new)
+        self.categories_created += len(new)
+
+    def resolve_tags(self, names):
+        missing = names - self.tags.keys()
+        if not missing:
+            return
+        existing = dict(Tag.objects.filter(user=self.user, name__in=missing).values_list('name', 'pk'))
+        new = missing - existing.keys()
+        if new:
+            # ignore_conflicts: a tag created concurrently is simply picked up below
+            Tag.objects.bulk_create([Tag(user=self.user, name=name) for name in new], ignore_conflicts=True)
+            existing.update(Tag.objects.filter(user=self.user, name__in=new).values_list('name', 'pk'))
+            self.tags_created += len(new)
+        self.tags.update(existing)
@@ -0,0 +1,38 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from todo_app.importer import IMPORT_FORMATS, InvalidImportFile, TaskImporter
+
+
+class Command(BaseCommand):
+    help = 'Import tasks for a user from an NDJSON or CSV file (same format as /tasks/export/).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='Username that will own the tasks.')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=TaskImporter.batch_size)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        file_format = options['format'] or ('csv' if options['path'].lower().endswith('.csv') else 'ndjson')
+        start = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = TaskImporter(user, options['batch_size']).run(stream, file_format)
+        except (OSError, InvalidImportFile) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors']:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            f"Imported {report['created']} tasks ({report['categories_created']} new categories, "
+            f"{report['tags_created']} new tags) with {len(report['errors'])} invalid rows "
+            f"in {time.perf_counter() - start:.1f}s."
+        )
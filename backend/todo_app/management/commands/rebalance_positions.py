@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from todo_app.positions import REBALANCE_LENGTH, long_columns, rebalance
+
+
+class Command(BaseCommand):
+    help = 'Rewrite the task columns whose position keys got longer than --max-length with short keys.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-length', type=int, default=REBALANCE_LENGTH)
+
+    def handle(self, *args, **options):
+        columns = list(long_columns(options['max_length']))
+        tasks = sum(rebalance(user_id, status) for user_id, status in columns)
+        self.stdout.write(f'Rebalanced {len(columns)} columns ({tasks} tasks).')
@@ -0,0 +1,34 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from todo_app.reminders import ReminderScheduler
+
+
+class Command(BaseCommand):
+    help = 'Send due-date reminders as tasks come due (settings.REMINDERS), or once with --once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Send the reminders due now and exit (for cron).')
+        parser.add_argument('--lead-minutes', type=int, help='Defaults to REMINDERS["LEAD_MINUTES"].')
+        parser.add_argument('--batch-size', type=int, help='Defaults to REMINDERS["BATCH_SIZE"].')
+
+    def handle(self, *args, **options):
+        lead = options['lead_minutes']
+        scheduler = ReminderScheduler(
+            lead=datetime.timedelta(minutes=lead) if lead is not None else None,
+            batch_size=options['batch_size'],
+        )
+        if options['once']:
+            self.stdout.write(f'Sent {scheduler.run_pending()} reminders.')
+            return
+
+        try:
+            while True:
+                sent = scheduler.run_pending()
+                if sent:
+                    self.stdout.write(f'Sent {sent} reminders.')
+                time.sleep(scheduler.seconds_until_next())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,44 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from todo_app.seeding import CATEGORY_NAMES, TAG_NAMES, seed_benchmark_data
+
+
+class Command(BaseCommand):
+    help = (
+        'Create N users with M tasks each, plus categories and tags, following realistic '
+        'distributions (see todo_app.seeding). Every user has the password "bench-password".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks per user.')
+        parser.add_argument('--categories', type=int, default=8, help=f'Per user, at most {len(CATEGORY_NAMES)}.')
+        parser.add_argument('--tags', type=int, default=15, help=f'Per user, at most {len(TAG_NAMES)}.')
+        parser.add_argument('--seed', type=int, default=0, help='Same seed, same data.')
+        parser.add_argument('--prefix', default='bench', help='Usernames are <prefix>0 ... <prefix>N-1.')
+        parser.add_argument('--reset', action='store_true', help='Delete existing users with these usernames first.')
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(
+            username__in=[f"{options['prefix']}{i}" for i in range(options['users'])]
+        )
+        if options['reset']:
+            users.delete()
+        elif users.exists():
+            raise CommandError(
+                f"Users named {options['prefix']}0..{options['prefix']}{options['users'] - 1} "
+                'already exist, use --reset to replace them.'
+            )
+
+        start = time.perf_counter()
+        created = seed_benchmark_data(
+            options['users'], options['tasks'], options['categories'], options['tags'],
+            seed=options['seed'], prefix=options['prefix'],
+        )
+        self.stdout.write(
+            f"Created {len(created)} users with {options['tasks']} tasks each "
+            f"in {time.perf_counter() - start:.1f}s."
+        )
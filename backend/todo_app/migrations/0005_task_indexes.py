@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0004_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', '-priority', 'due_date', 'title'], name='task_user_ordering_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'status', 'due_date'], name='task_user_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'priority', 'due_date'], name='task_user_priority_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'category', 'due_date'], name='task_user_category_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'archived'), _negated=True), fields=['user', 'due_date'], name='task_user_active_due_idx'),
+        ),
+        # The auto-created Task.tags through-table has no Meta to declare indexes on;
+        # (tag_id, task_id) lets ?tags= filters resolve task ids from the index alone.
+        migrations.RunSQL(
+            sql='CREATE INDEX task_tags_tag_task_idx ON todo_app_task_tags (tag_id, task_id);',
+            reverse_sql='DROP INDEX task_tags_tag_task_idx;',
+        ),
+    ]
@@ -0,0 +1,36 @@
+import django.db.models.deletion
+import todo_app.models
+from django.db import migrations, models
+
+from todo_app.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0007_task_sync'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+        migrations.CreateModel(
+            name='TaskSearchEntry',
+            fields=[
+                ('task', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='todo_app.task')),
+                ('document', todo_app.models.FullTextMatchField(db_column='todo_app_task_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'todo_app_task_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0008_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['-priority_rank', 'due_date', 'title']},
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_ordering_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(priority='low', then=models.Value(1)), models.When(priority='medium', then=models.Value(2)), models.When(priority='high', then=models.Value(3)), default=models.Value(0)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', '-priority_rank', 'due_date', 'title'], name='task_user_ordering_idx'),
+        ),
+    ]
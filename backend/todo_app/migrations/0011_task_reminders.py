@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-18 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0010_alter_tag_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_date', models.DateTimeField()),
+                ('task_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), models.Q(('status', 'completed'), _negated=True), models.Q(('status', 'archived'), _negated=True)), fields=['due_date', 'id'], name='task_reminder_due_idx'),
+        ),
+    ]
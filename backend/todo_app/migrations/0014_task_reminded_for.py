@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-18 23:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_sent_reminders(apps, schema_editor):
+    # The cursor was the last task reminded: everything up to it is not sent again
+    cursor = apps.get_model('todo_app', 'ReminderCursor').objects.filter(pk=1).first()
+    if cursor is None:
+        return
+    apps.get_model('todo_app', 'Task').objects.filter(
+        models.Q(due_date__lt=cursor.due_date) | models.Q(due_date=cursor.due_date, id__lte=cursor.task_id)
+    ).update(reminded_for=models.F('due_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0013_task_position'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='reminded_for',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_sent_reminders, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='remindercursor',
+            name='task_id',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_reminder_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), models.Q(('status', 'completed'), _negated=True), models.Q(('status', 'archived'), _negated=True), models.Q(('reminded_for__isnull', True), ('reminded_for__lt', models.F('due_date')), ('reminded_for__gt', models.F('due_date')), _connector='OR')), fields=['due_date', 'id'], name='task_reminder_due_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import F
+from django.utils import timezone
+
+from todo_app.positions import spread_keys
+
+
+def place_unplaced_tasks(apps, schema_editor):
+    # Tasks used to keep '' until moved; give their columns keys in the order they show
+    # now, so moves next to them no longer rewrite the column
+    Task = apps.get_model('todo_app', 'Task')
+    CollectionVersion = apps.get_model('todo_app', 'CollectionVersion')
+    now = timezone.now()
+    columns = Task.objects.filter(position='').order_by().values_list('user_id', 'status').distinct()
+    for user_id, status in list(columns):
+        pks = list(
+            Task.objects.filter(user_id=user_id, status=status).order_by('position', 'id').values_list('pk', flat=True)
+        )
+        Task.objects.bulk_update(
+            [Task(pk=pk, position=key, updated_at=now) for pk, key in zip(pks, spread_keys(len(pks)))],
+            ['position', 'updated_at'],
+            batch_size=500,
+        )
+        CollectionVersion.objects.filter(user_id=user_id).update(version=F('version') + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0014_task_reminded_for'),
+    ]
+
+    operations = [
+        migrations.RunPython(place_unplaced_tasks, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,20 @@
 from django.db import models
 from django.conf import settings
 
+# Tareas abiertas con vencimiento sin recordatorio enviado para ese vencimiento: la condición de task_reminder_due_idx
+AWAITING_REMINDER = (
+    models.Q(due_date__isnull=False) & ~models.Q(status='completed') & ~models.Q(status='archived')
+    & (models.Q(reminded_for__isnull=True) | models.Q(reminded_for__lt=models.F('due_date'))
+       | models.Q(reminded_for__gt=models.F('due_date')))
+)
+
 # Create your models here.
 class Category(models.Model):
     name = models.CharField(max_length=100)
     color = models.CharField(max_length=7, default='#FFFFFF')  
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='categories')
     created_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = 'categories'
@@ -14,7 +22,21 @@ class Category(models.Model):
 
     def __str__(self):
         return self.name
-    
+
+
+class TaskQuerySet(models.QuerySet):
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def with_related(self):
+        # Carga category y tags en un número constante de queries
+        return self.select_related('category').prefetch_related('tags')
+
+    def awaiting_reminder(self):
+        # Mismo filtro que task_reminder_due_idx, para que las consultas de recordatorios lo usen
+        return self.filter(AWAITING_REMINDER)
+
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('pending', 'To Do'),
@@ -28,27 +50,103 @@ class Task(models.Model):
         ('medium', 'Medium'),
         ('high', 'High'),
     ]
+    # Orden numérico de la prioridad, sigue el orden de PRIORITY_CHOICES
+    PRIORITY_RANKS = {value: rank for rank, (value, _) in enumerate(PRIORITY_CHOICES, start=1)}
 
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Manual order within the status column, a fractional index (todo_app.positions); given on entering a column
+    position = models.CharField(max_length=64, blank=True, default='')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
+    # Computed by the database, so it also stays in sync on update() and bulk writes
+    priority_rank = models.GeneratedField(
+        expression=models.Case(
+            *[models.When(priority=value, then=models.Value(rank)) for value, rank in PRIORITY_RANKS.items()],
+            default=models.Value(0),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     due_date = models.DateTimeField(null=True, blank=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, related_name="tasks", null=True, blank=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tasks")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     tags = models.ManyToManyField('Tag', related_name='tasks', blank=True)
+    # Occurrence of a recurring task (TaskRecurrence) saved as a task of its own when completed or edited
+    series = models.ForeignKey('self', on_delete=models.SET_NULL, related_name='occurrences', null=True, blank=True)
+    occurrence_date = models.DateTimeField(null=True, blank=True)
+    # due_date del último recordatorio enviado (todo_app.reminders); otra fecha de vencimiento se recuerda de nuevo
+    reminded_for = models.DateTimeField(null=True, blank=True)
+
+    objects = TaskQuerySet.as_manager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # Lets the post_save receiver tell a status change from other edits (todo_app.events)
+        task._loaded_status = task.__dict__.get('status')
+        return task
 
     class Meta:
-        ordering = ["-priority", "due_date", "title"]
+        ordering = ["-priority_rank", "due_date", "title"]
+        indexes = [
+            # Listado por defecto: filtro por usuario + ordering del modelo
+            models.Index(fields=['user', '-priority_rank', 'due_date', 'title'], name='task_user_ordering_idx'),
+            # filterset_fields: status / priority / category
+            models.Index(fields=['user', 'status', 'due_date'], name='task_user_status_due_idx'),
+            models.Index(fields=['user', 'priority', 'due_date'], name='task_user_priority_due_idx'),
+            models.Index(fields=['user', 'category', 'due_date'], name='task_user_category_due_idx'),
+            # Orden manual de una columna: ?status=&ordering=position y POST /tasks/{id}/move/
+            models.Index(fields=['user', 'status', 'position', 'id'], name='task_user_status_position_idx'),
+            # Tareas activas (no archivadas) por fecha de vencimiento
+            models.Index(
+                fields=['user', 'due_date'],
+                condition=~models.Q(status='archived'),
+                name='task_user_active_due_idx',
+            ),
+            # Delta sync: /tasks/changes/?since=
+            models.Index(fields=['user', 'updated_at', 'id'], name='task_user_updated_idx'),
+            # Recordatorios (manage.py run_reminders): tareas de todos los usuarios pendientes de recordatorio
+            models.Index(fields=['due_date', 'id'], condition=AWAITING_REMINDER, name='task_reminder_due_idx'),
+        ]
+        constraints = [
+            # Una tarea por ocurrencia; también sirve para buscar las ocurrencias guardadas de una serie
+            models.UniqueConstraint(fields=['series', 'occurrence_date'], name='task_series_occurrence_uniq'),
+        ]
         
     def __str__(self):
         return self.title
     
+class TaskRecurrence(models.Model):
+    """
+    Repeats a task from its due_date. Occurrences are computed for the requested dates
+    (todo_app.recurrence) and only saved, as tasks with ``series`` set, once one is
+    completed or edited.
+    """
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    ]
+
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, primary_key=True, related_name='recurrence')
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    interval = models.PositiveSmallIntegerField(default=1)
+    # 0 = lunes. weekly: días de la semana; monthly con week_of_month: el día de la semana
+    weekdays = models.JSONField(default=list, blank=True)
+    # monthly: 1..5 = n-ésimo día de la semana del mes, -1 = el último
+    week_of_month = models.SmallIntegerField(null=True, blank=True)
+    until = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.task_id}: every {self.interval} {self.frequency}'
+
+
 class Tag(models.Model):
-    name = models.CharField(max_length=50, unique=True)
+    name = models.CharField(max_length=50)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tags')
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -58,3 +156,76 @@ class Tag(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class CollectionVersion(models.Model):
+    """
+    Per-user counter bumped on every write to the user's tasks, categories or tags.
+    Listings use it to build ETags and cache keys (see todo_app.caching).
+    """
+    # Plain id instead of a FK: it is bumped from post_delete signals, including
+    # while the user itself is being cascade-deleted.
+    user_id = models.BigIntegerField(primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user_id}: {self.version}'
+
+
+class TaskTombstone(models.Model):
+    """Records deleted tasks so /tasks/changes/ can report them to syncing clients."""
+    # Plain ids for the same reason as CollectionVersion: written from post_delete,
+    # also while the owner is being cascade-deleted.
+    task_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id', 'id'], name='tombstone_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task_id} deleted at {self.deleted_at}'
+
+
+class ReminderCursor(models.Model):
+    """
+    When manage.py run_reminders first started: tasks due before it are not reminded.
+    A single row, also locked by each batch so two workers never send the same
+    reminders (see todo_app.reminders).
+    """
+    due_date = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.due_date}'
+
+
+class FullTextMatchField(models.TextField):
+    """FTS5 hidden column named after its table, only meant for the `match` lookup."""
+
+
+@FullTextMatchField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class TaskSearchEntry(models.Model):
+    """
+    Read-only view of the SQLite FTS5 table created by todo_app.search, so search
+    queries can JOIN it instead of running a MATCH per row. Unused on PostgreSQL.
+    """
+    task = models.OneToOneField(
+        Task, primary_key=True, db_column='rowid', on_delete=models.DO_NOTHING, related_name='search_entry'
+    )
+    document = FullTextMatchField(db_column='todo_app_task_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'todo_app_task_fts'
@@ -0,0 +1,199 @@
+import base64
+import binascii
+import datetime
+import json
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class AnnotationKey:
+    """Stands in for a model field when the ordering uses an annotation (e.g. search rank)."""
+    null = True
+
+    def __init__(self, name):
+        self.name = self.attname = name
+
+    def to_python(self, value):
+        return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination over the queryset ordering plus `id` as tiebreaker.
+
+    Clients enable it by sending `page_size` or `cursor`; without them the view returns
+    the legacy unpaginated list. Each page is fetched with a WHERE on the last row's
+    ordering values, so its cost does not depend on how deep the page is.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    unpaginated_query_param = 'paginate'
+    paginate_by_default = False
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.fields = self.get_fields(queryset)
+
+        queryset = queryset.order_by(*self.get_order_expressions())
+        values = self.decode_cursor(request)
+        if values is not None:
+            queryset = queryset.filter(self.get_position_filter(values))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def is_requested(self, request):
+        params = request.query_params
+        if params.get(self.unpaginated_query_param, '').lower() in ('false', '0', 'off'):
+            return False
+        return (
+            self.paginate_by_default
+            or self.cursor_query_param in params
+            or self.page_size_query_param in params
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ]
+        names = {field.lstrip('-') for field in ordering}
+        if not names & {self.tiebreaker, 'pk'}:
+            ordering.append(self.tiebreaker)
+        return ordering
+
+    def get_fields(self, queryset):
+        opts = queryset.model._meta
+        fields = []
+        for name in self.ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            if name in queryset.query.annotations:
+                field = AnnotationKey(name)
+            else:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            fields.append((field, descending))
+        return fields
+
+    def get_order_expressions(self):
+        # NULLs always go last so the keyset comparison is the same on every backend
+        expressions = []
+        for field, descending in self.fields:
+            expression = F(field.attname)
+            nulls_last = True if field.null else None
+            if descending:
+                expressions.append(expression.desc(nulls_last=nulls_last))
+            else:
+                expressions.append(expression.asc(nulls_last=nulls_last))
+        return expressions
+
+    def get_position_filter(self, values):
+        conditions = []
+        equal = Q()
+        for (field, descending), value in zip(self.fields, values):
+            after = self.get_after_filter(field, descending, value)
+            if after is not None:
+                conditions.append(equal & after)
+            if value is None:
+                equal &= Q(**{f'{field.attname}__isnull': True})
+            else:
+                equal &= Q(**{field.attname: value})
+        if not conditions:
+            return Q(pk__in=[])
+        return reduce(or_, conditions)
+
+    def get_after_filter(self, field, descending, value):
+        if value is None:
+            # Only other NULLs can follow a NULL, and those are matched by later fields
+            return None
+        lookup = 'lt' if descending else 'gt'
+        condition = Q(**{f'{field.attname}__{lookup}': value})
+        if field.null:
+            condition |= Q(**{f'{field.attname}__isnull': True})
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, field.attname) for field, _ in self.fields]
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(values))
+
+    def encode_cursor(self, values):
+        payload = json.dumps({
+            'o': self.ordering,
+            'v': [self._encode_value(value) for value in values],
+        }, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if payload['o'] != self.ordering or len(payload['v']) != len(self.fields):
+                raise ValueError
+            values = [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.fields, payload['v'])
+            ]
+            # Cursors only ever hold aware datetimes
+            if any(isinstance(value, datetime.datetime) and timezone.is_naive(value) for value in values):
+                raise ValueError
+            return values
+        except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
@@ -0,0 +1,215 @@
+"""
+Manual task order within a status column (POST /tasks/{id}/move/, ?ordering=position).
+
+``Task.position`` is a fractional index: a string key compared character by character,
+so there is always a key between two others (``key_between('a', 'b') == 'ai'``). A move
+computes a key between the new neighbours and writes only the moved task, one UPDATE,
+where integer positions would renumber every task after it. Keys use the digits and
+lowercase letters only, which sort the same under the C collation and the usual
+language collations.
+
+A task gets a key after the last one of its column whenever it enters one: when it is
+created (TaskSerializer, the bulk endpoint, imports, materialized occurrences) and when
+its status changes (PATCH, change_status, bulk change_status), with one query per
+column for the last key. Keys added at the bottom count up (``key_after('i') == 'j'``)
+and grow a character every 35 or so; keys between two others grow a character every
+few moves into the same gap. Only when two neighbours have no key between them left
+(the same key, an empty one from rows inserted without a key, or the key would get too
+long) is their column rewritten with short, evenly spaced keys first.
+``manage.py rebalance_positions`` does the same in the background for columns whose
+keys got long.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from .caching import bump_collection_version
+from .models import Task
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+MAX_KEY_LENGTH = Task._meta.get_field('position').max_length
+# manage.py rebalance_positions rewrites the columns with longer keys
+REBALANCE_LENGTH = 16
+
+
+class InvalidMove(ValueError):
+    pass
+
+
+def key_between(low, high):
+    """
+    A key sorting strictly between ``low`` and ``high``; ``None`` (or an empty ``low``)
+    leaves that side open. Keys never end in '0', so there is always room before them.
+    """
+    if low and high is not None and low >= high:
+        raise ValueError(f'{low!r} is not before {high!r}')
+    return _midpoint(low or '', high)
+
+
+def _midpoint(low, high):
+    if high is not None:
+        # Shared prefix, reading a missing digit of low as '0'
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else '0') == high[n]:
+            n += 1
+        if n:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high is not None else len(DIGITS)
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+def key_after(key):
+    """
+    A key after ``key`` with nothing after it (None: the first key of a column). The
+    last digit below 'z' goes up by one, so a column filled from the bottom grows its
+    keys by a character every 35 tasks instead of every few as ``key_between(key, None)``.
+    """
+    if key is None:
+        return key_between(None, None)
+    head = key.rstrip(DIGITS[-1])
+    if not head:
+        return key + DIGITS[1]
+    return head[:-1] + DIGITS[DIGITS.index(head[-1]) + 1]
+
+
+def spread_keys(count):
+    """``count`` increasing keys of the same length, spaced so the next moves keep them short."""
+    width = 1
+    while len(DIGITS) ** width < (count + 1) * len(DIGITS):
+        width += 1
+    step = len(DIGITS) ** width // (count + 1)
+    return [_encode(step * (i + 1), width).rstrip('0') for i in range(count)]
+
+
+def _encode(number, width):
+    digits = []
+    for _ in range(width):
+        number, digit = divmod(number, len(DIGITS))
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def column(user_id, status):
+    """The user's tasks with ``status`` in manual order, read through task_user_status_position_idx."""
+    return Task.objects.filter(user_id=user_id, status=status).order_by('position', 'id')
+
+
+def bottom_keys(user_id, status, count=1):
+    """
+    ``count`` increasing keys after the last one of the column, for tasks entering it.
+    Rebalances the column first when they would get too long.
+    """
+    keys = _keys_after(column(user_id, status).values_list('position', flat=True).last(), count)
+    if keys is None:
+        rebalance(user_id, status)
+        keys = _keys_after(column(user_id, status).values_list('position', flat=True).last(), count)
+    return keys
+
+
+def _keys_after(last, count):
+    # One key after the last, then the rest spread after that one rather than each after the previous
+    first = key_after(last)
+    keys = [first] + [first + key for key in spread_keys(count - 1)]
+    return keys if max(map(len, keys)) <= MAX_KEY_LENGTH else None
+
+
+def place_at_bottom(tasks):
+    """Set the position of ``tasks`` to keys at the bottom of their (new) columns, in the given order."""
+    columns = defaultdict(list)
+    for task in tasks:
+        columns[task.user_id, task.status].append(task)
+    for (user_id, status), entering in columns.items():
+        for task, key in zip(entering, bottom_keys(user_id, status, len(entering))):
+            task.position = key
+
+
+def rebalance(user_id, status, exclude=None):
+    """Rewrite the keys of a column as evenly spaced ones, keeping the order. Returns how many tasks moved."""
+    tasks = column(user_id, status)
+    if exclude is not None:
+        tasks = tasks.exclude(pk=exclude)
+    now = timezone.now()
+    with transaction.atomic():
+        pks = list(tasks.values_list('pk', flat=True))
+        Task.objects.bulk_update(
+            [Task(pk=pk, position=key, updated_at=now) for pk, key in zip(pks, spread_keys(len(pks)))],
+            ['position', 'updated_at'],
+            batch_size=500,
+        )
+        # Positions are part of the cached listings and of /tasks/changes/
+        bump_collection_version(user_id)
+    return len(pks)
+
+
+def long_columns(max_length=REBALANCE_LENGTH):
+    """(user_id, status) of the columns with keys longer than ``max_length``."""
+    return (
+        Task.objects.annotate(key_length=Length('position'))
+        .filter(key_length__gt=max_length)
+        .order_by()
+        .values_list('user_id', 'status')
+        .distinct()
+    )
+
+
+def move_task(task, status, after=None, before=None):
+    """
+    Put ``task`` in the ``status`` column right after the task with id ``after`` and/or
+    right before the one with id ``before``; with neither it goes to the bottom.
+    Writes the task alone, unless its new neighbours have no key between them.
+    """
+    with transaction.atomic():
+        key = _key_between(*_neighbours(task, status, after, before))
+        if key is None:
+            rebalance(task.user_id, status, exclude=task.pk)
+            key = _key_between(*_neighbours(task, status, after, before))
+        task.status = status
+        task.position = key
+        task.save(update_fields=['status', 'position', 'updated_at'])
+    return task
+
+
+def _neighbours(task, status, after, before):
+    # (position, id) of the tasks right before and after the new place, None at the ends
+    tasks = column(task.user_id, status).exclude(pk=task.pk)
+    given = {pk: (position, pk) for pk, position in tasks.filter(pk__in=[
+        pk for pk in (after, before) if pk is not None
+    ]).values_list('pk', 'position')}
+    for name, pk in (('after', after), ('before', before)):
+        if pk is not None and pk not in given:
+            raise InvalidMove(f'Task {pk} ({name}) is not another task with status {status}.')
+
+    low = given[after] if after is not None else None
+    high = given[before] if before is not None else None
+    if low is not None and high is not None:
+        if low >= high:
+            raise InvalidMove(f'Task {after} (after) does not come before task {before} (before).')
+    elif low is not None:
+        position, pk = low
+        high = tasks.filter(Q(position__gt=position) | Q(position=position, pk__gt=pk)) \
+            .values_list('position', 'pk').first()
+    elif high is not None:
+        position, pk = high
+        low = tasks.filter(Q(position__lt=position) | Q(position=position, pk__lt=pk)) \
+            .order_by('-position', '-id').values_list('position', 'pk').first()
+    else:
+        low = tasks.order_by('-position', '-id').values_list('position', 'pk').first()
+    return low, high
+
+
+def _key_between(low, high):
+    # None when the neighbours leave no room for a key, see move_task()
+    low = low[0] if low is not None else None
+    high = high[0] if high is not None else None
+    if high == '' or (low and high is not None and low >= high):
+        return None
+    key = key_after(low) if high is None else key_between(low, high)
+    return key if len(key) <= MAX_KEY_LENGTH else None
@@ -0,0 +1,280 @@
+"""
+Occurrences of recurring tasks (TaskRecurrence), computed for a window of dates.
+
+Nothing is stored per occurrence. ``Rule.between()`` jumps to the first period that
+overlaps the window with integer arithmetic and walks forward from there, so its cost
+is the number of occurrences it returns, however long ago the series started.
+``expand()`` merges the occurrences of many series lazily in due order, and
+``get_occurrences()`` merges those with the one-off tasks and stops after ``limit``
+items: a page of a year-long calendar only computes the occurrences on that page.
+
+An occurrence becomes a task of its own (``Task.series`` / ``occurrence_date``) when it
+is completed or edited (``materialize()``); that task replaces the computed occurrence
+from then on, even if its due date is moved.
+
+Rules are expanded on the wall clock of the current time zone, so a task due at 09:00
+stays at 09:00 across DST changes. Like RFC 5545, dates that don't exist in a month
+(the 31st, the 5th Monday, February 29) are skipped rather than moved.
+"""
+import calendar
+import datetime
+import heapq
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task, TaskRecurrence
+from .positions import bottom_keys
+
+ONE_DAY = datetime.timedelta(days=1)
+RULE_FIELDS = [
+    'id', 'due_date', 'recurrence__frequency', 'recurrence__interval',
+    'recurrence__weekdays', 'recurrence__week_of_month', 'recurrence__until',
+]
+
+
+class Rule:
+    __slots__ = (
+        'pk', 'frequency', 'interval', 'weekdays', 'week_of_month', 'dtstart', 'until', 'tz', 'local', 'local_end',
+        'step', 'offsets', 'months',
+    )
+
+    def __init__(self, pk, dtstart, frequency, interval=1, weekdays=(), week_of_month=None, until=None, tz=None):
+        self.pk = pk
+        self.frequency = frequency
+        self.interval = interval
+        self.week_of_month = week_of_month
+        self.dtstart = dtstart
+        self.until = until
+        self.tz = tz or timezone.get_current_timezone()
+        # Adding a timedelta to an aware datetime moves its wall clock time, so all the
+        # arithmetic happens on the first occurrence in the current time zone
+        self.local = dtstart.astimezone(self.tz)
+        self.local_end = until.astimezone(self.tz) + datetime.timedelta(microseconds=1) if until else None
+        self.weekdays = sorted(set(weekdays)) or [self.local.weekday()]
+        # Precomputed for first() / after(), which run once per series and per occurrence
+        self.step = ONE_DAY * interval * (7 if frequency == 'weekly' else 1)
+        self.offsets = [ONE_DAY * weekday for weekday in self.weekdays]
+        self.months = interval * (12 if frequency == 'yearly' else 1)
+
+    @classmethod
+    def from_recurrence(cls, recurrence, dtstart):
+        return cls(
+            recurrence.task_id, dtstart, recurrence.frequency, recurrence.interval,
+            recurrence.weekdays, recurrence.week_of_month, recurrence.until,
+        )
+
+    def window(self, lo, hi):
+        """
+        [lo, hi) limited to the dates of the series, ``None`` if that is empty. ``lo`` and
+        ``hi`` are in the rule's time zone, so they compare on the wall clock without
+        UTC conversions.
+        """
+        if lo < self.local:
+            lo = self.local
+        if self.local_end is not None and self.local_end < hi:
+            hi = self.local_end
+        return (lo, hi) if lo < hi else None
+
+    def between(self, start, end):
+        """The occurrences in [start, end), in order."""
+        window = self.window(start.astimezone(self.tz), end.astimezone(self.tz))
+        if window is None:
+            return
+        lo, hi = window
+        date = self.first(lo)
+        while date is not None and date < hi:
+            yield date
+            date = self.after(date)
+
+    def includes(self, when):
+        return any(True for _ in self.between(when, when + datetime.timedelta(microseconds=1)))
+
+    def first(self, lo):
+        """The first occurrence at or after ``lo`` (in the rule's time zone, not before dtstart)."""
+        local, step = self.local, self.step
+        if self.frequency == 'daily':
+            # First k with local + k * step >= lo
+            return local + step * -((local - lo) // step)
+        if self.frequency == 'weekly':
+            week = local - ONE_DAY * local.weekday()
+            week += step * max((lo - week) // step, 0)
+            for offset in self.offsets:
+                date = week + offset
+                if date >= lo:
+                    return date
+            return week + step + self.offsets[0]
+        months = self.months
+        first = local.year * 12 + local.month - 1
+        return self._next_in_month(first + months * max((lo.year * 12 + lo.month - 1 - first) // months, 0), lo)
+
+    def after(self, date):
+        """The occurrence that follows occurrence ``date``."""
+        if self.frequency == 'daily':
+            return date + self.step
+        if self.frequency == 'weekly':
+            weekday = date.weekday()
+            for next_weekday, offset in zip(self.weekdays, self.offsets):
+                if next_weekday > weekday:
+                    return date + (offset - ONE_DAY * weekday)
+            return date + (self.step - ONE_DAY * weekday + self.offsets[0])
+        return self._next_in_month(date.year * 12 + date.month - 1 + self.months, date)
+
+    def _next_in_month(self, index, lo):
+        # Months without the day (the 31st, a 5th Monday, February 29) are skipped; a few
+        # years of them means the date never comes back
+        for _ in range(100):
+            year, month = divmod(index, 12)
+            day = self._day_of_month(year, month + 1)
+            if day is not None:
+                date = self.local.replace(year=year, month=month + 1, day=day)
+                if date >= lo:
+                    return date
+            index += self.months
+        return None
+
+    def _day_of_month(self, year, month):
+        if self.week_of_month is None:
+            day = self.local.day
+        else:
+            first_weekday = datetime.date(year, month, 1).weekday()
+            if self.week_of_month > 0:
+                day = 1 + (self.weekdays[0] - first_weekday) % 7 + (self.week_of_month - 1) * 7
+            else:
+                days = calendar.monthrange(year, month)[1]
+                return days - (first_weekday + days - 1 - self.weekdays[0]) % 7
+        # Every month has the first 28 days
+        return day if day <= 28 or day <= calendar.monthrange(year, month)[1] else None
+
+
+def get_series(tasks, start, end):
+    """Rules of the recurring tasks in ``tasks`` that can have occurrences in [start, end)."""
+    rows = (
+        tasks.filter(recurrence__isnull=False, due_date__lt=end)
+        .exclude(status='archived')
+        .filter(Q(recurrence__until__isnull=True) | Q(recurrence__until__gte=start))
+        .order_by()
+        .values_list(*RULE_FIELDS)
+    )
+    tz = timezone.get_current_timezone()
+    return [
+        Rule(pk, dtstart, frequency, interval, weekdays, week_of_month, until, tz)
+        for pk, dtstart, frequency, interval, weekdays, week_of_month, until in rows
+    ]
+
+
+def expand(rules, start, end):
+    """
+    The occurrences of all the ``rules`` in [start, end) as ``(date, rule)``, in (date, id)
+    order. Lazy: every series only computes its next occurrence once the current one is taken.
+    """
+    heap = []
+    bounds = {}
+    for rule in rules:
+        if rule.tz not in bounds:
+            bounds[rule.tz] = start.astimezone(rule.tz), end.astimezone(rule.tz)
+        window = rule.window(*bounds[rule.tz])
+        if window is not None:
+            date = rule.first(window[0])
+            if date is not None and date < window[1]:
+                heap.append((date, rule.pk, rule, window[1]))
+    heapq.heapify(heap)
+    while heap:
+        date, pk, rule, rule_end = heap[0]
+        yield date, rule
+        following = rule.after(date)
+        if following is not None and following < rule_end:
+            heapq.heapreplace(heap, (following, pk, rule, rule_end))
+        else:
+            heapq.heappop(heap)
+
+
+def get_occurrences(tasks, start, end, limit, after=None, include_series=True):
+    """
+    Up to ``limit`` items due in [start, end) in (due_date, id) order, and whether more follow.
+
+    Items are ``(due_date, task, occurrence)``: a one-off or saved occurrence task with
+    ``occurrence=False``, or the series task of a computed occurrence with ``occurrence=True``.
+    ``after`` is the (due_date, id) of the last item of the previous page; ``id`` is the
+    series id for computed occurrences.
+    """
+    one_offs = tasks.filter(recurrence__isnull=True, due_date__gte=start, due_date__lt=end)
+    if after is not None:
+        one_offs = one_offs.filter(Q(due_date__gt=after[0]) | Q(due_date=after[0], id__gt=after[1]))
+        start = after[0]
+    one_offs = one_offs.with_related().order_by('due_date', 'id')[:limit + 1]
+    streams = [((task.due_date, task.pk, task) for task in one_offs)]
+
+    saved = set()
+    if include_series:
+        rules = get_series(tasks, start, end)
+        streams.append((date, rule.pk, None) for date, rule in expand(rules, start, end))
+        if rules:
+            saved = set(
+                Task.objects.filter(
+                    series__in=tasks.filter(recurrence__isnull=False).values('pk'),
+                    occurrence_date__gte=start, occurrence_date__lt=end,
+                ).values_list('series_id', 'occurrence_date')
+            )
+
+    items = []
+    for due_date, pk, task in heapq.merge(*streams):
+        if after is not None and (due_date, pk) <= after:
+            continue
+        if task is None and (pk, due_date) in saved:
+            continue
+        if len(items) == limit:
+            return _with_series(items), True
+        items.append((due_date, pk, task))
+    return _with_series(items), False
+
+
+def _with_series(items):
+    series = Task.objects.with_related().in_bulk({pk for _, pk, task in items if task is None})
+    return [
+        (due_date, task, False) if task is not None else (due_date, series[pk], True)
+        for due_date, pk, task in items
+    ]
+
+
+@transaction.atomic
+def materialize(series, occurrence_date):
+    """
+    The task of the ``occurrence_date`` occurrence of ``series``, created from the series
+    task (title, description, priority, category, tags) if it wasn't saved yet.
+    Returns ``(task, created)``.
+    """
+    existing = Task.objects.filter(series=series, occurrence_date=occurrence_date).first()
+    if existing is not None:
+        return existing, False
+    try:
+        # A savepoint, so a failed insert leaves the caller's transaction usable
+        with transaction.atomic():
+            task = Task.objects.create(
+                user_id=series.user_id,
+                title=series.title,
+                description=series.description,
+                priority=series.priority,
+                category_id=series.category_id,
+                due_date=occurrence_date,
+                series=series,
+                occurrence_date=occurrence_date,
+                position=bottom_keys(series.user_id, 'pending')[0],
+            )
+    except IntegrityError:
+        # Saved by a concurrent request since the lookup (task_series_occurrence_uniq)
+        return Task.objects.get(series=series, occurrence_date=occurrence_date), False
+    through = Task.tags.through
+    through.objects.bulk_create([
+        through(task_id=task.pk, tag_id=tag_id)
+        for tag_id in through.objects.filter(task_id=series.pk).values_list('tag_id', flat=True)
+    ])
+    return task, True
+
+
+def get_rule(task):
+    try:
+        return Rule.from_recurrence(task.recurrence, task.due_date)
+    except TaskRecurrence.DoesNotExist:
+        return None
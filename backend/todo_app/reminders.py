@@ -0,0 +1,110 @@
+"""
+Due-date reminders sent by ``manage.py run_reminders``.
+
+Only open tasks (not completed or archived) with a due date can need a reminder, and
+only until one was sent for that due date: ``Task.reminded_for`` records it, in the
+transaction that hands the batch to ``HANDLER``. The tasks still awaiting one are read
+through the partial index ``task_reminder_due_idx`` on (due_date, id), which holds just
+those, so every query is a range scan over the reminders not sent yet and its cost
+depends on the batch size, not on the number of tasks or users.
+
+The scheduler keeps the first ``BATCH_SIZE`` of them in memory in due order, sleeps
+until the first one is due (``LEAD_MINUTES`` before its due_date) and sends the due
+ones in batches. The window is reloaded every ``REFILL_SECONDS`` to see new and edited
+tasks, and right away once it has been used up. Every reload starts again from the
+earliest task awaiting a reminder, so a task created or moved into the lead window
+after later ones were sent is still reminded, on the next reload; a task moved to
+another due date is reminded again at its new date. A restarted worker does not send
+the same reminders again, and tasks already overdue when the worker first starts
+(ReminderCursor) are not reminded.
+
+Each batch locks the ReminderCursor row and the tasks it sends, so two workers never
+send the same reminder and a due date edited meanwhile is not marked as reminded.
+"""
+import datetime
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .events import publish_event
+from .models import ReminderCursor, Task
+
+
+def publish_reminders(tasks):
+    """Default HANDLER: a ``task.reminder`` event per task, sent when the batch commits."""
+    for task in tasks:
+        publish_event(task.user_id, 'task.reminder', task.pk, due_date=task.due_date.isoformat())
+
+
+class ReminderScheduler:
+
+    def __init__(self, lead=None, batch_size=None, refill_seconds=None, handler=None):
+        options = getattr(settings, 'REMINDERS', {})
+        self.lead = lead if lead is not None else datetime.timedelta(minutes=options.get('LEAD_MINUTES', 15))
+        self.batch_size = batch_size or options.get('BATCH_SIZE', 500)
+        self.refill_seconds = refill_seconds if refill_seconds is not None else options.get('REFILL_SECONDS', 60)
+        self.handler = handler or import_string(options.get('HANDLER', 'todo_app.reminders.publish_reminders'))
+        self.cursor, _ = ReminderCursor.objects.get_or_create(pk=1, defaults={'due_date': timezone.now()})
+        # (due_date, id) of the next tasks awaiting a reminder, in due order
+        self.queue = deque()
+        self.more = False
+        self.refilled_at = None
+
+    def upcoming(self):
+        """The first ``batch_size`` tasks awaiting a reminder, one range scan of task_reminder_due_idx."""
+        return (
+            Task.objects.awaiting_reminder()
+            .filter(due_date__gte=self.cursor.due_date)
+            .order_by('due_date', 'id')
+            .values_list('due_date', 'id')[:self.batch_size]
+        )
+
+    def refill(self):
+        self.queue = deque(self.upcoming())
+        self.more = len(self.queue) == self.batch_size
+        self.refilled_at = time.monotonic()
+
+    def run_pending(self, now=None):
+        """Send the reminders due at ``now``; returns how many were sent."""
+        now = now or timezone.now()
+        if self.refilled_at is None or time.monotonic() - self.refilled_at >= self.refill_seconds:
+            self.refill()
+
+        sent = 0
+        while self.queue and self.queue[0][0] - self.lead <= now:
+            batch = []
+            while self.queue and len(batch) < self.batch_size and self.queue[0][0] - self.lead <= now:
+                batch.append(self.queue.popleft())
+            sent += self.send(batch)
+            if not self.queue and self.more:
+                self.refill()
+        return sent
+
+    def send(self, batch):
+        due_dates = {pk: due_date for due_date, pk in batch}
+        with transaction.atomic():
+            # Another worker's batch waits for this one and then finds its tasks reminded
+            ReminderCursor.objects.select_for_update().get(pk=self.cursor.pk)
+            # Skips the tasks completed, rescheduled or reminded since they were queued
+            tasks = [
+                task for task in Task.objects.select_for_update().awaiting_reminder()
+                .filter(pk__in=due_dates).order_by('due_date', 'id')
+                if task.due_date == due_dates[task.pk]
+            ]
+            if tasks:
+                Task.objects.filter(pk__in=[task.pk for task in tasks]).update(reminded_for=F('due_date'))
+                self.handler(tasks)
+        return len(tasks)
+
+    def seconds_until_next(self, now=None):
+        """How long the worker can sleep: until the next reminder is due or the window is reloaded."""
+        now = now or timezone.now()
+        refill_in = self.refill_seconds - (time.monotonic() - (self.refilled_at or 0))
+        if self.queue:
+            refill_in = min(refill_in, (self.queue[0][0] - self.lead - now).total_seconds())
+        return max(refill_in, 0)
@@ -0,0 +1,174 @@
+"""
+Full-text search for tasks.
+
+PostgreSQL keeps a weighted ``tsvector`` column (title A, description B) up to date with a
+trigger and indexes it with GIN. SQLite keeps an external-content FTS5 table in sync with
+triggers and is joined through the unmanaged ``TaskSearchEntry`` model. Both are created
+with raw SQL, so the Task model stays database agnostic, and are queried through
+``TaskSearchFilter`` with prefix matching on every word and ranked results.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+TASK_TABLE = 'todo_app_task'
+SQLITE_FTS_TABLE = 'todo_app_task_fts'
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+)
+
+POSTGRES_INSTALL = [
+    f'ALTER TABLE {TASK_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    f"""
+    CREATE OR REPLACE FUNCTION {TASK_TABLE}_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {POSTGRES_VECTOR.format(row='NEW.')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f'DROP TRIGGER IF EXISTS {TASK_TABLE}_search_vector_trigger ON {TASK_TABLE}',
+    f"""
+    CREATE TRIGGER {TASK_TABLE}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON {TASK_TABLE}
+    FOR EACH ROW EXECUTE FUNCTION {TASK_TABLE}_search_vector_update()
+    """,
+    f'CREATE INDEX IF NOT EXISTS task_search_vector_idx ON {TASK_TABLE} USING GIN (search_vector)',
+]
+
+POSTGRES_BACKFILL = f'UPDATE {TASK_TABLE} SET search_vector = {POSTGRES_VECTOR.format(row="")}'
+
+POSTGRES_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {TASK_TABLE}_search_vector_trigger ON {TASK_TABLE}',
+    f'DROP FUNCTION IF EXISTS {TASK_TABLE}_search_vector_update()',
+    f'ALTER TABLE {TASK_TABLE} DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, description,
+        content='{TASK_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON {TASK_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON {TASK_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE OF title, description ON {TASK_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}',
+]
+
+
+def install_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for sql in POSTGRES_INSTALL:
+            schema_editor.execute(sql)
+        schema_editor.execute(POSTGRES_BACKFILL)
+    elif vendor == 'sqlite':
+        schema_editor.execute(SQLITE_TABLE)
+        for sql in SQLITE_TRIGGERS:
+            schema_editor.execute(sql)
+        # Title matches weigh 10x description matches in the `rank` column
+        schema_editor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+        schema_editor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = POSTGRES_UNINSTALL
+    elif vendor == 'sqlite':
+        statements = SQLITE_UNINSTALL
+    else:
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def ensure_sqlite_triggers(connection):
+    """
+    SQLite rebuilds a table (dropping its triggers) on most ALTERs, so later migrations
+    on Task would silently stop FTS updates. Re-create them after every migrate.
+    """
+    if connection.vendor != 'sqlite' or SQLITE_FTS_TABLE not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
+
+
+def search_words(terms):
+    return [word for term in terms for word in re.findall(r'\w+', term)]
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the full-text index, ANDing every word as a prefix and ordering
+    by relevance (an explicit `?ordering=` still wins). Other databases fall back to
+    DRF's icontains search over `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        words = search_words(self.get_search_terms(request))
+        if not words:
+            return queryset
+
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            queryset = self.postgres_search(queryset, words)
+        elif vendor == 'sqlite':
+            queryset = self.sqlite_search(queryset, words)
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.order_by('-search_rank', *ordering)
+
+    def postgres_search(self, queryset, words):
+        query = ' & '.join(f'{word}:*' for word in words)
+        match = RawSQL(
+            f"{TASK_TABLE}.search_vector @@ to_tsquery('simple', %s)", [query],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({TASK_TABLE}.search_vector, to_tsquery('simple', %s))", [query],
+            output_field=FloatField(),
+        )
+        return queryset.filter(match).annotate(search_rank=rank)
+
+    def sqlite_search(self, queryset, words):
+        query = ' AND '.join(f'"{word}"*' for word in words)
+        # FTS5 rank is lower-is-better, negate it so both backends sort by rank descending
+        return queryset.filter(search_entry__document__match=query).annotate(
+            search_rank=-F('search_entry__rank')
+        )
@@ -0,0 +1,142 @@
+"""
+Synthetic users, categories, tags and tasks for benchmarks and load tests.
+
+The distributions loosely follow a real to-do list: most tasks are open,
+``medium`` is the most common priority, about a third of the tasks have no due
+date and the rest fall between a month ago (overdue) and two months ahead, most
+tasks have a category, and tag usage is skewed (Zipf-like) so a few tags are on
+many tasks. Titles and descriptions are drawn from a small vocabulary, so
+searches have a realistic number of hits. A fixed ``seed`` gives the same data
+on every run.
+"""
+import datetime
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_collection_version
+from .models import Category, Tag, Task
+from .positions import place_at_bottom
+
+STATUS_WEIGHTS = {'pending': 45, 'in_progress': 20, 'completed': 30, 'archived': 5}
+PRIORITY_WEIGHTS = {'low': 30, 'medium': 50, 'high': 20}
+TAGS_PER_TASK_WEIGHTS = {0: 35, 1: 35, 2: 20, 3: 10}
+NO_DUE_DATE_RATIO = 0.35
+NO_CATEGORY_RATIO = 0.15
+DUE_DATE_RANGE_DAYS = (-30, 60)
+
+VERBS = [
+    'Review', 'Write', 'Fix', 'Plan', 'Call', 'Email', 'Update', 'Prepare', 'Buy', 'Book',
+    'Schedule', 'Clean', 'Refactor', 'Deploy', 'Test', 'Draft', 'Pay', 'Organize', 'Read', 'Check',
+]
+NOUNS = [
+    'report', 'invoice', 'meeting notes', 'budget', 'groceries', 'dentist appointment', 'release',
+    'pull request', 'presentation', 'flight', 'newsletter', 'backlog', 'database migration',
+    'tax return', 'birthday gift', 'car service', 'quarterly goals', 'onboarding docs', 'landing page',
+    'team lunch', 'insurance', 'API client', 'garden', 'contract', 'roadmap',
+]
+FILLER = [
+    'before', 'the', 'deadline', 'with', 'the', 'team', 'and', 'follow', 'up', 'on', 'feedback',
+    'ask', 'about', 'details', 'make', 'sure', 'everything', 'is', 'ready', 'for', 'next', 'week',
+    'client', 'review', 'notes', 'draft', 'final', 'version', 'numbers', 'priority',
+]
+CATEGORY_NAMES = [
+    'Work', 'Personal', 'Home', 'Finance', 'Health', 'Shopping', 'Errands', 'Learning',
+    'Travel', 'Family', 'Side project', 'Admin',
+]
+TAG_NAMES = [
+    'urgent', 'waiting', 'quick', 'phone', 'computer', 'errand', 'weekly', 'blocked', 'idea',
+    'someday', 'meeting', 'email', 'review', 'deep-work', 'low-energy', 'office', 'home', 'q1', 'q2', 'q3',
+]
+COLORS = ['#EF4444', '#F59E0B', '#10B981', '#3B82F6', '#8B5CF6', '#EC4899', '#6B7280', '#14B8A6']
+
+
+def weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class BenchmarkDataGenerator:
+
+    def __init__(self, seed=0, batch_size=2000):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.now = timezone.now().replace(microsecond=0)
+
+    def create_users(self, count, prefix='bench', password='bench-password'):
+        # One hash for everyone, hashing per user would dominate seeding small datasets
+        password = make_password(password)
+        User = get_user_model()
+        usernames = [f'{prefix}{i}' for i in range(count)]
+        User.objects.bulk_create([
+            User(username=username, email=f'{username}@example.com', password=password)
+            for username in usernames
+        ])
+        return list(User.objects.filter(username__in=usernames).order_by('id'))
+
+    @transaction.atomic
+    def seed_user(self, user, tasks, categories=8, tags=15):
+        categories = Category.objects.bulk_create([
+            Category(name=name, color=self.rng.choice(COLORS), user=user)
+            for name in CATEGORY_NAMES[:categories]
+        ])
+        tags = Tag.objects.bulk_create([Tag(name=name, user=user) for name in TAG_NAMES[:tags]])
+        # Zipf-like: the n-th tag is picked 1/n as often as the first one
+        tag_weights = [1 / rank for rank in range(1, len(tags) + 1)]
+        # Categories are skewed too, the first ones hold most tasks
+        category_weights = [1 / rank ** 0.5 for rank in range(1, len(categories) + 1)]
+
+        through = Task.tags.through
+        for start in range(0, tasks, self.batch_size):
+            batch = [
+                self.build_task(user, categories, category_weights)
+                for _ in range(min(self.batch_size, tasks - start))
+            ]
+            place_at_bottom(batch)
+            created = Task.objects.bulk_create(batch)
+            through.objects.bulk_create([
+                through(task_id=task.pk, tag_id=tag.pk)
+                for task in created
+                for tag in self.pick_tags(tags, tag_weights)
+            ], batch_size=self.batch_size)
+
+        bump_collection_version(user.pk)
+        return {'tasks': tasks, 'categories': len(categories), 'tags': len(tags)}
+
+    def build_task(self, user, categories, category_weights):
+        rng = self.rng
+        due_date = None
+        if rng.random() >= NO_DUE_DATE_RATIO:
+            due_date = self.now + datetime.timedelta(
+                days=rng.randint(*DUE_DATE_RANGE_DAYS), hours=rng.randint(0, 23)
+            )
+        category = None
+        if categories and rng.random() >= NO_CATEGORY_RATIO:
+            category = rng.choices(categories, weights=category_weights)[0]
+        return Task(
+            title=f'{rng.choice(VERBS)} {rng.choice(NOUNS)}',
+            description=' '.join(rng.choices(FILLER, k=rng.choice([0, 0, 6, 12, 25]))),
+            status=weighted(rng, STATUS_WEIGHTS),
+            priority=weighted(rng, PRIORITY_WEIGHTS),
+            due_date=due_date,
+            category=category,
+            user=user,
+        )
+
+    def pick_tags(self, tags, weights):
+        count = min(weighted(self.rng, TAGS_PER_TASK_WEIGHTS), len(tags))
+        picked = set()
+        while len(picked) < count:
+            picked.add(self.rng.choices(tags, weights=weights)[0])
+        return picked
+
+
+def seed_benchmark_data(users, tasks, categories=8, tags=15, seed=0, prefix='bench'):
+    """Create ``users`` users owning ``tasks`` tasks each and return the users."""
+    generator = BenchmarkDataGenerator(seed)
+    created = generator.create_users(users, prefix)
+    for user in created:
+        generator.seed_user(user, tasks, categories, tags)
+    return created
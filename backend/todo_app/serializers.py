@@ -1,5 +1,11 @@
+import datetime
+
+from django.db import transaction
+from django.utils.functional import cached_property
 from rest_framework import serializers
-from .models import Task, Category, Tag 
+from .fields import UserPrimaryKeyRelatedField
+from .models import Task, TaskRecurrence, Category, Tag
+from .positions import bottom_keys
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -17,6 +23,15 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    def validate_name(self, value):
+        # unique_together (name, user): user is not a serializer field, so DRF won't check it
+        tags = Tag.objects.filter(user=self.context['request'].user, name=value)
+        if self.instance is not None:
+            tags = tags.exclude(pk=self.instance.pk)
+        if tags.exists():
+            raise serializers.ValidationError('tag with this name already exists.')
+        return value
+
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
@@ -25,8 +40,10 @@ class TaskSerializer(serializers.ModelSerializer):
     category_name = serializers.ReadOnlyField(source='category.name', default=None)
     category_color = serializers.ReadOnlyField(source='category.color', default=None)
 
+    category = UserPrimaryKeyRelatedField(queryset=Category.objects.all(), required=False, allow_null=True)
     tags = TagSerializer(many=True, read_only=True)
-    tag_ids = serializers.PrimaryKeyRelatedField(
+    # All the ids are checked against the user's tags with one IN query
+    tag_ids = UserPrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
         many=True,
         write_only=True,
@@ -35,36 +52,200 @@ class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = [
-            'id', 'title', 'description', 'status', 'priority',
+            'id', 'title', 'description', 'status', 'position', 'priority',
             'due_date', 'category', 'category_name', 'category_color',
             'tags', 'tag_ids', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'category_name', 'category_color', 'tags']
+        # position only changes through POST /tasks/{id}/move/
+        read_only_fields = ['id', 'position', 'created_at', 'updated_at', 'category_name', 'category_color', 'tags']
 
     def create(self, validated_data):
         tags = validated_data.pop('tag_ids', [])
         validated_data['user'] = self.context['request'].user
-        task = super().create(validated_data)
-        task.tags.set(tags)
+        # At the bottom of its column (todo_app.positions)
+        status = validated_data.get('status', Task._meta.get_field('status').default)
+        validated_data['position'] = bottom_keys(validated_data['user'].pk, status)[0]
+        if not tags:
+            return super().create(validated_data)
+        with transaction.atomic():
+            task = super().create(validated_data)
+            self.write_tags(task, tags, current=())
         return task
 
     def update(self, instance, validated_data):
         tags = validated_data.pop('tag_ids', None)
-        instance = super().update(instance, validated_data)
-        if tags is not None:
-            instance.tags.set(tags)
+        if validated_data.get('status', instance.status) != instance.status:
+            validated_data['position'] = bottom_keys(instance.user_id, validated_data['status'])[0]
+        if tags is None:
+            return super().update(instance, validated_data)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            self.write_tags(instance, tags)
         return instance
-    
-    def get_fields(self):
-        fields = super().get_fields()
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            fields['tag_ids'].queryset = Tag.objects.filter(user=request.user)
-        return fields
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if 'request' in self.context:
-            self.fields['tag_ids'].queryset = Tag.objects.filter(user=self.context['request'].user)
-    
 
+    def write_tags(self, task, tags, current=None):
+        """
+        Replace the tags of ``task`` with at most one DELETE and one INSERT on the through
+        table, touching only the rows that change. ``current`` are the tag ids it has
+        now; when not given they come from the prefetched tags (TaskQuerySet.with_related)
+        or one query.
+
+        Unlike tags.set() this sends no m2m_changed: the task was just saved in the same
+        transaction, so updated_at and the collection version are already bumped.
+        """
+        through = Task.tags.through
+        prefetched = getattr(task, '_prefetched_objects_cache', {})
+        if current is None:
+            if 'tags' in prefetched:
+                current = [tag.pk for tag in task.tags.all()]
+            else:
+                current = through.objects.filter(task_id=task.pk).values_list('tag_id', flat=True)
+        current = set(current)
+        wanted = {tag.pk for tag in tags}
+
+        removed = current - wanted
+        if removed:
+            through.objects.filter(task_id=task.pk, tag_id__in=removed).delete()
+        added = wanted - current
+        if added:
+            through.objects.bulk_create([through(task_id=task.pk, tag_id=tag_id) for tag_id in added])
+        # Stale after the write, the response reads the tags again
+        prefetched.pop('tags', None)
+
+
+class TaskReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only twin of TaskSerializer for list/retrieve: builds the same representation
+    straight from the instance instead of going through the per-field machinery.
+    Its output must stay byte-for-byte identical to TaskSerializer's.
+    """
+    @cached_property
+    def datetime_field(self):
+        # DateTimeField looks up the active timezone for every value; resolve it once per serializer
+        return serializers.DateTimeField(default_timezone=serializers.DateTimeField().default_timezone())
+
+    def to_representation(self, task):
+        category = task.category
+        to_datetime = self.datetime_field.to_representation
+        return {
+            'id': task.id,
+            'title': task.title,
+            'description': task.description,
+            'status': task.status,
+            'position': task.position,
+            'priority': task.priority,
+            'due_date': to_datetime(task.due_date) if task.due_date else None,
+            'category': task.category_id,
+            'category_name': category.name if category else None,
+            'category_color': category.color if category else None,
+            'tags': [
+                {'id': tag.id, 'name': tag.name, 'created_at': to_datetime(tag.created_at)}
+                for tag in task.tags.all()
+            ],
+            'created_at': to_datetime(task.created_at),
+            'updated_at': to_datetime(task.updated_at),
+        }
+
+
+class TaskOccurrenceSerializer(TaskReadSerializer):
+    """
+    An item of /tasks/occurrences/: ``(due_date, task, occurrence)`` from
+    todo_app.recurrence.get_occurrences. Computed occurrences of a recurring task are
+    the series task with ``id`` null, its ``series`` id and the occurrence's due date.
+    """
+    def to_representation(self, item):
+        due_date, task, occurrence = item
+        data = super().to_representation(task)
+        to_datetime = self.datetime_field.to_representation
+        if occurrence:
+            data.update(id=None, status='pending', due_date=to_datetime(due_date), series=task.id,
+                        occurrence_date=to_datetime(due_date))
+        else:
+            data.update(series=task.series_id,
+                        occurrence_date=to_datetime(task.occurrence_date) if task.occurrence_date else None)
+        return data
+
+
+class OccurrenceWindowSerializer(serializers.Serializer):
+    MAX_WINDOW = datetime.timedelta(days=366)
+
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+    cursor = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': 'Must be after start.'})
+        if attrs['end'] - attrs['start'] > self.MAX_WINDOW:
+            raise serializers.ValidationError({'end': 'The window can span at most 366 days.'})
+        return attrs
+
+
+class TaskRecurrenceSerializer(serializers.ModelSerializer):
+    interval = serializers.IntegerField(min_value=1, max_value=999, default=1)
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6), max_length=7, required=False
+    )
+
+    class Meta:
+        model = TaskRecurrence
+        fields = ['frequency', 'interval', 'weekdays', 'week_of_month', 'until']
+
+    def validate_week_of_month(self, value):
+        if value is not None and value not in (-1, 1, 2, 3, 4, 5):
+            raise serializers.ValidationError('Must be 1 to 5, or -1 for the last week.')
+        return value
+
+    def validate(self, attrs):
+        task = self.context['task']
+        if task.due_date is None:
+            raise serializers.ValidationError({'due_date': 'A recurring task needs a due date, its first occurrence.'})
+        frequency = attrs['frequency']
+        weekdays = attrs.get('weekdays', [])
+        if attrs.get('week_of_month') is not None:
+            if frequency not in ('monthly', 'yearly'):
+                raise serializers.ValidationError({'week_of_month': 'Only for monthly and yearly tasks.'})
+            if len(weekdays) > 1:
+                raise serializers.ValidationError({'weekdays': 'Give a single day of the week with week_of_month.'})
+        elif weekdays and frequency != 'weekly':
+            raise serializers.ValidationError({'weekdays': 'Only for weekly tasks, or with week_of_month.'})
+        if attrs.get('until') is not None and attrs['until'] < task.due_date:
+            raise serializers.ValidationError({'until': 'Must not be before the due date.'})
+        # PUT replaces the whole rule
+        attrs.setdefault('week_of_month', None)
+        attrs.setdefault('until', None)
+        attrs['weekdays'] = sorted(set(weekdays))
+        return attrs
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Body of POST /tasks/{id}/move/: the column and the tasks to land between (todo_app.positions)."""
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    after = serializers.IntegerField(required=False, allow_null=True)
+    before = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get('after') is not None and attrs.get('after') == attrs.get('before'):
+            raise serializers.ValidationError({'before': 'Must be another task than after.'})
+        return attrs
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    OPERATION_CHOICES = ['create', 'update', 'change_status', 'delete']
+
+    op = serializers.ChoiceField(choices=OPERATION_CHOICES)
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'This field is required.'})
+        if attrs['op'] == 'change_status' and 'status' not in attrs:
+            raise serializers.ValidationError({'status': 'This field is required.'})
+        return attrs
+
+
+class BulkTaskSerializer(serializers.Serializer):
+    operations = BulkTaskOperationSerializer(many=True, allow_empty=False, max_length=500)
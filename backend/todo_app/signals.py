@@ -0,0 +1,103 @@
+from django.db import connections
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_collection_version
+from .events import publish_event
+from .models import Category, Tag, Task, TaskTombstone
+from .search import ensure_sqlite_triggers
+
+
+def touch_tasks(queryset):
+    # Task payloads embed category/tag data, bump updated_at so /tasks/changes/ resends them
+    queryset.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def bump_on_write(sender, instance, **kwargs):
+    bump_collection_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def bump_on_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        touch_tasks(Task.objects.filter(tags=instance))
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            touch_tasks(Task.objects.filter(pk=instance.pk))
+        elif pk_set:
+            touch_tasks(Task.objects.filter(pk__in=pk_set))
+        bump_collection_version(instance.user_id)
+
+
+@receiver(post_delete, sender=Task)
+def record_tombstone(sender, instance, **kwargs):
+    TaskTombstone.objects.create(task_id=instance.pk, user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Category)
+def touch_category_tasks(sender, instance, created, **kwargs):
+    if not created:
+        touch_tasks(Task.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Tag)
+def touch_tag_tasks(sender, instance, created, **kwargs):
+    if not created:
+        touch_tasks(Task.objects.filter(tags=instance))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Tag)
+def touch_before_delete(sender, instance, **kwargs):
+    # Runs before SET_NULL / the through-table cascade drop the link to the tasks
+    lookup = 'category' if sender is Category else 'tags'
+    touch_tasks(Task.objects.filter(**{lookup: instance}))
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, **kwargs):
+    if created:
+        publish_event(instance.user_id, 'task.created', instance.pk)
+    elif getattr(instance, '_loaded_status', instance.status) != instance.status:
+        publish_event(instance.user_id, 'task.status_changed', instance.pk, status=instance.status)
+    else:
+        publish_event(instance.user_id, 'task.updated', instance.pk)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+def publish_saved(sender, instance, created, **kwargs):
+    publish_event(instance.user_id, f"{sender._meta.model_name}.{'created' if created else 'updated'}", instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def publish_deleted(sender, instance, **kwargs):
+    publish_event(instance.user_id, f'{sender._meta.model_name}.deleted', instance.pk)
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def publish_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Only the post_* actions, once the links are written
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        publish_event(instance.user_id, 'task.updated', instance.pk)
+    else:
+        for pk in pk_set or ():
+            publish_event(instance.user_id, 'task.updated', pk)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.name == 'todo_app':
+        ensure_sqlite_triggers(connections[using])
@@ -0,0 +1,77 @@
+import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .caching import get_collection_version
+from .models import Tag, Task
+
+OPEN_STATUSES = ['pending', 'in_progress']
+
+
+def get_task_stats(user):
+    """
+    Dashboard aggregates for ``user`` computed with GROUP BY queries.
+
+    Everything that only changes on writes is materialized in the cache under the
+    user's collection version, so it is recomputed once per change. The time-based
+    counters (overdue, due this week) are always computed fresh in a single query.
+    """
+    options = getattr(settings, 'COLLECTION_CACHE', {})
+    cache = caches[options.get('BACKEND', 'default')]
+    key = f'task-stats:{user.pk}:{get_collection_version(user.pk)}'
+
+    stats = cache.get(key)
+    if stats is None:
+        stats = _grouped_stats(user)
+        cache.set(key, stats, options.get('TTL', 300))
+
+    return {**stats, **_due_stats(user)}
+
+
+def _grouped_stats(user):
+    tasks = Task.objects.for_user(user).order_by()
+
+    by_status = {value: 0 for value, _ in Task.STATUS_CHOICES}
+    by_priority = {value: 0 for value, _ in Task.PRIORITY_CHOICES}
+    by_status_priority = []
+    for row in tasks.values('status', 'priority').annotate(count=Count('id')).order_by('status', 'priority'):
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+        by_priority[row['priority']] = by_priority.get(row['priority'], 0) + row['count']
+        by_status_priority.append(row)
+
+    by_category = [
+        {'id': row['category'], 'name': row['category__name'], 'color': row['category__color'], 'count': row['count']}
+        for row in tasks.values('category', 'category__name', 'category__color')
+        .annotate(count=Count('id'))
+        .order_by('category__name')
+    ]
+
+    by_tag = list(
+        Tag.objects.filter(user=user)
+        .annotate(count=Count('tasks'))
+        .order_by('name')
+        .values('id', 'name', 'count')
+    )
+
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'by_status_priority': by_status_priority,
+        'by_category': by_category,
+        'by_tag': by_tag,
+    }
+
+
+def _due_stats(user):
+    now = timezone.now()
+    today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    week_end = today + datetime.timedelta(days=7 - today.weekday())
+
+    return Task.objects.for_user(user).filter(status__in=OPEN_STATUSES).aggregate(
+        overdue=Count('id', filter=Q(due_date__lt=now)),
+        due_this_week=Count('id', filter=Q(due_date__gte=now, due_date__lt=week_end)),
+    )
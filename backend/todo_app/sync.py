@@ -0,0 +1,118 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task, TaskTombstone
+
+
+class InvalidWatermark(ValueError):
+    pass
+
+
+class ExpiredWatermark(InvalidWatermark):
+    pass
+
+
+def encode_watermark(updated_at, task_id, tombstone_id, recheck_from=None):
+    payload = {
+        't': updated_at.isoformat() if updated_at else None,
+        'i': task_id,
+        'd': tombstone_id,
+        'r': recheck_from.isoformat() if recheck_from else None,
+        'ts': timezone.now().isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_watermark(token):
+    """``(updated_at, task_id, tombstone_id, recheck_from)`` of a watermark from encode_watermark()."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        updated_at = parse_datetime(payload['t']) if payload['t'] else None
+        recheck_from = parse_datetime(payload['r']) if payload.get('r') else None
+        issued_at = parse_datetime(payload['ts'])
+        task_id, tombstone_id = int(payload['i']), int(payload['d'])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidWatermark('Invalid watermark.')
+    if issued_at is None or any(
+        value is not None and timezone.is_naive(value) for value in (issued_at, updated_at, recheck_from)
+    ):
+        raise InvalidWatermark('Invalid watermark.')
+
+    retention = datetime.timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    if issued_at < timezone.now() - retention:
+        # Tombstones older than this may be pruned, the client has to resync from scratch
+        raise ExpiredWatermark('Watermark expired, a full sync is required.')
+    return updated_at, task_id, tombstone_id, recheck_from
+
+
+def get_changes(user, since=None, limit=500):
+    """
+    Tasks created/updated and tasks deleted after ``since``.
+
+    Tasks are walked by (updated_at, id) and tombstones by id, each capped at ``limit``
+    rows; ``has_more`` tells the client to call again with the returned watermark.
+
+    updated_at and the tombstone ids are set before their transaction commits, so a
+    write that commits late can land behind a watermark already handed out. Instead
+    of a commit-ordered sequence (which the databases we run on don't share), the
+    last page of a sync re-reads a safety overlap: its watermark never goes past
+    SYNC_COMMIT_WINDOW_SECONDS before the first page was read, and the next sync
+    sends those recent changes again. Clients apply changes as upserts, so repeats
+    are harmless; a write is only missed if its transaction takes longer than the
+    window. Pages with ``has_more`` still move the watermark forward, so paging
+    always progresses.
+    """
+    tasks = Task.objects.for_user(user).with_related().order_by('updated_at', 'id')
+    tombstones = TaskTombstone.objects.filter(user_id=user.pk).order_by('id')
+    window = datetime.timedelta(seconds=getattr(settings, 'SYNC_COMMIT_WINDOW_SECONDS', 60))
+
+    if since is None:
+        updated_at, task_id, recheck_from = None, 0, None
+    else:
+        updated_at, task_id, tombstone_id, recheck_from = since
+    # Earliest point of this sync (first page included) a late commit can still land on
+    recheck_from = recheck_from or timezone.now() - window
+
+    if since is None:
+        # A full sync already reflects every past deletion, apart from the ones that may still commit
+        tombstone_id = tombstones.filter(deleted_at__lt=recheck_from).aggregate(last=Max('id'))['last'] or 0
+        deleted = []
+    else:
+        if updated_at is not None:
+            tasks = tasks.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=task_id)
+            )
+        deleted = list(tombstones.filter(id__gt=tombstone_id).values_list('id', 'task_id', 'deleted_at')[:limit + 1])
+
+    changed = list(tasks[:limit + 1])
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    if changed:
+        updated_at, task_id = changed[-1].updated_at, changed[-1].pk
+    if deleted:
+        tombstone_id = deleted[-1][0]
+
+    if has_more:
+        watermark = encode_watermark(updated_at, task_id, tombstone_id, recheck_from)
+    else:
+        if updated_at is not None and updated_at >= recheck_from:
+            updated_at, task_id = recheck_from, 0
+        recent = [pk for pk, _, deleted_at in deleted if deleted_at >= recheck_from]
+        if recent:
+            tombstone_id = min(tombstone_id, recent[0] - 1)
+        watermark = encode_watermark(updated_at, task_id, tombstone_id)
+
+    return {
+        'changes': changed,
+        'deleted': [deleted_task_id for _, deleted_task_id, _ in deleted],
+        'watermark': watermark,
+        'has_more': has_more,
+    }
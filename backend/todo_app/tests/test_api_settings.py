@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# The API-only profile needs its own process: this one is already set up with the full settings
+SERVE_REQUESTS = """
+import io, json, sys
+from taskmaster_project.wsgi_api import app
+from django.test.utils import setup_test_environment
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from users.models import User
+
+setup_test_environment()
+connection.creation.create_test_db(verbosity=0, serialize=False)
+token = Token.objects.create(user=User.objects.create_user(username='lean', password='lean-password'))
+
+
+def get(path, **headers):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80', 'HTTP_HOST': 'localhost', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http', 'HTTP_AUTHORIZATION': f'Token {token.key}', **headers,
+    }
+    response = {}
+    def start_response(status, headers, exc_info=None):
+        response.update(status=status, content_type=dict(headers).get('Content-Type'))
+    response['body'] = b''.join(app(environ, start_response)).decode()
+    return response
+
+
+print(json.dumps({
+    'tasks': get('/api/v1/tasks/'),
+    'html': get('/api/v1/tasks/', HTTP_ACCEPT='text/html,application/xhtml+xml,*/*;q=0.8'),
+    'me': get('/api/v1/auth/me/'),
+    'admin': get('/admin/'),
+    'modules': sorted(sys.modules),
+}))
+"""
+
+
+def run_api_only(tmp_path, *args):
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'taskmaster_project.settings_api',
+        'DEBUG': 'False',
+        # Keeps the development database out of it, tests run on an in-memory copy
+        'DATABASE_URL': f"sqlite:///{tmp_path / 'db.sqlite3'}",
+    }
+    env.pop('IS_PRODUCTION', None)
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+
+class TestApiOnlySettings:
+
+    def test_system_checks_pass(self, tmp_path):
+        result = run_api_only(tmp_path, 'manage.py', 'check')
+
+        assert result.returncode == 0, result.stderr
+
+    def test_serves_the_api_without_unused_apps(self, tmp_path):
+        result = run_api_only(tmp_path, '-c', SERVE_REQUESTS)
+        assert result.returncode == 0, result.stderr
+        output = json.loads(result.stdout.splitlines()[-1])
+
+        assert output['tasks']['status'] == '200 OK'
+        assert json.loads(output['tasks']['body']) == []
+        assert json.loads(output['me']['body'])['username'] == 'lean'
+        # No browsable API, browsers get JSON too
+        assert output['html']['status'] == '200 OK'
+        assert output['html']['content_type'] == 'application/json'
+        assert output['admin']['status'] == '404 Not Found'
+
+        # admin and messages modules are still imported by rest_framework.schemas, just not installed
+        modules = set(output['modules'])
+        for unused in ('django.contrib.sessions', 'whitenoise'):
+            assert not any(module == unused or module.startswith(f'{unused}.') for module in modules), unused
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from todo_app.models import Task, Category, Tag
+from taskmaster_project.asgi import application
+
+
+@pytest.fixture
+def auth_headers(token):
+    return {'Authorization': f'Token {token}'}
+
+
+@pytest.fixture
+def tasks(user):
+    category = Category.objects.create(name='Work', color='#00FF00', user=user)
+    tags = [Tag.objects.create(name=name, user=user) for name in ['home', 'urgent']]
+    for i in range(5):
+        task = Task.objects.create(
+            title=f'Task {i}', priority=['low', 'high'][i % 2], category=category if i % 2 else None, user=user,
+        )
+        task.tags.set(tags[:i % 3])
+    return Task.objects.filter(user=user).order_by('id')
+
+
+@pytest.mark.django_db
+class TestASGI:
+
+    @pytest.mark.parametrize('name, params', [
+        ('task-list', {'page_size': 2}),
+        ('category-list', {}),
+        ('auth-me', {}),
+    ])
+    def test_responses_match_wsgi(self, authenticate_client, auth_headers, tasks, name, params):
+        expected = authenticate_client.get(reverse(name), params)
+        # AsyncClient only sends headers given per request
+        response = async_to_sync(AsyncClient().get)(reverse(name), params, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+    def test_concurrent_requests(self, auth_headers, tasks):
+        async def fetch_all():
+            client = AsyncClient()
+            return await asyncio.gather(*(client.get(reverse('task-list'), headers=auth_headers) for _ in range(10)))
+
+        responses = async_to_sync(fetch_all)()
+
+        assert {response.status_code for response in responses} == {status.HTTP_200_OK}
+        assert len({response.content for response in responses}) == 1
+
+    # The real handler may run queries in its own thread, which needs committed data
+    @pytest.mark.django_db(transaction=True)
+    def test_application_serves_the_api(self, token, user):
+        async def request():
+            communicator = ApplicationCommunicator(application, {
+                'type': 'http', 'method': 'GET', 'path': '/api/v1/auth/me/', 'query_string': b'',
+                'headers': [(b'host', b'testserver'), (b'authorization', f'Token {token}'.encode())],
+            })
+            await communicator.send_input({'type': 'http.request', 'body': b''})
+            start = await communicator.receive_output()
+            body = await communicator.receive_output()
+            await communicator.wait()
+            return start, body
+
+        start, body = async_to_sync(request)()
+
+        assert start['status'] == status.HTTP_200_OK
+        assert b'"username":"testuser"' in body['body']
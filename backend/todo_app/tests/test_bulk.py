@@ -0,0 +1,129 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.bulk import BulkTaskOperations
+from todo_app.models import Task, Tag
+from users.authentication import get_token_cache
+
+User = get_user_model()
+
+
+def bulk(client, operations):
+    return client.post(reverse('task-bulk'), {'operations': operations}, format='json')
+
+
+@pytest.mark.django_db
+class TestBulkTasks:
+
+    def test_mixed_operations(self, authenticate_client, user):
+        tag = Tag.objects.create(name='home', user=user)
+        to_update = Task.objects.create(title='Old', user=user)
+        to_archive = Task.objects.create(title='Archive me', user=user)
+        to_delete = Task.objects.create(title='Delete me', user=user)
+
+        response = bulk(authenticate_client, [
+            {'op': 'create', 'data': {'title': 'New', 'priority': 'high', 'tag_ids': [tag.id]}},
+            {'op': 'update', 'id': to_update.id, 'data': {'title': 'Renamed', 'tag_ids': [tag.id]}},
+            {'op': 'change_status', 'id': to_archive.id, 'status': 'archived'},
+            {'op': 'delete', 'id': to_delete.id},
+        ])
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        assert [r['status'] for r in results] == [201, 200, 200, 204]
+        assert results[0]['data']['title'] == 'New'
+        assert results[0]['data']['tags'][0]['name'] == 'home'
+        assert results[1]['data']['title'] == 'Renamed'
+        assert results[2]['data']['status'] == 'archived'
+
+        created = Task.objects.get(pk=results[0]['id'])
+        assert created.user == user
+        assert list(created.tags.all()) == [tag]
+        to_update.refresh_from_db()
+        assert to_update.title == 'Renamed'
+        assert list(to_update.tags.all()) == [tag]
+        assert Task.objects.get(pk=to_archive.id).status == 'archived'
+        assert not Task.objects.filter(pk=to_delete.id).exists()
+
+    def test_invalid_item_rolls_back_whole_batch(self, authenticate_client, user):
+        task = Task.objects.create(title='Keep', user=user)
+
+        response = bulk(authenticate_client, [
+            {'op': 'create', 'data': {'title': 'Valid'}},
+            {'op': 'update', 'id': task.id, 'data': {'priority': 'urgent'}},
+        ])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'][0]['index'] == 1
+        assert 'priority' in response.data['errors'][0]['errors']
+        assert not Task.objects.filter(title='Valid').exists()
+
+    def test_cannot_touch_other_users_tasks(self, authenticate_client):
+        other = User.objects.create_user(username='otheruser', password='password')
+        task = Task.objects.create(title='Not yours', user=other)
+
+        response = bulk(authenticate_client, [{'op': 'delete', 'id': task.id}])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'][0]['status'] == status.HTTP_404_NOT_FOUND
+        assert Task.objects.filter(pk=task.id).exists()
+
+    def test_task_deleted_before_save(self, authenticate_client, user, monkeypatch):
+        kept = Task.objects.create(title='Kept', user=user)
+        gone = Task.objects.create(title='Gone', user=user)
+        is_valid = BulkTaskOperations.is_valid
+
+        def delete_after_validation(self):
+            valid = is_valid(self)
+            # Another request deletes it before this one writes
+            Task.objects.filter(pk=gone.pk).delete()
+            return valid
+
+        monkeypatch.setattr(BulkTaskOperations, 'is_valid', delete_after_validation)
+        response = bulk(authenticate_client, [
+            {'op': 'create', 'data': {'title': 'New'}},
+            {'op': 'change_status', 'id': kept.id, 'status': 'completed'},
+            {'op': 'update', 'id': gone.id, 'data': {'title': 'Renamed'}},
+        ])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'] == [
+            {'index': 2, 'op': 'update', 'id': gone.id, 'status': status.HTTP_404_NOT_FOUND,
+             'errors': {'id': 'Not found.'}},
+        ]
+        assert not Task.objects.filter(title='New').exists()
+        assert Task.objects.get(pk=kept.pk).status == 'pending'
+
+    def test_rejects_repeated_task(self, authenticate_client, user):
+        task = Task.objects.create(title='Twice', user=user)
+
+        response = bulk(authenticate_client, [
+            {'op': 'change_status', 'id': task.id, 'status': 'completed'},
+            {'op': 'delete', 'id': task.id},
+        ])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['errors'][0]['index'] == 1
+
+    def test_status_change_query_count_is_constant(self, authenticate_client, user):
+        tasks = [Task.objects.create(title=f'Task {i}', user=user) for i in range(30)]
+
+        def archive(batch):
+            get_token_cache().clear()
+            with CaptureQueriesContext(connection) as ctx:
+                response = bulk(authenticate_client, [
+                    {'op': 'change_status', 'id': task.id, 'status': 'archived'} for task in batch
+                ])
+            assert response.status_code == status.HTTP_200_OK
+            return len(ctx.captured_queries)
+
+        assert archive(tasks[:2]) == archive(tasks[2:])
+        assert Task.objects.filter(status='archived').count() == 30
+
+    def test_requires_operations(self, authenticate_client):
+        response = authenticate_client.post(reverse('task-bulk'), {'operations': []}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Category, Tag
+
+User = get_user_model()
+
+
+def get(client, url, etag=None):
+    headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, **headers)
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestCollectionCache:
+
+    def test_unchanged_poll_returns_304(self, authenticate_client, user):
+        Task.objects.create(title='Task 1', user=user)
+        url = reverse('task-list')
+        response, _ = get(authenticate_client, url)
+        etag = response['ETag']
+
+        response, queries = get(authenticate_client, url, etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        # Only the collection version lookup, the token is cached
+        assert queries == 1
+
+    def test_unchanged_poll_without_etag_is_served_from_cache(self, authenticate_client, user):
+        Task.objects.create(title='Task 1', user=user)
+        url = reverse('task-list')
+        first, _ = get(authenticate_client, url)
+
+        second, queries = get(authenticate_client, url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert queries == 1
+
+    def test_task_write_changes_etag(self, authenticate_client, user):
+        url = reverse('task-list')
+        response, _ = get(authenticate_client, url)
+
+        authenticate_client.post(url, {'title': 'New'}, format='json')
+        response, _ = get(authenticate_client, url, response['ETag'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['title'] for task in response.data] == ['New']
+
+    def test_tag_and_category_changes_invalidate_tasks(self, authenticate_client, user):
+        category = Category.objects.create(name='Work', user=user)
+        task = Task.objects.create(title='Task 1', user=user, category=category)
+        tag = Tag.objects.create(name='urgent', user=user)
+        url = reverse('task-list')
+        response, _ = get(authenticate_client, url)
+
+        task.tags.add(tag)
+        response, _ = get(authenticate_client, url, response['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['tags'][0]['name'] == 'urgent'
+
+        category.color = '#000000'
+        category.save()
+        response, _ = get(authenticate_client, url, response['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['category_color'] == '#000000'
+
+    def test_bulk_operations_change_etag(self, authenticate_client, user):
+        task = Task.objects.create(title='Task 1', user=user)
+        url = reverse('task-list')
+        response, _ = get(authenticate_client, url)
+
+        authenticate_client.post(reverse('task-bulk'), {
+            'operations': [{'op': 'change_status', 'id': task.id, 'status': 'completed'}]
+        }, format='json')
+        response, _ = get(authenticate_client, url, response['ETag'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['status'] == 'completed'
+
+    def test_query_params_get_their_own_etag(self, authenticate_client, user):
+        Task.objects.create(title='Task 1', user=user, status='completed')
+        response, _ = get(authenticate_client, reverse('task-list'))
+
+        filtered, _ = get(authenticate_client, f"{reverse('task-list')}?status=pending", response['ETag'])
+
+        assert filtered.status_code == status.HTTP_200_OK
+        assert filtered.data == []
+
+    def test_versions_are_per_user(self, authenticate_client, user):
+        other = User.objects.create_user(username='otheruser', password='password')
+        url = reverse('category-list')
+        response, _ = get(authenticate_client, url)
+
+        Category.objects.create(name='Not mine', user=other)
+        response, _ = get(authenticate_client, url, response['ETag'])
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
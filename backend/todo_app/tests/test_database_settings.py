@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+
+from taskmaster_project import database
+from taskmaster_project.database import connection_settings, postgres_database
+
+POSTGRES = {
+    'ENGINE': 'django.db.backends.postgresql',
+    'NAME': 'taskmaster',
+    'OPTIONS': {'sslmode': 'require'},
+}
+
+
+@pytest.fixture
+def pool_installed(monkeypatch):
+    monkeypatch.setattr(database, 'pool_available', lambda: True)
+
+
+class TestConnectionSettings:
+
+    def test_persistent_by_default(self):
+        settings = connection_settings({})
+
+        assert settings['CONN_MAX_AGE'] == 60
+        assert settings['CONN_HEALTH_CHECKS'] is True
+        assert settings['OPTIONS'] == {}
+
+    def test_persistent_from_environment(self):
+        settings = connection_settings({'DB_CONN_MAX_AGE': '300', 'DB_CONN_HEALTH_CHECKS': 'False'})
+
+        assert settings['CONN_MAX_AGE'] == 300
+        assert settings['CONN_HEALTH_CHECKS'] is False
+
+    def test_pool_disables_persistent_connections(self, pool_installed):
+        settings = connection_settings({'DB_CONNECTIONS': 'pool', 'DB_POOL_MAX_SIZE': '20'})
+
+        # Django refuses CONN_MAX_AGE together with a pool
+        assert settings['CONN_MAX_AGE'] == 0
+        assert settings['OPTIONS']['pool'] == {'min_size': 1, 'max_size': 20, 'timeout': 10.0}
+
+    def test_pool_needs_psycopg_3(self, monkeypatch):
+        monkeypatch.setattr(database, 'pool_available', lambda: False)
+
+        with pytest.raises(ImproperlyConfigured, match='requirements-pool.txt'):
+            connection_settings({'DB_CONNECTIONS': 'pool'})
+
+    def test_none_opens_a_connection_per_request(self):
+        settings = connection_settings({'DB_CONNECTIONS': 'None'})
+
+        assert settings['CONN_MAX_AGE'] == 0
+        assert settings['CONN_HEALTH_CHECKS'] is False
+
+    def test_unknown_mode(self):
+        with pytest.raises(ImproperlyConfigured):
+            connection_settings({'DB_CONNECTIONS': 'pgbouncer'})
+
+    def test_server_side_cursors_can_be_disabled(self):
+        assert connection_settings({})['DISABLE_SERVER_SIDE_CURSORS'] is False
+        assert connection_settings({'DB_DISABLE_SERVER_SIDE_CURSORS': 'True'})['DISABLE_SERVER_SIDE_CURSORS'] is True
+
+    def test_postgres_database_keeps_existing_options(self, pool_installed):
+        database = postgres_database(POSTGRES, {'DB_CONNECTIONS': 'pool'})
+
+        assert database['NAME'] == 'taskmaster'
+        assert database['OPTIONS']['sslmode'] == 'require'
+        assert 'pool' in database['OPTIONS']
+        assert 'pool' not in POSTGRES['OPTIONS']
+
+
+@pytest.mark.parametrize('environ, max_age', [({}, 0), ({'DB_CONNECTIONS': 'persistent'}, 60)])
+def test_asgi_defaults_to_a_connection_per_request(environ, max_age):
+    env = {key: value for key, value in os.environ.items() if key != 'DB_CONNECTIONS'}
+    result = subprocess.run(
+        [sys.executable, '-c', 'import taskmaster_project.asgi, taskmaster_project.database as d; '
+                               'print(d.connection_settings()["CONN_MAX_AGE"])'],
+        cwd=django_settings.BASE_DIR, env={**env, **environ}, capture_output=True, text=True, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-1] == str(max_age)
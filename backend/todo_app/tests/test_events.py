@@ -0,0 +1,253 @@
+import asyncio
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.db import transaction
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from taskmaster_project.asgi import application
+from taskmaster_project.event_stream import EventStream
+from todo_app.events import RESYNC, EventBroker, get_event_broker
+from todo_app.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(get_event_broker(), 'publish', lambda user_id, event: events.append((user_id, event)))
+    return events
+
+
+@pytest.fixture
+def committed(django_capture_on_commit_callbacks):
+    # Tests run inside a transaction that never commits: runs the on_commit callbacks when the block exits
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def types(published):
+    return [event['type'] for _, event in published]
+
+
+@pytest.mark.django_db
+class TestPublishedEvents:
+
+    def test_task_lifecycle(self, authenticate_client, user, published, committed):
+        with committed():
+            response = authenticate_client.post(reverse('task-list'), {'title': 'Task'}, format='json')
+            task_id = response.data['id']
+            authenticate_client.patch(reverse('task-detail', args=[task_id]), {'title': 'Renamed'}, format='json')
+            authenticate_client.post(reverse('task-change-status', args=[task_id]), {'status': 'completed'}, format='json')
+            authenticate_client.delete(reverse('task-detail', args=[task_id]))
+
+        assert published == [
+            (user.id, {'type': 'task.created', 'id': task_id}),
+            (user.id, {'type': 'task.updated', 'id': task_id}),
+            (user.id, {'type': 'task.status_changed', 'id': task_id, 'status': 'completed'}),
+            (user.id, {'type': 'task.deleted', 'id': task_id}),
+        ]
+
+    def test_status_change_through_update(self, authenticate_client, user, published, committed):
+        task = Task.objects.create(title='Task', user=user)
+
+        with committed():
+            authenticate_client.patch(reverse('task-detail', args=[task.id]), {'status': 'in_progress'}, format='json')
+            authenticate_client.patch(reverse('task-detail', args=[task.id]), {'title': 'Same status'}, format='json')
+
+        assert types(published) == ['task.status_changed', 'task.updated']
+
+    def test_categories_and_tags(self, authenticate_client, published, committed):
+        with committed():
+            category = authenticate_client.post(reverse('category-list'), {'name': 'Work'}, format='json').data['id']
+            tag = authenticate_client.post(reverse('tag-list'), {'name': 'urgent'}, format='json').data['id']
+            authenticate_client.patch(reverse('tag-detail', args=[tag]), {'name': 'now'}, format='json')
+            authenticate_client.delete(reverse('category-detail', args=[category]))
+
+        assert types(published) == ['category.created', 'tag.created', 'tag.updated', 'category.deleted']
+
+    def test_bulk_operations(self, authenticate_client, user, published, committed):
+        to_update, to_complete, to_delete = [Task.objects.create(title=f'Task {i}', user=user) for i in range(3)]
+
+        with committed():
+            authenticate_client.post(reverse('task-bulk'), {'operations': [
+                {'op': 'create', 'data': {'title': 'New'}},
+                {'op': 'update', 'id': to_update.id, 'data': {'title': 'Renamed'}},
+                {'op': 'change_status', 'id': to_complete.id, 'status': 'completed'},
+                {'op': 'delete', 'id': to_delete.id},
+            ]}, format='json')
+
+        assert sorted(types(published)) == ['task.created', 'task.deleted', 'task.status_changed', 'task.updated']
+
+    def test_import_publishes_one_resync(self, authenticate_client, user, published, committed):
+        upload = io.BytesIO(b'\n'.join(json.dumps({'title': f'Task {i}'}).encode() for i in range(20)))
+        upload.name = 'tasks.ndjson'
+
+        with committed():
+            authenticate_client.post(reverse('task-import'), {'file': upload}, format='multipart')
+
+        assert published == [(user.id, RESYNC)]
+
+
+@pytest.mark.django_db
+def test_events_wait_for_the_commit(user, published, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with transaction.atomic():
+            Task.objects.create(title='Task', user=user)
+
+    assert published == []
+    callbacks[0]()
+    assert types(published) == ['task.created']
+
+
+class TestEventBroker:
+
+    def test_delivers_to_the_users_subscriptions(self):
+        broker = EventBroker()
+
+        async def scenario():
+            mine, also_mine, other = broker.subscribe(1), broker.subscribe(1), broker.subscribe(2)
+            # Published from a worker thread, like a sync view does
+            await asyncio.to_thread(broker.publish, 1, {'type': 'task.created', 'id': 5})
+            received = [await mine.get(1), await also_mine.get(1)]
+            with pytest.raises(TimeoutError):
+                await other.get(0.05)
+            return received
+
+        assert async_to_sync(scenario)() == [{'type': 'task.created', 'id': 5}] * 2
+
+    def test_slow_subscription_gets_a_resync(self):
+        broker = EventBroker(queue_size=3)
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            for pk in range(10):
+                subscription.put({'type': 'task.updated', 'id': pk})
+            return [await subscription.get(1), subscription.queue.qsize()]
+
+        assert async_to_sync(scenario)() == [RESYNC, 0]
+
+    def test_unsubscribe(self):
+        broker = EventBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            broker.unsubscribe(subscription)
+            broker.publish(1, {'type': 'task.created', 'id': 1})
+            return await subscription.get(1)
+
+        assert async_to_sync(scenario)() is None
+        assert broker.subscriptions == {}
+
+
+def http_scope(path='/api/v1/events/', query_string=b'', headers=()):
+    return {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string,
+        'headers': list(headers), 'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80),
+    }
+
+
+@pytest.mark.django_db
+class TestEventStream:
+
+    def change_status(self, client, task, value, capture):
+        with capture(execute=True):
+            client.post(reverse('task-change-status', args=[task.id]), {'status': value}, format='json')
+
+    def test_server_sent_events(self, authenticate_client, user, token, django_capture_on_commit_callbacks):
+        task = Task.objects.create(title='Task', user=user)
+
+        async def scenario():
+            stream = ApplicationCommunicator(application, http_scope(query_string=f'token={token}'.encode()))
+            await stream.send_input({'type': 'http.request', 'body': b''})
+            start = await stream.receive_output(1)
+            retry = await stream.receive_output(1)
+            await sync_to_async(self.change_status)(
+                authenticate_client, task, 'completed', django_capture_on_commit_callbacks
+            )
+            event = await stream.receive_output(1)
+            await stream.send_input({'type': 'http.disconnect'})
+            await stream.wait(1)
+            return start, retry, event
+
+        start, retry, event = async_to_sync(scenario)()
+
+        assert start['status'] == 200
+        assert (b'content-type', b'text/event-stream') in start['headers']
+        assert retry['body'] == b'retry: 5000\n\n'
+        assert event['body'] == (
+            b'event: task.status_changed\n'
+            + f'data: {{"type": "task.status_changed", "id": {task.id}, "status": "completed"}}\n\n'.encode()
+        )
+        assert get_event_broker().connection_count() == 0
+
+    def test_heartbeat(self, token, monkeypatch):
+        monkeypatch.setattr(application, 'heartbeat', 0.01)
+
+        async def scenario():
+            stream = ApplicationCommunicator(application, http_scope(headers=[(b'authorization', f'Token {token}'.encode())]))
+            await stream.send_input({'type': 'http.request', 'body': b''})
+            await stream.receive_output(1)
+            await stream.receive_output(1)
+            heartbeat = await stream.receive_output(1)
+            await stream.send_input({'type': 'http.disconnect'})
+            await stream.wait(1)
+            return heartbeat
+
+        assert async_to_sync(scenario)()['body'] == b': heartbeat\n\n'
+
+    @pytest.mark.parametrize('query_string', [b'', b'token=invalid'])
+    def test_requires_a_valid_token(self, query_string):
+        async def scenario():
+            stream = ApplicationCommunicator(application, http_scope(query_string=query_string))
+            await stream.send_input({'type': 'http.request', 'body': b''})
+            return await stream.receive_output(1)
+
+        assert async_to_sync(scenario)()['status'] == 401
+
+    def test_websocket(self, authenticate_client, user, token, django_capture_on_commit_callbacks):
+        task = Task.objects.create(title='Task', user=user)
+        other = User.objects.create_user(username='otheruser', password='password')
+
+        async def scenario():
+            scope = {**http_scope(query_string=f'token={token}'.encode()), 'type': 'websocket'}
+            socket = ApplicationCommunicator(application, scope)
+            await socket.send_input({'type': 'websocket.connect'})
+            accept = await socket.receive_output(1)
+            # Someone else's writes are not sent
+            await sync_to_async(Task.objects.create)(title='Not mine', user=other)
+            await sync_to_async(self.change_status)(
+                authenticate_client, task, 'in_progress', django_capture_on_commit_callbacks
+            )
+            message = await socket.receive_output(1)
+            await socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await socket.wait(1)
+            return accept, message
+
+        accept, message = async_to_sync(scenario)()
+
+        assert accept == {'type': 'websocket.accept'}
+        assert json.loads(message['text']) == {'type': 'task.status_changed', 'id': task.id, 'status': 'in_progress'}
+
+    def test_websocket_rejects_invalid_tokens(self):
+        async def scenario():
+            socket = ApplicationCommunicator(application, {**http_scope(), 'type': 'websocket'})
+            await socket.send_input({'type': 'websocket.connect'})
+            return await socket.receive_output(1)
+
+        assert async_to_sync(scenario)() == {'type': 'websocket.close', 'code': 4401}
+
+    def test_other_paths_go_to_django(self):
+        calls = []
+
+        async def django_app(scope, receive, send):
+            calls.append(scope['path'])
+
+        stream = EventStream(django_app)
+        async_to_sync(stream)(http_scope('/api/v1/tasks/'), None, None)
+        async_to_sync(stream)({**http_scope('/api/v1/other/'), 'type': 'websocket'}, None, None)
+
+        assert calls == ['/api/v1/tasks/', '/api/v1/other/']
@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Category, Tag
+from todo_app.views import TaskViewSet
+from users.authentication import get_token_cache
+
+User = get_user_model()
+
+
+@pytest.fixture
+def tasks(user):
+    category = Category.objects.create(name='Work', user=user)
+    tags = [Tag.objects.create(name=name, user=user) for name in ['home', 'urgent']]
+    first = Task.objects.create(title='Write, "report"', description='line 1\nline 2', priority='high',
+                                category=category, user=user)
+    first.tags.set(tags)
+    Task.objects.create(title='Plain', user=user)
+    Task.objects.create(title='Not mine', user=User.objects.create_user(username='other', password='x'))
+    return first
+
+
+def export(client, **params):
+    response = client.get(reverse('task-export'), params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return response, b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestTaskExport:
+
+    def test_ndjson(self, authenticate_client, tasks):
+        response, content = export(authenticate_client, format='ndjson')
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'] == 'attachment; filename="tasks.ndjson"'
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        assert [row['title'] for row in rows] == ['Write, "report"', 'Plain']
+        assert rows[0]['category'] == 'Work'
+        assert rows[0]['tags'] == ['home', 'urgent']
+        assert rows[1]['category'] is None
+        assert rows[1]['due_date'] is None
+
+    def test_ndjson_is_the_default(self, authenticate_client, tasks):
+        response, _ = export(authenticate_client)
+        assert response['Content-Type'] == 'application/x-ndjson'
+
+    def test_csv(self, authenticate_client, tasks):
+        response, content = export(authenticate_client, format='csv')
+
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        assert [row['title'] for row in rows] == ['Write, "report"', 'Plain']
+        assert rows[0]['description'] == 'line 1\nline 2'
+        assert rows[0]['tags'] == 'home;urgent'
+        assert rows[1]['category'] == ''
+
+    def test_csv_with_no_tasks_has_header(self, authenticate_client):
+        _, content = export(authenticate_client, format='csv')
+        assert content.decode().strip() == 'id,title,description,status,priority,due_date,category,tags,created_at,updated_at'
+
+    def test_respects_filters(self, authenticate_client, tasks):
+        _, content = export(authenticate_client, format='ndjson', priority='high')
+        assert [json.loads(line)['id'] for line in content.splitlines()] == [tasks.id]
+
+    def test_unknown_format(self, authenticate_client, tasks):
+        response = authenticate_client.get(reverse('task-export'), {'format': 'xml'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse('task-export'), {'format': 'csv'})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_queries_per_chunk_are_constant(self, authenticate_client, user, monkeypatch):
+        monkeypatch.setattr(TaskViewSet, 'export_chunk_size', 5)
+        tag = Tag.objects.create(name='tag', user=user)
+        category = Category.objects.create(name='Cat', user=user)
+        for i in range(20):
+            Task.objects.create(title=f'Task {i}', category=category, user=user).tags.add(tag)
+
+        get_token_cache().clear()
+        with CaptureQueriesContext(connection) as ctx:
+            _, content = export(authenticate_client, format='csv')
+
+        assert len(content.splitlines()) == 21
+        # auth + one tasks query + one tag prefetch per chunk of 5
+        assert len(ctx.captured_queries) == 1 + 1 + 4
+
+    def test_asgi_streams_an_async_iterator(self, authenticate_client, token, user, monkeypatch):
+        monkeypatch.setattr(TaskViewSet, 'export_chunk_size', 5)
+        for i in range(12):
+            Task.objects.create(title=f'Task {i}', user=user)
+
+        async def scenario():
+            response = await AsyncClient().get(
+                reverse('task-export'), {'format': 'csv'}, headers={'authorization': f'Token {token}'}
+            )
+            return response, [chunk async for chunk in response.streaming_content]
+
+        response, chunks = async_to_sync(scenario)()
+
+        # An async iterator is sent as it is read, instead of collected into a list first
+        assert response.is_async
+        # header + chunks of 5, 5 and 2 tasks
+        assert len(chunks) == 4
+        assert b''.join(chunks) == export(authenticate_client, format='csv')[1]
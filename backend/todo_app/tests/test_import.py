@@ -0,0 +1,181 @@
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from rest_framework.serializers import ValidationError
+from todo_app.importer import TaskImporter, validate_row
+from todo_app.models import Task, Category, Tag
+from todo_app.serializers import TaskSerializer
+
+User = get_user_model()
+
+
+def ndjson(*rows):
+    return b''.join(json.dumps(row).encode() + b'\n' for row in rows)
+
+
+def upload(client, name, content, **data):
+    return client.post(reverse('task-import'), {'file': SimpleUploadedFile(name, content), **data}, format='multipart')
+
+
+@pytest.mark.django_db
+class TestTaskImport:
+
+    def test_ndjson_upload(self, authenticate_client, user):
+        existing = Category.objects.create(name='Work', user=user)
+        content = ndjson(
+            {'title': 'One', 'priority': 'high', 'category': 'Work', 'tags': ['a', 'b', 'a']},
+            {'title': 'Two', 'category': 'Home', 'tags': ['b'], 'due_date': '2025-05-01T10:00:00Z'},
+            {'title': 'Three'},
+        )
+
+        response = upload(authenticate_client, 'tasks.ndjson', content)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {'created': 3, 'categories_created': 1, 'tags_created': 2, 'errors': []}
+        one = Task.objects.get(title='One')
+        assert one.priority == 'high'
+        assert one.category == existing
+        assert sorted(one.tags.values_list('name', flat=True)) == ['a', 'b']
+        assert Task.objects.get(title='Three').status == 'pending'
+        assert Task.objects.get(title='Two').category.name == 'Home'
+
+    def test_csv_upload_matches_export_format(self, authenticate_client, user):
+        content = (
+            'id,title,description,status,priority,due_date,category,tags,created_at,updated_at\n'
+            '7,"Write, ""report""","line 1\nline 2",completed,low,,Work,home;urgent,,\n'
+            ',Plain,,,,,,,,\n'
+        ).encode()
+
+        response = upload(authenticate_client, 'tasks.csv', content)
+
+        assert response.data['created'] == 2
+        task = Task.objects.get(title='Write, "report"')
+        assert task.description == 'line 1\nline 2'
+        assert task.status == 'completed'
+        assert sorted(task.tags.values_list('name', flat=True)) == ['home', 'urgent']
+        assert Task.objects.get(title='Plain').category is None
+
+    def test_invalid_rows_are_reported_and_skipped(self, authenticate_client, user):
+        content = ndjson({'title': 'Good'}, {'priority': 'urgent'}) + b'{not json\n' + ndjson(['list'])
+
+        response = upload(authenticate_client, 'tasks.ndjson', content)
+
+        assert response.data['created'] == 1
+        assert [error['line'] for error in response.data['errors']] == [2, 3, 4]
+        assert set(response.data['errors'][0]['errors']) == {'title', 'priority'}
+        assert list(Task.objects.filter(user=user).values_list('title', flat=True)) == ['Good']
+
+    def test_tags_are_per_user(self, authenticate_client, user):
+        other = User.objects.create_user(username='other', password='x')
+        Tag.objects.create(name='urgent', user=other)
+
+        upload(authenticate_client, 'tasks.ndjson', ndjson({'title': 'Mine', 'tags': ['urgent']}))
+
+        tag = Task.objects.get(title='Mine').tags.get()
+        assert tag.user == user
+
+    def test_rejects_unknown_format(self, authenticate_client):
+        response = upload(authenticate_client, 'tasks.xml', b'<tasks/>')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = upload(authenticate_client, 'tasks.txt', ndjson({'title': 'One'}), format='ndjson')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    @pytest.mark.parametrize('content, error', [
+        (b'title\nGood\n\xff\xfe bad\n', 'The file is not UTF-8 encoded.'),
+        (b'title\nGood\n' + b'x' * 200_000 + b'\n', 'Invalid CSV on line 3: field larger than field limit (131072)'),
+    ])
+    def test_unreadable_csv_is_rejected(self, authenticate_client, user, content, error):
+        response = upload(authenticate_client, 'tasks.csv', content)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {'error': error}
+        assert not Task.objects.filter(user=user).exists()
+
+    def test_queries_per_batch_are_constant(self, user):
+        rows = [{'title': f'Task {i}', 'category': f'Cat {i % 3}', 'tags': [f'tag-{i % 4}']} for i in range(30)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            report = TaskImporter(user, batch_size=10).run(io.BytesIO(ndjson(*rows)), 'ndjson')
+
+        assert report['created'] == 30
+        assert Task.objects.filter(user=user, tags__isnull=False).count() == 30
+        inserts = [query['sql'].split(' (')[0] for query in ctx.captured_queries if query['sql'].startswith('INSERT')]
+        # one INSERT per batch of 10 tasks and of their tag links, categories and tags once
+        assert inserts.count('INSERT INTO "todo_app_task"') == 3
+        assert inserts.count('INSERT INTO "todo_app_task_tags"') == 3
+        # and the last position of the column per batch
+        last_positions = [query for query in ctx.captured_queries
+                          if query['sql'].startswith('SELECT "todo_app_task"."position"')]
+        assert len(last_positions) == 3
+        assert len(ctx.captured_queries) < 23
+
+    @pytest.mark.parametrize('row', [
+        {'title': '  Trimmed  ', 'description': '', 'status': 'completed', 'due_date': '2025-05-01T10:00:00'},
+        {'title': 7, 'priority': 'low', 'due_date': None},
+        {},
+        {'title': '', 'priority': 'urgent', 'status': None},
+        {'title': 'x' * 201, 'description': None, 'due_date': 'tomorrow'},
+        {'title': ['a list'], 'due_date': '2025-05-01'},
+        {'title': True, 'status': ''},
+    ])
+    def test_row_validation_matches_task_serializer(self, row):
+        serializer = TaskSerializer(data=row)
+
+        try:
+            data = validate_row(row)
+        except ValidationError as exc:
+            assert not serializer.is_valid()
+            assert exc.detail == serializer.errors
+        else:
+            assert serializer.is_valid(), serializer.errors
+            assert data == serializer.validated_data
+
+    def test_row_validation_of_category_and_tags(self):
+        assert validate_row({'title': 'One', 'category': ' Work ', 'tags': ['a', ' b']}) == {
+            'title': 'One', 'category': 'Work', 'tags': ['a', 'b'],
+        }
+        with pytest.raises(ValidationError) as exc:
+            validate_row({'title': 'One', 'category': 'c' * 101, 'tags': ['ok', '', 't' * 51]})
+        assert exc.value.detail == {
+            'category': ['Ensure this field has no more than 100 characters.'],
+            'tags': {1: ['This field may not be blank.'], 2: ['Ensure this field has no more than 50 characters.']},
+        }
+        with pytest.raises(ValidationError) as exc:
+            validate_row({'title': 'One', 'tags': 'a;b'})
+        assert exc.value.detail == {'tags': ['Expected a list of items but got type "str".']}
+
+    def test_management_command(self, user, tmp_path):
+        path = tmp_path / 'tasks.ndjson'
+        path.write_bytes(ndjson({'title': 'From CLI', 'tags': ['cli']}))
+        out = io.StringIO()
+
+        call_command('import_tasks', str(path), user='testuser', stdout=out)
+
+        assert 'Imported 1 tasks' in out.getvalue()
+        assert Task.objects.get(title='From CLI').tags.get().name == 'cli'
+
+
+@pytest.mark.django_db
+class TestTagNames:
+
+    def test_same_name_for_different_users(self, authenticate_client, user):
+        Tag.objects.create(name='urgent', user=User.objects.create_user(username='other', password='x'))
+
+        response = authenticate_client.post(reverse('tag-list'), {'name': 'urgent'}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_duplicate_name_for_same_user(self, authenticate_client, user):
+        Tag.objects.create(name='urgent', user=user)
+
+        response = authenticate_client.post(reverse('tag-list'), {'name': 'urgent'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'name' in response.data
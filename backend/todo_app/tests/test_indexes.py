@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Category, Tag
+from todo_app.positions import column
+
+User = get_user_model()
+
+
+@pytest.fixture
+def seeded():
+    users = [User.objects.create_user(username=f'user{i}', password='password') for i in range(5)]
+    categories = [Category.objects.create(name=f'Cat {i}', user=user) for i, user in enumerate(users)]
+    tags = [Tag.objects.create(name=f'tag-{i}', user=users[0]) for i in range(20)]
+    Task.objects.bulk_create([
+        Task(
+            title=f'Task {i}',
+            user=users[i % 5],
+            category=categories[i % 5] if i % 2 else None,
+            status=['pending', 'in_progress', 'completed', 'archived'][i % 4],
+            priority=['low', 'medium', 'high'][i % 3],
+        )
+        for i in range(2000)
+    ])
+    through = Task.tags.through
+    through.objects.bulk_create([
+        through(task_id=task_id, tag_id=tags[n % 20].id)
+        for n, task_id in enumerate(Task.objects.filter(user=users[0]).values_list('id', flat=True))
+    ])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        if connection.vendor == 'postgresql':
+            # Tiny tables would otherwise always get a sequential scan
+            cursor.execute('SET enable_seqscan = off')
+    return users[0], categories[0], tags
+
+
+@pytest.mark.django_db
+class TestTaskIndexes:
+
+    def test_default_listing_uses_ordering_index(self, seeded):
+        user, _, _ = seeded
+        assert 'task_user_ordering_idx' in Task.objects.filter(user=user).explain()
+
+    def test_status_filter_uses_status_index(self, seeded):
+        user, _, _ = seeded
+        queryset = Task.objects.filter(user=user, status='pending').order_by('due_date')
+        assert 'task_user_status_due_idx' in queryset.explain()
+
+    def test_priority_filter_uses_priority_index(self, seeded):
+        user, _, _ = seeded
+        queryset = Task.objects.filter(user=user, priority='high').order_by('due_date')
+        assert 'task_user_priority_due_idx' in queryset.explain()
+
+    def test_category_filter_uses_category_index(self, seeded):
+        user, category, _ = seeded
+        queryset = Task.objects.filter(user=user, category=category).order_by('due_date')
+        assert 'task_user_category_due_idx' in queryset.explain()
+
+    def test_active_tasks_use_partial_index(self, seeded):
+        user, _, _ = seeded
+        queryset = Task.objects.filter(user=user).exclude(status='archived').order_by('due_date')
+        assert 'task_user_active_due_idx' in queryset.explain()
+
+    def test_tag_filter_uses_through_table_index(self, seeded):
+        user, _, tags = seeded
+        queryset = Task.objects.filter(user=user, tags__id__in=[tags[0].id, tags[1].id])
+        assert 'task_tags_tag_task_idx' in queryset.explain()
+
+    def test_manual_order_uses_position_index(self, seeded):
+        user, _, _ = seeded
+        plan = column(user.id, 'pending').explain()
+        assert 'task_user_status_position_idx' in plan
+        assert 'TEMP B-TREE' not in plan
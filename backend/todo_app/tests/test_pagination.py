@@ -0,0 +1,110 @@
+import base64
+import datetime
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from todo_app.models import Task, Category, Tag
+
+
+@pytest.fixture
+def tasks(user):
+    # Lots of ties on priority/due_date/title so the tiebreaker matters
+    now = timezone.now().replace(microsecond=123456)
+    for i in range(23):
+        Task.objects.create(
+            title=f'Task {i % 4}',
+            priority=['low', 'medium', 'high'][i % 3],
+            due_date=None if i % 5 == 0 else now + datetime.timedelta(days=i % 2),
+            user=user,
+        )
+
+
+def walk(client, url, params):
+    ids = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(item['id'] for item in response.data['results'])
+        if response.data['next'] is None:
+            return ids
+        response = client.get(response.data['next'])
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    def test_unpaginated_by_default(self, authenticate_client, tasks):
+        response = authenticate_client.get(reverse('task-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == 23
+
+    def test_walks_every_task_once_in_stable_order(self, authenticate_client, user, tasks):
+        ids = walk(authenticate_client, reverse('task-list'), {'page_size': 4})
+
+        expected = list(
+            Task.objects.filter(user=user)
+            .order_by('-priority_rank', F('due_date').asc(nulls_last=True), 'title', 'id')
+            .values_list('id', flat=True)
+        )
+        assert ids == expected
+
+    def test_respects_ordering_param(self, authenticate_client, user, tasks):
+        ids = walk(authenticate_client, reverse('task-list'), {'page_size': 5, 'ordering': '-title'})
+
+        expected = list(Task.objects.filter(user=user).order_by('-title', 'id').values_list('id', flat=True))
+        assert ids == expected
+
+    def test_page_size_limits_results(self, authenticate_client, tasks):
+        response = authenticate_client.get(reverse('task-list'), {'page_size': 10})
+
+        assert len(response.data['results']) == 10
+        assert response.data['next'] is not None
+
+    def test_paginate_false_keeps_legacy_shape(self, authenticate_client, tasks):
+        response = authenticate_client.get(reverse('task-list'), {'page_size': 10, 'paginate': 'false'})
+
+        assert isinstance(response.data, list)
+        assert len(response.data) == 23
+
+    def test_invalid_cursor(self, authenticate_client, tasks):
+        response = authenticate_client.get(reverse('task-list'), {'cursor': 'not-a-cursor'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_with_naive_datetime_is_rejected(self, authenticate_client, tasks):
+        next_url = authenticate_client.get(reverse('task-list'), {'page_size': 5, 'ordering': '-due_date'}).data['next']
+        payload = json.loads(base64.urlsafe_b64decode(parse_qs(urlparse(next_url).query)['cursor'][0]))
+        payload['v'] = [value.removesuffix('+00:00') if isinstance(value, str) else value for value in payload['v']]
+        assert any(isinstance(value, str) and value.startswith('20') for value in payload['v'])
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        response = authenticate_client.get(reverse('task-list'), {'page_size': 5, 'ordering': '-due_date', 'cursor': cursor})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.data == {'detail': 'Invalid cursor'}
+
+    def test_cursor_from_other_ordering_is_rejected(self, authenticate_client, tasks):
+        response = authenticate_client.get(reverse('task-list'), {'page_size': 5})
+        next_url = response.data['next']
+
+        response = authenticate_client.get(f'{next_url}&ordering=title')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_categories_and_tags_are_paginated(self, authenticate_client, user):
+        for i in range(7):
+            Category.objects.create(name=f'Category {i % 3}', user=user)
+            Tag.objects.create(name=f'tag-{i}', user=user)
+
+        category_ids = walk(authenticate_client, reverse('category-list'), {'page_size': 2})
+        tag_ids = walk(authenticate_client, reverse('tag-list'), {'page_size': 3})
+
+        assert category_ids == list(Category.objects.order_by('name', 'id').values_list('id', flat=True))
+        assert tag_ids == list(Tag.objects.order_by('name', 'id').values_list('id', flat=True))
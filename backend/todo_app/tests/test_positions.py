@@ -0,0 +1,213 @@
+import io
+import random
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.importer import TaskImporter
+from todo_app.models import Task
+from todo_app.positions import bottom_keys, key_after, key_between, move_task, spread_keys
+from todo_app.recurrence import materialize
+
+User = get_user_model()
+
+
+def create(user, title, status='pending'):
+    # At the bottom of the column, like the API
+    return Task.objects.create(title=title, user=user, status=status, position=bottom_keys(user.pk, status)[0])
+
+
+@pytest.fixture
+def tasks(user):
+    return [create(user, f'Task {i}') for i in range(5)]
+
+
+def move(client, task, **data):
+    return client.post(reverse('task-move', args=[task.pk]), data, format='json')
+
+
+def titles(client, status_value='pending'):
+    response = client.get(reverse('task-list'), {'status': status_value, 'ordering': 'position'})
+    return [task['title'] for task in response.data]
+
+
+class TestKeys:
+
+    def test_key_between(self):
+        assert key_between(None, None) == 'i'
+        assert 'a' < key_between('a', 'b') < 'b'
+        assert 'a' < key_between('a', 'a1') < 'a1'
+        assert key_between(None, '1') < '1'
+        assert key_between('z', None) > 'z'
+
+    def test_random_inserts_stay_ordered(self):
+        rng = random.Random(0)
+        keys = []
+        for _ in range(500):
+            index = rng.randint(0, len(keys))
+            low = keys[index - 1] if index else None
+            high = keys[index] if index < len(keys) else None
+            key = key_between(low, high)
+            assert not key.endswith('0')
+            keys.insert(index, key)
+        assert keys == sorted(keys) and len(set(keys)) == len(keys)
+
+    def test_no_key_between_equal_keys(self):
+        with pytest.raises(ValueError):
+            key_between('b', 'b')
+
+    def test_key_after(self):
+        assert key_after(None) == 'i'
+        assert key_after('i') == 'j'
+        assert key_after('a5z') == 'a6'
+        assert key_after('zz') == 'zz1'
+        assert key_after('') == '1'
+
+    def test_appends_stay_short(self):
+        keys = [key_after(None)]
+        for _ in range(2000):
+            keys.append(key_after(keys[-1]))
+        assert keys == sorted(keys) and len(set(keys)) == len(keys)
+        assert not any(key.endswith('0') for key in keys)
+        assert max(map(len, keys)) <= 60
+
+    def test_spread_keys(self):
+        keys = spread_keys(5000)
+        assert keys == sorted(keys) and len(set(keys)) == 5000
+        assert max(map(len, keys)) == 4
+        assert not any(key.endswith('0') for key in keys)
+
+
+@pytest.mark.django_db
+class TestMove:
+
+    def test_move_between_neighbours(self, authenticate_client, tasks):
+        response = move(authenticate_client, tasks[4], after=tasks[0].pk, before=tasks[1].pk)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['position'] != ''
+        assert titles(authenticate_client) == ['Task 0', 'Task 4', 'Task 1', 'Task 2', 'Task 3']
+
+    def test_after_or_before_alone(self, authenticate_client, tasks):
+        move(authenticate_client, tasks[0], after=tasks[2].pk)
+        assert titles(authenticate_client) == ['Task 1', 'Task 2', 'Task 0', 'Task 3', 'Task 4']
+
+        move(authenticate_client, tasks[4], before=tasks[1].pk)
+        assert titles(authenticate_client) == ['Task 4', 'Task 1', 'Task 2', 'Task 0', 'Task 3']
+
+        # Neither goes to the bottom
+        move(authenticate_client, tasks[1])
+        assert titles(authenticate_client) == ['Task 4', 'Task 2', 'Task 0', 'Task 3', 'Task 1']
+
+    def test_move_to_another_column(self, authenticate_client, tasks):
+        done = create(tasks[0].user, 'Done', 'completed')
+        response = move(authenticate_client, tasks[2], status='completed', before=done.pk)
+
+        assert response.data['status'] == 'completed'
+        assert titles(authenticate_client, 'completed') == ['Task 2', 'Done']
+        assert titles(authenticate_client) == ['Task 0', 'Task 1', 'Task 3', 'Task 4']
+
+    def test_a_move_updates_only_the_moved_task(self, authenticate_client, tasks):
+        move(authenticate_client, tasks[4], before=tasks[0].pk)
+        positions = dict(Task.objects.values_list('pk', 'position'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = move(authenticate_client, tasks[0], after=tasks[2].pk, before=tasks[3].pk)
+
+        assert response.status_code == status.HTTP_200_OK
+        task_updates = [query['sql'] for query in ctx.captured_queries
+                        if query['sql'].startswith('UPDATE "todo_app_task"')]
+        assert len(task_updates) == 1
+        changed = {pk for pk, position in Task.objects.values_list('pk', 'position') if positions[pk] != position}
+        assert changed == {tasks[0].pk}
+        assert titles(authenticate_client) == ['Task 4', 'Task 1', 'Task 2', 'Task 0', 'Task 3']
+
+    def test_moves_next_to_new_tasks_update_one_row(self, authenticate_client):
+        def post(url, data):
+            return authenticate_client.post(url, data, format='json').data['id']
+
+        ids = [post(reverse('task-list'), {'title': f'New {i}'}) for i in range(4)]
+        # Comes back into the column from another one
+        done = post(reverse('task-list'), {'title': 'Done', 'status': 'completed'})
+        authenticate_client.post(reverse('task-change-status', args=[done]), {'status': 'pending'}, format='json')
+        assert titles(authenticate_client) == ['New 0', 'New 1', 'New 2', 'New 3', 'Done']
+
+        for task, data in ((ids[3], {'before': ids[0]}), (ids[0], {'after': ids[1], 'before': ids[2]}),
+                           (done, {'before': ids[3]}), (ids[1], {})):
+            positions = dict(Task.objects.values_list('pk', 'position'))
+            with CaptureQueriesContext(connection) as ctx:
+                response = authenticate_client.post(reverse('task-move', args=[task]), data, format='json')
+
+            assert response.status_code == status.HTTP_200_OK
+            task_updates = [query['sql'] for query in ctx.captured_queries
+                            if query['sql'].startswith('UPDATE "todo_app_task" ')]
+            assert len(task_updates) == 1
+            changed = {pk for pk, position in Task.objects.values_list('pk', 'position') if positions[pk] != position}
+            assert changed == {task}
+        assert titles(authenticate_client) == ['Done', 'New 3', 'New 0', 'New 2', 'New 1']
+
+    def test_tasks_enter_at_the_bottom_of_their_column(self, authenticate_client, user, tasks):
+        def bottom(status_value='pending'):
+            return titles(authenticate_client, status_value)[-1]
+
+        authenticate_client.post(reverse('task-list'), {'title': 'Created'}, format='json')
+        assert bottom() == 'Created'
+
+        authenticate_client.patch(reverse('task-detail', args=[tasks[0].pk]), {'status': 'completed'}, format='json')
+        authenticate_client.post(reverse('task-change-status', args=[tasks[1].pk]), {'status': 'completed'},
+                                 format='json')
+        assert titles(authenticate_client, 'completed') == ['Task 0', 'Task 1']
+
+        authenticate_client.post(reverse('task-bulk'), {'operations': [
+            {'op': 'create', 'data': {'title': 'Bulk created'}},
+            {'op': 'update', 'id': tasks[2].pk, 'data': {'status': 'completed'}},
+            {'op': 'change_status', 'id': tasks[3].pk, 'status': 'completed'},
+            {'op': 'update', 'id': tasks[4].pk, 'data': {'title': 'Task 4 renamed'}},
+        ]}, format='json')
+        assert bottom() == 'Bulk created'
+        assert titles(authenticate_client, 'completed') == ['Task 0', 'Task 1', 'Task 2', 'Task 3']
+        assert titles(authenticate_client) == ['Task 4 renamed', 'Created', 'Bulk created']
+
+        TaskImporter(user).run(io.BytesIO(b'{"title": "Imported 1"}\n{"title": "Imported 2"}\n'), 'ndjson')
+        assert titles(authenticate_client)[-2:] == ['Imported 1', 'Imported 2']
+
+        series = create(user, 'Series', 'completed')
+        materialize(series, timezone.now())
+        assert bottom() == 'Series'
+        assert all(Task.objects.values_list('position', flat=True))
+
+    def test_rebalances_when_neighbours_have_the_same_key(self, user, tasks):
+        Task.objects.filter(pk__in=[tasks[1].pk, tasks[2].pk]).update(position=tasks[2].position)
+        move_task(tasks[0], 'pending', after=tasks[1].pk, before=tasks[2].pk)
+
+        order = list(Task.objects.filter(user=user).order_by('position', 'id').values_list('title', flat=True))
+        assert order == ['Task 1', 'Task 0', 'Task 2', 'Task 3', 'Task 4']
+        assert all(Task.objects.values_list('position', flat=True))
+
+    def test_rejects_tasks_outside_the_column(self, authenticate_client, tasks):
+        done = create(tasks[0].user, 'Done', 'completed')
+        other = Task.objects.create(
+            title='Not mine', user=User.objects.create_user(username='other', password='password')
+        )
+
+        for data in ({'after': done.pk}, {'before': other.pk}, {'after': tasks[1].pk, 'before': tasks[1].pk},
+                     {'after': tasks[2].pk, 'before': tasks[1].pk}, {'after': tasks[0].pk}):
+            response = move(authenticate_client, tasks[0], **data)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, data
+        assert Task.objects.get(pk=tasks[0].pk).position == tasks[0].position
+
+    def test_rebalance_positions_command(self, user, tasks, capsys):
+        Task.objects.filter(pk=tasks[0].pk).update(position='z' * 20)
+        Task.objects.filter(pk=tasks[1].pk).update(position='z' * 20 + '1')
+
+        call_command('rebalance_positions')
+
+        assert capsys.readouterr().out == 'Rebalanced 1 columns (5 tasks).\n'
+        positions = list(Task.objects.filter(user=user).order_by('position', 'id').values_list('pk', 'position'))
+        assert [pk for pk, _ in positions] == [tasks[i].pk for i in (2, 3, 4, 0, 1)]
+        assert max(len(position) for _, position in positions) <= 2
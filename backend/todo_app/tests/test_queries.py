@@ -0,0 +1,149 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Category, Tag
+from users.authentication import get_token_cache
+
+User = get_user_model()
+
+
+def create_tasks(user, count):
+    category = Category.objects.create(name=f'Cat {count}', user=user)
+    tags = [Tag.objects.create(name=f'tag-{count}-{i}', user=user) for i in range(3)]
+    for i in range(count):
+        task = Task.objects.create(title=f'Task {count}-{i}', user=user, category=category)
+        task.tags.set(tags)
+
+
+def count_queries(client, url):
+    # Start every measurement with a cold token cache so auth always costs one query
+    get_token_cache().clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries), response
+
+
+@pytest.mark.django_db
+class TestTaskQueries:
+
+    def test_list_query_count_does_not_grow_with_rows(self, authenticate_client, user):
+        create_tasks(user, 2)
+        small, _ = count_queries(authenticate_client, reverse('task-list'))
+
+        create_tasks(user, 20)
+        large, response = count_queries(authenticate_client, reverse('task-list'))
+
+        assert len(response.data) == 22
+        assert large == small
+
+    def test_list_includes_category_and_tags(self, authenticate_client, user):
+        create_tasks(user, 1)
+        _, response = count_queries(authenticate_client, reverse('task-list'))
+
+        task = response.data[0]
+        assert task['category_name'] == 'Cat 1'
+        assert task['category_color'] == '#FFFFFF'
+        assert [tag['name'] for tag in task['tags']] == ['tag-1-0', 'tag-1-1', 'tag-1-2']
+
+    def test_retrieve_query_count_is_constant(self, authenticate_client, user):
+        create_tasks(user, 1)
+        task = Task.objects.get(user=user)
+        queries, response = count_queries(authenticate_client, reverse('task-detail', args=[task.id]))
+
+        assert len(response.data['tags']) == 3
+        # token auth + task/category + tags
+        assert queries == 3
+
+
+def count_write_queries(client, method, url, data):
+    get_token_cache().clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, method)(url, data, format='json')
+    assert response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED), response.data
+    # Savepoints only show up because every test runs inside a transaction
+    return len([query for query in ctx.captured_queries if 'SAVEPOINT' not in query['sql']]), response
+
+
+@pytest.mark.django_db
+class TestTaskWriteQueries:
+
+    @pytest.fixture
+    def tags(self, user):
+        return [Tag.objects.create(name=f'tag-{i:02}', user=user) for i in range(20)]
+
+    @pytest.fixture
+    def category(self, user):
+        return Category.objects.create(name='Work', user=user)
+
+    def test_create_query_count_does_not_grow_with_tags(self, authenticate_client, tags, category):
+        data = {'title': 'One tag', 'category': category.id, 'tag_ids': [tags[0].id]}
+        one, _ = count_write_queries(authenticate_client, 'post', reverse('task-list'), data)
+
+        data = {'title': 'All tags', 'category': category.id, 'tag_ids': [tag.id for tag in tags]}
+        many, response = count_write_queries(authenticate_client, 'post', reverse('task-list'), data)
+
+        assert len(response.data['tags']) == 20
+        # token auth + category + tags IN + last position + task INSERT + version bump + through INSERT
+        # + response tags
+        assert one == many == 8
+
+    def test_update_writes_only_the_tag_diff(self, authenticate_client, user, tags, category):
+        task = Task.objects.create(title='Task', user=user)
+        task.tags.set(tags[:10])
+        kept = dict(Task.tags.through.objects.filter(task=task, tag__in=tags[5:10]).values_list('tag_id', 'id'))
+
+        data = {'tag_ids': [tag.id for tag in tags[5:]], 'category': category.id}
+        queries, response = count_write_queries(
+            authenticate_client, 'patch', reverse('task-detail', args=[task.id]), data
+        )
+
+        assert [tag['name'] for tag in response.data['tags']] == [tag.name for tag in tags[5:]]
+        assert response.data['category_name'] == 'Work'
+        # Unchanged tags keep their through rows
+        assert kept == dict(Task.tags.through.objects.filter(task=task, tag__in=tags[5:10]).values_list('tag_id', 'id'))
+        # token auth + task + prefetched tags + category + tags IN + task UPDATE + version bump
+        # + through DELETE + through INSERT + response tags
+        assert queries == 10
+
+    def test_update_without_tag_changes_skips_the_through_table(self, authenticate_client, user, tags):
+        task = Task.objects.create(title='Task', user=user)
+        task.tags.set(tags)
+
+        get_token_cache().clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticate_client.patch(
+                reverse('task-detail', args=[task.id]), {'tag_ids': [tag.id for tag in reversed(tags)]}, format='json'
+            )
+
+        assert len(response.data['tags']) == 20
+        writes = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith(('INSERT', 'DELETE'))]
+        assert writes == []
+
+    def test_other_users_tags_and_categories_are_rejected(self, authenticate_client, tags):
+        other = User.objects.create_user(username='otheruser', password='password')
+        foreign_tag = Tag.objects.create(name='foreign', user=other)
+        foreign_category = Category.objects.create(name='Foreign', user=other)
+
+        response = authenticate_client.post(reverse('task-list'), {
+            'title': 'Task', 'category': foreign_category.id, 'tag_ids': [tags[0].id, foreign_tag.id],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['tag_ids'] == [f'Invalid pk "{foreign_tag.id}" - object does not exist.']
+        assert response.data['category'] == [f'Invalid pk "{foreign_category.id}" - object does not exist.']
+        assert not Task.objects.exists()
+
+    @pytest.mark.parametrize('tag_ids, error', [
+        ('1', 'Expected a list of items but got type "str".'),
+        (['abc'], 'Incorrect type. Expected pk value, received str.'),
+        ([True], 'Incorrect type. Expected pk value, received bool.'),
+    ])
+    def test_invalid_tag_ids(self, authenticate_client, tag_ids, error):
+        response = authenticate_client.post(reverse('task-list'), {'title': 'Task', 'tag_ids': tag_ids}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['tag_ids'] == [error]
@@ -0,0 +1,277 @@
+import base64
+import datetime
+import json
+import zoneinfo
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from todo_app.models import Task, TaskQuerySet, TaskRecurrence, Tag
+from todo_app.recurrence import Rule, materialize
+
+UTC = datetime.timezone.utc
+
+
+def at(*args):
+    return datetime.datetime(*args, tzinfo=UTC)
+
+
+def expand(start, end, dtstart=at(2026, 1, 1, 9), frequency='daily', **kwargs):
+    return list(Rule(1, dtstart, frequency, tz=UTC, **kwargs).between(start, end))
+
+
+def recurring(user, due_date, **rule):
+    task = Task.objects.create(title='Recurring', user=user, due_date=due_date)
+    TaskRecurrence.objects.create(task=task, **rule)
+    return task
+
+
+def occurrences(client, start, end, **params):
+    response = client.get(reverse('task-occurrences'), {'start': start.isoformat(), 'end': end.isoformat(), **params})
+    assert response.status_code == 200, response.data
+    return response.data
+
+
+class TestRule:
+
+    def test_daily_interval(self):
+        assert expand(at(2026, 1, 4), at(2026, 1, 10), interval=2) == [
+            at(2026, 1, 5, 9), at(2026, 1, 7, 9), at(2026, 1, 9, 9),
+        ]
+
+    def test_weekly_days(self):
+        # 2026-01-01 is a Thursday: Monday and Friday every other week
+        dates = expand(at(2026, 1, 1), at(2026, 1, 20), frequency='weekly', interval=2, weekdays=[4, 0])
+        assert dates == [at(2026, 1, 2, 9), at(2026, 1, 12, 9), at(2026, 1, 16, 9)]
+
+    def test_weekly_defaults_to_the_due_date_weekday(self):
+        dates = expand(at(2026, 1, 1), at(2026, 1, 20), frequency='weekly')
+        assert dates == [at(2026, 1, 1, 9), at(2026, 1, 8, 9), at(2026, 1, 15, 9)]
+
+    def test_monthly_skips_missing_days(self):
+        dates = expand(at(2026, 1, 1), at(2026, 6, 1), dtstart=at(2026, 1, 31, 9), frequency='monthly')
+        assert dates == [at(2026, 1, 31, 9), at(2026, 3, 31, 9), at(2026, 5, 31, 9)]
+
+    def test_nth_weekday_of_the_month(self):
+        second_tuesday = expand(at(2026, 1, 1), at(2026, 4, 1), frequency='monthly', weekdays=[1], week_of_month=2)
+        last_friday = expand(at(2026, 1, 1), at(2026, 4, 1), frequency='monthly', weekdays=[4], week_of_month=-1)
+
+        assert second_tuesday == [at(2026, 1, 13, 9), at(2026, 2, 10, 9), at(2026, 3, 10, 9)]
+        assert last_friday == [at(2026, 1, 30, 9), at(2026, 2, 27, 9), at(2026, 3, 27, 9)]
+
+    def test_yearly_on_february_29(self):
+        dates = expand(at(2024, 1, 1), at(2033, 1, 1), dtstart=at(2024, 2, 29, 9), frequency='yearly')
+        assert dates == [at(2024, 2, 29, 9), at(2028, 2, 29, 9), at(2032, 2, 29, 9)]
+
+    def test_until_is_inclusive(self):
+        assert expand(at(2026, 1, 1), at(2026, 2, 1), until=at(2026, 1, 3, 9)) == [
+            at(2026, 1, 1, 9), at(2026, 1, 2, 9), at(2026, 1, 3, 9),
+        ]
+
+    @pytest.mark.parametrize('rule', [
+        {'frequency': 'daily', 'interval': 3},
+        {'frequency': 'weekly', 'interval': 3, 'weekdays': [0, 3, 6]},
+        {'frequency': 'monthly', 'interval': 5},
+        {'frequency': 'monthly', 'interval': 2, 'weekdays': [2], 'week_of_month': 5},
+        {'frequency': 'yearly', 'weekdays': [3], 'week_of_month': 4},
+    ])
+    def test_jumping_to_the_window_matches_walking_from_the_start(self, rule):
+        dtstart, start, end = at(2001, 3, 7, 18, 30), at(2030, 2, 14, 12), at(2031, 2, 14)
+        walked = [date for date in expand(dtstart, end, dtstart, **rule) if date >= start]
+        assert walked
+        assert expand(start, end, dtstart, **rule) == walked
+
+    def test_keeps_the_wall_clock_time_across_dst(self):
+        madrid = zoneinfo.ZoneInfo('Europe/Madrid')
+        rule = Rule(1, datetime.datetime(2026, 3, 27, 9, tzinfo=madrid), 'daily', tz=madrid)
+        dates = list(rule.between(at(2026, 3, 27), at(2026, 3, 31)))
+
+        assert [date.astimezone(madrid).hour for date in dates] == [9, 9, 9, 9]
+        assert [date.astimezone(UTC).hour for date in dates] == [8, 8, 7, 7]
+
+    def test_includes(self):
+        rule = Rule(1, at(2026, 1, 1, 9), 'weekly', tz=UTC)
+        assert rule.includes(at(2026, 1, 8, 9))
+        assert not rule.includes(at(2026, 1, 8, 10))
+        assert not rule.includes(at(2025, 12, 25, 9))
+
+
+@pytest.mark.django_db
+class TestRecurrenceEndpoint:
+
+    def test_set_read_and_remove(self, authenticate_client, user):
+        task = Task.objects.create(title='Gym', user=user, due_date=at(2026, 1, 5, 7))
+        url = reverse('task-recurrence', args=[task.id])
+
+        response = authenticate_client.put(url, {'frequency': 'weekly', 'weekdays': [2, 0]}, format='json')
+        assert response.status_code == 201
+        assert authenticate_client.get(url).data == {
+            'frequency': 'weekly', 'interval': 1, 'weekdays': [0, 2], 'week_of_month': None, 'until': None,
+        }
+
+        response = authenticate_client.put(url, {'frequency': 'daily', 'interval': 2}, format='json')
+        assert response.status_code == 200
+        assert TaskRecurrence.objects.get(task=task).weekdays == []
+
+        assert authenticate_client.delete(url).status_code == 204
+        assert authenticate_client.get(url).status_code == 404
+
+    @pytest.mark.parametrize('due_date, rule, field', [
+        (None, {'frequency': 'daily'}, 'due_date'),
+        (at(2026, 1, 5), {'frequency': 'daily', 'weekdays': [1]}, 'weekdays'),
+        (at(2026, 1, 5), {'frequency': 'weekly', 'weekdays': [1], 'week_of_month': 2}, 'week_of_month'),
+        (at(2026, 1, 5), {'frequency': 'monthly', 'weekdays': [1, 2], 'week_of_month': 2}, 'weekdays'),
+        (at(2026, 1, 5), {'frequency': 'monthly', 'weekdays': [1], 'week_of_month': 6}, 'week_of_month'),
+        (at(2026, 1, 5), {'frequency': 'daily', 'until': '2026-01-01T00:00:00Z'}, 'until'),
+        (at(2026, 1, 5), {'frequency': 'daily', 'interval': 0}, 'interval'),
+    ])
+    def test_validation(self, authenticate_client, user, due_date, rule, field):
+        task = Task.objects.create(title='Task', user=user, due_date=due_date)
+        response = authenticate_client.put(reverse('task-recurrence', args=[task.id]), rule, format='json')
+
+        assert response.status_code == 400
+        assert field in response.data
+
+
+@pytest.mark.django_db
+class TestOccurrences:
+
+    def test_merges_one_off_tasks_and_computed_occurrences(self, authenticate_client, user):
+        series = recurring(user, at(2026, 1, 5, 9), frequency='weekly')
+        one_off = Task.objects.create(title='Dentist', user=user, due_date=at(2026, 1, 13, 10))
+        Task.objects.create(title='Later', user=user, due_date=at(2026, 3, 1))
+
+        results = occurrences(authenticate_client, at(2026, 1, 10), at(2026, 1, 27))['results']
+
+        assert [(item['id'], item['series'], item['due_date']) for item in results] == [
+            (None, series.id, '2026-01-12T09:00:00Z'),
+            (one_off.id, None, '2026-01-13T10:00:00Z'),
+            (None, series.id, '2026-01-19T09:00:00Z'),
+            (None, series.id, '2026-01-26T09:00:00Z'),
+        ]
+        assert results[0]['title'] == 'Recurring'
+        assert results[0]['occurrence_date'] == '2026-01-12T09:00:00Z'
+        assert results[0]['status'] == 'pending'
+
+    def test_cursor_pages(self, authenticate_client, user):
+        recurring(user, at(2026, 1, 1, 9), frequency='daily')
+        recurring(user, at(2026, 1, 1, 9), frequency='weekly')
+        Task.objects.bulk_create([Task(title=f'Task {i}', user=user, due_date=at(2026, 1, 1 + i, 9)) for i in range(20)])
+        start, end = at(2026, 1, 1), at(2026, 2, 1)
+        everything = occurrences(authenticate_client, start, end, limit=1000)['results']
+
+        pages, params = [], {'limit': 7}
+        while True:
+            page = occurrences(authenticate_client, start, end, **params)
+            pages += page['results']
+            if not page['next']:
+                break
+            params['cursor'] = parse_qs(urlparse(page['next']).query)['cursor'][0]
+
+        assert len(everything) == 31 + 5 + 20
+        assert pages == everything
+
+    def test_completing_an_occurrence_saves_it(self, authenticate_client, user):
+        series = recurring(user, at(2026, 1, 5, 9), frequency='weekly')
+        tag = Tag.objects.create(name='home', user=user)
+        series.tags.add(tag)
+        url = reverse('task-materialize', args=[series.id])
+
+        response = authenticate_client.post(
+            url, {'occurrence_date': '2026-01-12T09:00:00Z', 'status': 'completed'}, format='json'
+        )
+        assert response.status_code == 201
+        saved = Task.objects.get(pk=response.data['id'])
+        assert (saved.series_id, saved.occurrence_date, saved.status) == (series.id, at(2026, 1, 12, 9), 'completed')
+        assert list(saved.tags.all()) == [tag]
+
+        # Moving it keeps it in place of the computed occurrence
+        response = authenticate_client.post(
+            url, {'occurrence_date': '2026-01-12T09:00:00Z', 'due_date': '2026-01-13T18:00:00Z'}, format='json'
+        )
+        assert (response.status_code, response.data['id']) == (200, saved.id)
+
+        results = occurrences(authenticate_client, at(2026, 1, 10), at(2026, 1, 20))['results']
+        assert [(item['id'], item['due_date'], item['status']) for item in results] == [
+            (saved.id, '2026-01-13T18:00:00Z', 'completed'),
+            (None, '2026-01-19T09:00:00Z', 'pending'),
+        ]
+        assert results[0]['series'] == series.id
+        assert results[0]['occurrence_date'] == '2026-01-12T09:00:00Z'
+
+    def test_materialize_rejects_other_dates(self, authenticate_client, user):
+        series = recurring(user, at(2026, 1, 5, 9), frequency='weekly')
+        one_off = Task.objects.create(title='Once', user=user, due_date=at(2026, 1, 5, 9))
+
+        for task, date in ((series, '2026-01-13T09:00:00Z'), (series, 'soon'), (one_off, '2026-01-12T09:00:00Z')):
+            response = authenticate_client.post(
+                reverse('task-materialize', args=[task.id]), {'occurrence_date': date}, format='json'
+            )
+            assert response.status_code == 400
+        assert not Task.objects.filter(series=series).exists()
+
+    def test_materialize_after_a_concurrent_insert(self, user, monkeypatch):
+        series = recurring(user, at(2026, 1, 5, 9), frequency='weekly')
+        saved, created = materialize(series, at(2026, 1, 12, 9))
+        assert created
+
+        # The lookup ran before the other request committed its insert
+        monkeypatch.setattr(TaskQuerySet, 'first', lambda self: None)
+        task, created = materialize(series, at(2026, 1, 12, 9))
+
+        assert (task.pk, created) == (saved.pk, False)
+        # The failed insert only rolled back its savepoint
+        assert Task.objects.filter(series=series).count() == 1
+
+    def test_status_filter(self, authenticate_client, user):
+        recurring(user, at(2026, 1, 5, 9), frequency='daily')
+        done = Task.objects.create(title='Done', user=user, due_date=at(2026, 1, 6), status='completed')
+
+        completed = occurrences(authenticate_client, at(2026, 1, 5), at(2026, 1, 8), status='completed')['results']
+        pending = occurrences(authenticate_client, at(2026, 1, 5), at(2026, 1, 8), status='pending')['results']
+
+        assert [item['id'] for item in completed] == [done.id]
+        assert len(pending) == 3
+
+    def test_ended_and_archived_series_are_skipped(self, authenticate_client, user):
+        recurring(user, at(2025, 1, 5, 9), frequency='daily', until=at(2025, 12, 31))
+        archived = recurring(user, at(2025, 1, 5, 9), frequency='daily')
+        Task.objects.filter(pk=archived.pk).update(status='archived')
+
+        assert occurrences(authenticate_client, at(2026, 1, 1), at(2026, 2, 1))['results'] == []
+
+    def test_window_validation(self, authenticate_client):
+        url = reverse('task-occurrences')
+        assert authenticate_client.get(url).status_code == 400
+        assert authenticate_client.get(url, {'start': '2026-01-01T00:00:00Z', 'end': '2027-02-01T00:00:00Z'}).status_code == 400
+        assert authenticate_client.get(
+            url, {'start': '2026-01-01T00:00:00Z', 'end': '2026-02-01T00:00:00Z', 'cursor': 'nope'}
+        ).status_code == 404
+
+    def test_naive_cursor_is_rejected(self, authenticate_client, user):
+        recurring(user, at(2026, 1, 5, 9), frequency='daily')
+        cursor = base64.urlsafe_b64encode(json.dumps(['2026-01-12T09:00:00', 0]).encode()).decode()
+
+        response = authenticate_client.get(reverse('task-occurrences'), {
+            'start': '2026-01-01T00:00:00Z', 'end': '2026-02-01T00:00:00Z', 'cursor': cursor,
+        })
+
+        assert response.status_code == 404
+        assert response.data == {'detail': 'Invalid cursor'}
+
+    def test_query_count_does_not_grow_with_series(self, authenticate_client, user):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                occurrences(authenticate_client, at(2026, 1, 1), at(2027, 1, 1))
+            return len(queries)
+
+        recurring(user, at(2026, 1, 5, 9), frequency='weekly')
+        # The first request also looks up the token, later ones find it cached
+        count_queries()
+        few = count_queries()
+        for day in range(1, 29):
+            recurring(user, at(2026, 1, day, 9), frequency='monthly')
+
+        assert count_queries() == few
@@ -0,0 +1,143 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from todo_app.events import get_event_broker
+from todo_app.models import Task
+from todo_app.reminders import ReminderScheduler
+
+LEAD = datetime.timedelta(minutes=15)
+
+
+@pytest.fixture
+def batches():
+    return []
+
+
+@pytest.fixture
+def scheduler(batches):
+    def build(**kwargs):
+        return ReminderScheduler(**{'lead': LEAD, 'handler': lambda tasks: batches.append(tasks), **kwargs})
+    return build
+
+
+def due_in(user, minutes, **kwargs):
+    return Task.objects.create(
+        title=f'Due in {minutes}', user=user, due_date=timezone.now() + datetime.timedelta(minutes=minutes), **kwargs
+    )
+
+
+def sent(batches):
+    return [task.pk for batch in batches for task in batch]
+
+
+@pytest.mark.django_db
+class TestReminderScheduler:
+
+    def test_sends_open_tasks_due_within_the_lead(self, user, scheduler, batches):
+        soon = due_in(user, 10)
+        in_progress = due_in(user, 5, status='in_progress')
+        due_in(user, 10, status='completed')
+        due_in(user, 10, status='archived')
+        due_in(user, 60)
+        Task.objects.create(title='No due date', user=user)
+
+        assert scheduler().run_pending() == 2
+        assert sent(batches) == [in_progress.pk, soon.pk]
+
+    def test_restart_does_not_send_again(self, user, scheduler, batches):
+        task = due_in(user, 10)
+        scheduler().run_pending()
+
+        assert scheduler().run_pending() == 0
+        assert sent(batches) == [task.pk]
+        assert Task.objects.get(pk=task.pk).reminded_for == task.due_date
+
+    def test_tasks_added_before_the_last_one_sent(self, user, scheduler, batches):
+        later = due_in(user, 14)
+        reminders = scheduler(refill_seconds=0)
+        assert reminders.run_pending() == 1
+
+        # Both come due before the task already reminded
+        created = due_in(user, 5)
+        moved = due_in(user, 120)
+        Task.objects.filter(pk=moved.pk).update(due_date=timezone.now() + datetime.timedelta(minutes=2))
+
+        assert reminders.run_pending() == 2
+        assert sent(batches) == [later.pk, moved.pk, created.pk]
+
+    def test_workers_do_not_send_the_same_reminder(self, user, scheduler, batches):
+        task = due_in(user, 10)
+        first, second = scheduler(), scheduler()
+        first.refill()
+        second.refill()
+
+        assert first.run_pending() == 1
+        assert second.run_pending() == 0
+        assert sent(batches) == [task.pk]
+
+    def test_overdue_tasks_are_not_sent_on_the_first_start(self, user, scheduler, batches):
+        due_in(user, -10)
+        assert scheduler().run_pending() == 0
+
+    def test_sends_in_batches(self, user, scheduler, batches):
+        tasks = [due_in(user, minutes) for minutes in range(1, 6)]
+
+        assert scheduler(batch_size=2).run_pending() == 5
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert sent(batches) == [task.pk for task in tasks]
+
+    def test_later_reminders_wait_for_their_time(self, user, scheduler, batches):
+        task = due_in(user, 60)
+        reminders = scheduler(refill_seconds=3600)
+
+        assert reminders.run_pending() == 0
+        assert 44 * 60 < reminders.seconds_until_next() <= 45 * 60
+        assert reminders.run_pending(now=task.due_date - LEAD) == 1
+        # Otherwise the next refill comes first
+        assert scheduler(refill_seconds=60).seconds_until_next() <= 60
+
+    def test_skips_tasks_changed_after_they_were_queued(self, user, scheduler, batches):
+        completed, rescheduled, kept = due_in(user, 20), due_in(user, 20), due_in(user, 20)
+        reminders = scheduler()
+        reminders.run_pending()
+        Task.objects.filter(pk=completed.pk).update(status='completed')
+        Task.objects.filter(pk=rescheduled.pk).update(due_date=rescheduled.due_date + datetime.timedelta(hours=1))
+
+        assert reminders.run_pending(now=kept.due_date) == 1
+        assert sent(batches) == [kept.pk]
+        # The new due date is picked up by the next refill
+        assert scheduler().run_pending(now=rescheduled.due_date + datetime.timedelta(hours=1)) == 1
+
+    def test_reads_through_the_reminder_index(self, user):
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', user=user, due_date=timezone.now() + datetime.timedelta(minutes=i),
+                 status=['pending', 'completed'][i % 2])
+            for i in range(500)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        assert 'task_reminder_due_idx' in ReminderScheduler(batch_size=100).upcoming().explain()
+
+
+@pytest.mark.django_db
+def test_reminders_are_published_after_commit(user, monkeypatch, django_capture_on_commit_callbacks):
+    events = []
+    monkeypatch.setattr(get_event_broker(), 'publish', lambda user_id, event: events.append((user_id, event)))
+    task = due_in(user, 5)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ReminderScheduler(lead=LEAD).run_pending()
+
+    assert (user.id, {'type': 'task.reminder', 'id': task.pk, 'due_date': task.due_date.isoformat()}) in events
+
+
+@pytest.mark.django_db
+def test_run_reminders_once(user, capsys):
+    due_in(user, 5)
+    call_command('run_reminders', '--once', '--lead-minutes', '15')
+    call_command('run_reminders', '--once')
+
+    assert capsys.readouterr().out == 'Sent 1 reminders.\nSent 0 reminders.\n'
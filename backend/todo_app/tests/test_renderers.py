@@ -0,0 +1,130 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from taskmaster_project import parsers, renderers
+from taskmaster_project.parsers import ORJSONParser
+from taskmaster_project.renderers import ORJSONRenderer
+from todo_app.models import Task
+
+PAYLOAD = {
+    'text': 'Ñandú ✅ "quoted" \\ \n    ',
+    'int': 42,
+    'float': 0.1,
+    'bool': True,
+    'none': None,
+    'aware': datetime.datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'offset': datetime.datetime(2025, 3, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-3))),
+    'naive': datetime.datetime(2025, 3, 1, 12, 30),
+    'date': datetime.date(2025, 3, 1),
+    'time': datetime.time(8, 15),
+    'delta': datetime.timedelta(minutes=90),
+    'decimal': decimal.Decimal('1.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('lazy text'),
+    'nested': [{'a': [1, 2, {'b': None}]}, (3, 4)],
+    1: 'int key',
+}
+
+
+@pytest.fixture
+def without_orjson(monkeypatch):
+    monkeypatch.setattr(renderers, 'orjson', None)
+    monkeypatch.setattr(parsers, 'orjson', None)
+
+
+def parse(parser, body):
+    return parser.parse(io.BytesIO(body), parser_context={})
+
+
+class TestORJSONRenderer:
+
+    @pytest.mark.parametrize('data', [
+        PAYLOAD,
+        ReturnDict(PAYLOAD, serializer=None),
+        [PAYLOAD, PAYLOAD],
+        'plain string',
+        [],
+    ])
+    def test_matches_json_renderer(self, data):
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_uses_orjson(self, monkeypatch):
+        monkeypatch.setattr(JSONRenderer, 'render', lambda *args, **kwargs: pytest.fail('fell back'))
+        ORJSONRenderer().render(PAYLOAD)
+
+    def test_falls_back_for_big_ints(self):
+        assert ORJSONRenderer().render({'big': 2 ** 70}) == b'{"big":1180591620717411303424}'
+
+    def test_empty_data(self):
+        assert ORJSONRenderer().render(None) == b''
+
+    @pytest.mark.parametrize('media_type, context', [
+        ('application/json; indent=4', None),
+        ('application/json', {'indent': 2}),
+    ])
+    def test_indented_output(self, media_type, context):
+        rendered = ORJSONRenderer().render(PAYLOAD, media_type, context)
+        assert rendered == JSONRenderer().render(PAYLOAD, media_type, context)
+
+    def test_unsupported_types_raise_like_json_renderer(self):
+        with pytest.raises(TypeError):
+            ORJSONRenderer().render({'obj': object()})
+
+    def test_falls_back_without_orjson(self, without_orjson):
+        assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+class TestORJSONParser:
+
+    def test_parses_like_json_parser(self):
+        body = JSONRenderer().render({'title': 'Ñandú ✅', 'tags': [1, 2], 'due': None, 'score': 1.5})
+        assert parse(ORJSONParser(), body) == parse(JSONParser(), body)
+
+    @pytest.mark.parametrize('body', [b'{"title": ', b'{"a": NaN}', b'\xff'])
+    def test_invalid_json_raises_parse_error(self, body):
+        with pytest.raises(ParseError) as orjson_error:
+            parse(ORJSONParser(), body)
+        with pytest.raises(ParseError) as json_error:
+            parse(JSONParser(), body)
+        assert str(orjson_error.value) == str(json_error.value)
+
+    def test_accepts_what_json_parser_accepts(self):
+        body = b'{"text": "\\ud800"}'
+        assert parse(ORJSONParser(), body) == {'text': '\ud800'}
+
+    @pytest.mark.parametrize('number', [
+        123456789012345678901234567890, 2 ** 64, -2 ** 63 - 1, 2 ** 64 - 1, -2 ** 63,
+    ])
+    def test_keeps_big_integers_exact(self, number):
+        parsed = parse(ORJSONParser(), b'{"a": %d}' % number)
+        assert parsed == {'a': number}
+        assert type(parsed['a']) is int
+
+    def test_falls_back_without_orjson(self, without_orjson):
+        assert parse(ORJSONParser(), b'{"a": [1, 2]}') == {'a': [1, 2]}
+
+
+@pytest.mark.django_db
+class TestJSONEndpoints:
+
+    def test_round_trip_through_the_api(self, authenticate_client, user):
+        response = authenticate_client.post(
+            reverse('task-list'),
+            data=JSONRenderer().render({'title': 'Comprar café ☕', 'priority': 'high'}),
+            content_type='application/json',
+        )
+        assert response.status_code == 201
+
+        response = authenticate_client.get(reverse('task-list'))
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data)
+        assert Task.objects.get(user=user).title == 'Comprar café ☕'
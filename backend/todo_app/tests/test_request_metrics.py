@@ -0,0 +1,168 @@
+import json
+import logging
+import re
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from todo_app.models import Task
+from taskmaster_project.metrics import registry
+from users.authentication import get_token_cache
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+
+
+@pytest.fixture
+def admin_client():
+    admin = User.objects.create_user(username='admin', password='adminpassword123', is_staff=True)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=admin).key}')
+    return client
+
+
+@pytest.fixture
+def debug(settings):
+    settings.DEBUG = True
+
+
+def server_timing(response):
+    return {
+        match['name']: (float(match['dur']), match['desc'])
+        for match in re.finditer(r'(?P<name>\w+);dur=(?P<dur>[\d.]+)(?:;desc="(?P<desc>[^"]*)")?', response['Server-Timing'])
+    }
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+
+    def test_server_timing_header(self, debug, authenticate_client, user):
+        Task.objects.create(title='Task', user=user)
+        get_token_cache().clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticate_client.get(reverse('task-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        timing = server_timing(response)
+        assert set(timing) == {'db', 'app', 'render', 'total'}
+        assert timing['db'][1] == f'{len(queries)} queries'
+        assert timing['total'][0] >= timing['db'][0]
+
+    def test_render_is_timed_on_its_own(self, debug, authenticate_client, monkeypatch):
+        rendered_content = Response.rendered_content
+
+        def slow_render(response):
+            time.sleep(0.05)
+            return rendered_content.fget(response)
+
+        monkeypatch.setattr(Response, 'rendered_content', property(slow_render))
+
+        timing = server_timing(authenticate_client.get(reverse('task-list')))
+
+        assert timing['render'][1] == 'renderer'
+        assert timing['render'][0] >= 50
+        assert timing['app'][0] < 50
+
+    def test_server_timing_is_for_staff_only(self, authenticate_client, admin_client):
+        assert 'Server-Timing' not in authenticate_client.get(reverse('task-list'))
+        assert 'Server-Timing' in admin_client.get(reverse('task-list'))
+
+    def test_histogram_per_endpoint(self, authenticate_client, admin_client):
+        for _ in range(3):
+            authenticate_client.get(reverse('task-list'))
+        authenticate_client.get(reverse('category-list'))
+
+        response = admin_client.get(reverse('request-metrics'))
+
+        assert response.status_code == status.HTTP_200_OK
+        endpoints = {row['endpoint']: row for row in response.data['endpoints']}
+        tasks = endpoints['GET task-list']
+        assert tasks['count'] == 3
+        assert sum(tasks['buckets']) == 3
+        assert len(tasks['buckets']) == len(response.data['buckets_ms']) + 1
+        assert tasks['p50_ms'] in response.data['buckets_ms']
+        assert endpoints['GET category-list']['count'] == 1
+
+    def test_histogram_is_admin_only(self, authenticate_client):
+        response = authenticate_client.get(reverse('request-metrics'))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_reset_histogram(self, authenticate_client, admin_client):
+        authenticate_client.get(reverse('task-list'))
+
+        response = admin_client.delete(reverse('request-metrics'))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        endpoints = [row['endpoint'] for row in admin_client.get(reverse('request-metrics')).data['endpoints']]
+        # The DELETE is recorded once its response is ready, after the reset
+        assert endpoints == ['DELETE request-metrics']
+
+    def test_slow_request_log(self, settings, token, user, caplog):
+        settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'SLOW_REQUEST_MS': 0}
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+        logger = logging.getLogger('taskmaster_project.requests')
+        logger.addHandler(caplog.handler)
+        try:
+            client.get(reverse('task-list'), {'status': 'pending'})
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        fields = caplog.records[-1].request_metrics
+        assert fields['endpoint'] == 'GET task-list'
+        assert fields['path'] == '/api/v1/tasks/'
+        assert fields['status'] == 200
+        assert fields['user_id'] == user.pk
+        assert json.loads(caplog.records[-1].getMessage().split(' ', 2)[2]) == fields
+
+    def test_fast_requests_are_not_logged(self, settings, authenticate_client, caplog):
+        settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'SLOW_REQUEST_MS': 60000}
+        logger = logging.getLogger('taskmaster_project.requests')
+        logger.addHandler(caplog.handler)
+        try:
+            authenticate_client.get(reverse('task-list'))
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert not caplog.records
+
+    def test_disabled(self, settings, token):
+        settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'ENABLED': False}
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+        response = client.get(reverse('task-list'))
+
+        assert 'Server-Timing' not in response
+        assert registry.snapshot()['endpoints'] == []
+
+
+@pytest.mark.django_db
+class TestAsyncRequestMetrics:
+
+    def test_queries_under_asgi_are_counted(self, debug, token, user):
+        Task.objects.create(title='Task', user=user)
+        get_token_cache().clear()
+
+        # The sync view runs through sync_to_async, on this thread under async_to_sync
+        with CaptureQueriesContext(connection) as queries:
+            response = async_to_sync(AsyncClient().get)('/api/v1/tasks/', headers={'authorization': f'Token {token}'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert server_timing(response)['db'][1] == f'{len(queries)} queries'
+        assert len(queries) > 0
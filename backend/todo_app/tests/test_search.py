@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.models import Task
+from todo_app.search import SQLITE_FTS_TABLE, ensure_sqlite_triggers
+
+User = get_user_model()
+
+
+def search(client, term, **params):
+    response = client.get(reverse('task-list'), {'search': term, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+def titles(data):
+    return [task['title'] for task in data]
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+
+    def test_prefix_matching(self, authenticate_client, user):
+        Task.objects.create(title='Buy milk', user=user)
+        Task.objects.create(title='Call mom', user=user)
+
+        assert titles(search(authenticate_client, 'mil')) == ['Buy milk']
+
+    def test_every_word_must_match(self, authenticate_client, user):
+        Task.objects.create(title='Buy milk', description='at the corner store', user=user)
+        Task.objects.create(title='Buy bread', user=user)
+
+        assert titles(search(authenticate_client, 'buy corner')) == ['Buy milk']
+
+    def test_title_matches_rank_first(self, authenticate_client, user):
+        Task.objects.create(title='Groceries', description='remember the report', user=user, priority='high')
+        Task.objects.create(title='Quarterly report', user=user, priority='low')
+
+        assert titles(search(authenticate_client, 'report')) == ['Quarterly report', 'Groceries']
+
+    def test_explicit_ordering_wins_over_rank(self, authenticate_client, user):
+        Task.objects.create(title='B report', user=user)
+        Task.objects.create(title='A thing', description='report', user=user)
+
+        assert titles(search(authenticate_client, 'report', ordering='title')) == ['A thing', 'B report']
+
+    def test_index_follows_updates_and_deletes(self, authenticate_client, user):
+        task = Task.objects.create(title='Old title', user=user)
+        gone = Task.objects.create(title='Old news', user=user)
+
+        task.title = 'New title'
+        task.save()
+        Task.objects.filter(pk=task.pk).update(description='fresh')
+        gone.delete()
+
+        assert titles(search(authenticate_client, 'old')) == []
+        assert titles(search(authenticate_client, 'fresh')) == ['New title']
+
+    def test_only_own_tasks(self, authenticate_client, user):
+        other = User.objects.create_user(username='otheruser', password='password')
+        Task.objects.create(title='Secret plan', user=other)
+
+        assert search(authenticate_client, 'secret') == []
+
+    def test_punctuation_is_ignored(self, authenticate_client, user):
+        Task.objects.create(title='Fix "quotes" bug', user=user)
+
+        assert titles(search(authenticate_client, '"quotes*')) == ['Fix "quotes" bug']
+        assert len(search(authenticate_client, '*** ""')) == 1
+
+    def test_paginated_search_follows_rank(self, authenticate_client, user):
+        for i in range(7):
+            Task.objects.create(title=f'Report {i}', description='report ' * i, user=user)
+
+        ids = []
+        response = authenticate_client.get(reverse('task-list'), {'search': 'report', 'page_size': 3})
+        while True:
+            ids.extend(task['id'] for task in response.data['results'])
+            if response.data['next'] is None:
+                break
+            response = authenticate_client.get(response.data['next'])
+
+        assert ids == [task['id'] for task in search(authenticate_client, 'report')]
+        assert len(ids) == 7
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='SQLite FTS5 triggers')
+    def test_sqlite_triggers_are_restored(self, authenticate_client, user):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {SQLITE_FTS_TABLE}_ai')
+        ensure_sqlite_triggers(connection)
+
+        Task.objects.create(title='After migrate', user=user)
+
+        assert titles(search(authenticate_client, 'after')) == ['After migrate']
@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from todo_app.models import Category, Tag, Task
+from todo_app.seeding import seed_benchmark_data
+
+User = get_user_model()
+
+
+def snapshot():
+    return list(
+        Task.objects.order_by('id').values_list('title', 'status', 'priority', 'category__name', 'user__username')
+    )
+
+
+@pytest.mark.django_db
+class TestSeedBenchmarkData:
+
+    def test_creates_users_with_tasks(self):
+        call_command('seed_benchmark_data', users=3, tasks=200, categories=4, tags=6, stdout=StringIO())
+
+        users = User.objects.filter(username__startswith='bench')
+        assert users.count() == 3
+        for user in users:
+            assert Task.objects.filter(user=user).count() == 200
+            assert Category.objects.filter(user=user).count() == 4
+            assert Tag.objects.filter(user=user).count() == 6
+            assert user.check_password('bench-password')
+
+    def test_distributions(self):
+        seed_benchmark_data(users=1, tasks=1000)
+        tasks = Task.objects.all()
+
+        statuses = {status: tasks.filter(status=status).count() for status, _ in Task.STATUS_CHOICES}
+        assert statuses['pending'] > statuses['completed'] > statuses['in_progress'] > statuses['archived'] > 0
+        assert 200 < tasks.filter(due_date__isnull=True).count() < 500
+        assert tasks.filter(category__isnull=True).count() < 300
+        # Tags are skewed: the first tag is used far more than the last one
+        first, *_, last = Tag.objects.order_by('id')
+        assert first.tasks.count() > 3 * last.tasks.count()
+        # Tags are only attached to tasks of the same user
+        assert not Task.tags.through.objects.exclude(tag__user=F('task__user')).exists()
+
+    def test_same_seed_same_data(self):
+        seed_benchmark_data(users=2, tasks=50, seed=7)
+        first = snapshot()
+        User.objects.all().delete()
+        seed_benchmark_data(users=2, tasks=50, seed=7)
+
+        assert snapshot() == first
+
+    def test_existing_users_need_reset(self):
+        call_command('seed_benchmark_data', users=1, tasks=5, stdout=StringIO())
+
+        with pytest.raises(CommandError):
+            call_command('seed_benchmark_data', users=1, tasks=5, stdout=StringIO())
+
+        call_command('seed_benchmark_data', users=1, tasks=10, reset=True, stdout=StringIO())
+        assert Task.objects.count() == 10
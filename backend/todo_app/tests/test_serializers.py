@@ -0,0 +1,55 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from todo_app.models import Task, Category, Tag
+from todo_app.serializers import TaskSerializer, TaskReadSerializer
+
+
+@pytest.fixture
+def tasks(user):
+    category = Category.objects.create(name='Trabajo', color='#00FF00', user=user)
+    tags = [Tag.objects.create(name=name, user=user) for name in ['zeta', 'año', 'alpha']]
+    due = timezone.now().replace(microsecond=123456)
+
+    with_everything = Task.objects.create(
+        title='Revisar "informe" ✅', description='línea 1\nlínea 2', status='in_progress',
+        priority='high', due_date=due, category=category, user=user,
+    )
+    with_everything.tags.set(tags)
+    Task.objects.create(title='Bare', user=user)
+    Task.objects.create(title='Whole second', due_date=due.replace(microsecond=0), user=user)
+    return Task.objects.for_user(user).with_related()
+
+
+def render(serializer_class, queryset, **kwargs):
+    return JSONRenderer().render(serializer_class(queryset, **kwargs).data)
+
+
+@pytest.mark.django_db
+class TestTaskReadSerializer:
+
+    def test_matches_task_serializer_byte_for_byte(self, tasks):
+        assert render(TaskReadSerializer, tasks, many=True) == render(TaskSerializer, tasks, many=True)
+
+    def test_matches_in_other_timezone(self, tasks):
+        with timezone.override(datetime.timezone(datetime.timedelta(hours=-3))):
+            assert render(TaskReadSerializer, tasks, many=True) == render(TaskSerializer, tasks, many=True)
+
+    def test_single_instance(self, tasks):
+        task = tasks.get(title='Bare')
+        assert render(TaskReadSerializer, task) == render(TaskSerializer, task)
+
+    def test_views_use_it_only_for_reads(self, authenticate_client, tasks):
+        task = tasks.get(title='Bare')
+
+        list_response = authenticate_client.get(reverse('task-list'))
+        detail_response = authenticate_client.get(reverse('task-detail', args=[task.id]))
+        assert list_response.content == render(TaskSerializer, tasks, many=True)
+        assert detail_response.content == render(TaskSerializer, task)
+
+        response = authenticate_client.patch(reverse('task-detail', args=[task.id]), {'title': 'Renamed'}, format='json')
+        assert response.status_code == 200
+        assert response.data['title'] == 'Renamed'
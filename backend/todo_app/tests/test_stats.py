@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Category, Tag
+from users.authentication import get_token_cache
+
+User = get_user_model()
+
+
+def get_stats(client):
+    get_token_cache().clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse('task-stats'))
+    assert response.status_code == status.HTTP_200_OK
+    return response.data, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestTaskStats:
+
+    def test_aggregates(self, authenticate_client, user, monkeypatch):
+        # A Wednesday: the week ends on Monday 2026-10-19 00:00 UTC
+        now = datetime.datetime(2026, 10, 14, 12, 0, tzinfo=datetime.timezone.utc)
+        monkeypatch.setattr(timezone, 'now', lambda: now)
+        work = Category.objects.create(name='Work', color='#FF0000', user=user)
+        urgent = Tag.objects.create(name='urgent', user=user)
+        unused = Tag.objects.create(name='unused', user=user)
+
+        overdue = Task.objects.create(title='Late', user=user, category=work, priority='high',
+                                      due_date=now - datetime.timedelta(days=1))
+        overdue.tags.add(urgent)
+        Task.objects.create(title='Late but done', user=user, status='completed',
+                            due_date=now - datetime.timedelta(days=1))
+        Task.objects.create(title='Soon', user=user, category=work, status='in_progress',
+                            due_date=now + datetime.timedelta(minutes=1))
+        Task.objects.create(title='Sunday night', user=user, priority='low',
+                            due_date=datetime.datetime(2026, 10, 18, 23, 59, tzinfo=datetime.timezone.utc))
+        Task.objects.create(title='Next Monday', user=user, priority='low',
+                            due_date=datetime.datetime(2026, 10, 19, tzinfo=datetime.timezone.utc))
+        Task.objects.create(title='Archived this week', user=user, status='archived',
+                            due_date=now + datetime.timedelta(days=1))
+        Task.objects.create(title='Someday', user=user)
+        Task.objects.create(title='Not mine', user=User.objects.create_user(username='other', password='x'),
+                            due_date=now + datetime.timedelta(days=1))
+
+        data, _ = get_stats(authenticate_client)
+
+        assert data['total'] == 7
+        assert data['by_status'] == {'pending': 4, 'in_progress': 1, 'completed': 1, 'archived': 1}
+        assert data['by_priority'] == {'low': 2, 'medium': 4, 'high': 1}
+        assert data['by_status_priority'] == [
+            {'status': 'archived', 'priority': 'medium', 'count': 1},
+            {'status': 'completed', 'priority': 'medium', 'count': 1},
+            {'status': 'in_progress', 'priority': 'medium', 'count': 1},
+            {'status': 'pending', 'priority': 'high', 'count': 1},
+            {'status': 'pending', 'priority': 'low', 'count': 2},
+            {'status': 'pending', 'priority': 'medium', 'count': 1},
+        ]
+        # Where the NULL name sorts depends on the database
+        assert sorted(data['by_category'], key=lambda row: row['id'] or 0) == [
+            {'id': None, 'name': None, 'color': None, 'count': 5},
+            {'id': work.id, 'name': 'Work', 'color': '#FF0000', 'count': 2},
+        ]
+        assert data['by_tag'] == [
+            {'id': unused.id, 'name': 'unused', 'count': 0},
+            {'id': urgent.id, 'name': 'urgent', 'count': 1},
+        ]
+        # Open tasks only: not the completed or archived ones, nor other users'
+        assert data['overdue'] == 1
+        # Soon and Sunday night; Next Monday falls in the next week
+        assert data['due_this_week'] == 2
+
+    def test_grouped_stats_are_cached_until_next_write(self, authenticate_client, user):
+        Task.objects.create(title='Task 1', user=user)
+        _, cold = get_stats(authenticate_client)
+
+        data, warm = get_stats(authenticate_client)
+        assert data['total'] == 1
+        # auth + collection version + due-date aggregate
+        assert warm == 3
+        assert cold > warm
+
+        Task.objects.create(title='Task 2', user=user)
+        data, _ = get_stats(authenticate_client)
+        assert data['total'] == 2
+
+    def test_query_count_does_not_grow_with_tasks(self, authenticate_client, user):
+        category = Category.objects.create(name='Work', user=user)
+        Task.objects.create(title='Task', user=user, category=category)
+        _, few = get_stats(authenticate_client)
+
+        for i in range(20):
+            Task.objects.create(title=f'Task {i}', user=user, category=category, priority='high')
+        _, many = get_stats(authenticate_client)
+
+        assert few == many
@@ -0,0 +1,193 @@
+import base64
+import datetime
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Category, Tag, TaskTombstone
+
+User = get_user_model()
+
+
+def changes(client, since=None, **params):
+    if since:
+        params['since'] = since
+    response = client.get(reverse('task-changes'), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+def watermark_for(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.fixture
+def no_commit_window(settings):
+    # Exact diffs: nothing is sent again for writes that could still be committing
+    settings.SYNC_COMMIT_WINDOW_SECONDS = 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('no_commit_window')
+class TestTaskChanges:
+
+    def test_full_sync_then_only_new_changes(self, authenticate_client, user):
+        first = Task.objects.create(title='Task 1', user=user)
+        Task.objects.create(title='Task 2', user=user)
+
+        data = changes(authenticate_client)
+        assert [task['title'] for task in data['changes']] == ['Task 1', 'Task 2']
+        assert data['deleted'] == []
+
+        data = changes(authenticate_client, data['watermark'])
+        assert data['changes'] == []
+
+        first.title = 'Task 1 edited'
+        first.save()
+        Task.objects.create(title='Task 3', user=user)
+
+        data = changes(authenticate_client, data['watermark'])
+        assert [task['title'] for task in data['changes']] == ['Task 1 edited', 'Task 3']
+
+    def test_deleted_tasks_are_reported(self, authenticate_client, user):
+        task = Task.objects.create(title='Task 1', user=user)
+        watermark = changes(authenticate_client)['watermark']
+
+        authenticate_client.delete(reverse('task-detail', args=[task.id]))
+
+        data = changes(authenticate_client, watermark)
+        assert data['changes'] == []
+        assert data['deleted'] == [task.id]
+        assert changes(authenticate_client, data['watermark'])['deleted'] == []
+
+    def test_pages_with_has_more(self, authenticate_client, user):
+        for i in range(5):
+            Task.objects.create(title=f'Task {i}', user=user)
+
+        seen, watermark, has_more = [], None, True
+        while has_more:
+            data = changes(authenticate_client, watermark, limit=2)
+            seen.extend(task['title'] for task in data['changes'])
+            watermark, has_more = data['watermark'], data['has_more']
+
+        assert seen == [f'Task {i}' for i in range(5)]
+
+    def test_category_and_tag_changes_resend_tasks(self, authenticate_client, user):
+        category = Category.objects.create(name='Work', user=user)
+        tag = Tag.objects.create(name='urgent', user=user)
+        with_category = Task.objects.create(title='With category', user=user, category=category)
+        with_tag = Task.objects.create(title='With tag', user=user)
+        with_tag.tags.add(tag)
+        watermark = changes(authenticate_client)['watermark']
+
+        category.name = 'Office'
+        category.save()
+        tag.delete()
+
+        data = changes(authenticate_client, watermark)
+        assert {task['id'] for task in data['changes']} == {with_category.id, with_tag.id}
+
+    def test_bulk_delete_records_tombstones(self, authenticate_client, user):
+        tasks = [Task.objects.create(title=f'Task {i}', user=user) for i in range(3)]
+        watermark = changes(authenticate_client)['watermark']
+
+        authenticate_client.post(reverse('task-bulk'), {
+            'operations': [{'op': 'delete', 'id': task.id} for task in tasks]
+        }, format='json')
+
+        assert sorted(changes(authenticate_client, watermark)['deleted']) == [task.id for task in tasks]
+
+    def test_only_own_changes(self, authenticate_client):
+        other = User.objects.create_user(username='otheruser', password='password')
+        task = Task.objects.create(title='Not mine', user=other)
+        watermark = changes(authenticate_client)['watermark']
+        task.delete()
+
+        data = changes(authenticate_client, watermark)
+        assert data['changes'] == []
+        assert data['deleted'] == []
+
+    def test_invalid_watermark(self, authenticate_client):
+        response = authenticate_client.get(reverse('task-changes'), {'since': 'garbage'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_expired_watermark(self, authenticate_client, settings):
+        watermark = changes(authenticate_client)['watermark']
+        settings.SYNC_TOMBSTONE_RETENTION_DAYS = -1
+
+        response = authenticate_client.get(reverse('task-changes'), {'since': watermark})
+
+        assert response.status_code == status.HTTP_410_GONE
+
+    def test_naive_watermark_dates_are_invalid(self, authenticate_client):
+        for payload in (
+            {'t': None, 'i': 0, 'd': 0, 'ts': '2026-01-01T00:00:00'},
+            {'t': '2026-01-01T00:00:00', 'i': 0, 'd': 0, 'ts': timezone.now().isoformat()},
+        ):
+            response = authenticate_client.get(reverse('task-changes'), {'since': watermark_for(payload)})
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_prune_tombstones(self, user):
+        task = Task.objects.create(title='Task 1', user=user)
+        task.delete()
+        TaskTombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(days=31))
+
+        call_command('prune_tombstones', days=30)
+
+        assert not TaskTombstone.objects.exists()
+
+
+@pytest.mark.django_db
+class TestLateCommits:
+
+    def test_write_committed_behind_the_watermark_is_sent(self, authenticate_client, user):
+        Task.objects.create(title='Task 1', user=user)
+        watermark = changes(authenticate_client)['watermark']
+
+        # Its updated_at was taken before the sync above, but it commits after it
+        late = Task.objects.create(title='Late', user=user)
+        Task.objects.filter(pk=late.pk).update(updated_at=timezone.now() - datetime.timedelta(seconds=10))
+
+        data = changes(authenticate_client, watermark)
+        assert 'Late' in [task['title'] for task in data['changes']]
+
+    def test_recent_changes_are_sent_again_until_settled(self, authenticate_client, user, settings):
+        task = Task.objects.create(title='Task 1', user=user)
+        data = changes(authenticate_client)
+
+        assert [change['id'] for change in changes(authenticate_client, data['watermark'])['changes']] == [task.id]
+
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - datetime.timedelta(minutes=5))
+        data = changes(authenticate_client, data['watermark'])
+        assert changes(authenticate_client, data['watermark'])['changes'] == []
+
+    def test_late_deletion_is_sent(self, authenticate_client, user):
+        task = Task.objects.create(title='Task 1', user=user)
+        task_id = task.id
+        watermark = changes(authenticate_client)['watermark']
+        task.delete()
+        data = changes(authenticate_client, watermark)
+        assert data['deleted'] == [task_id]
+
+        # Still inside the window: sent again, older tombstones are not
+        assert changes(authenticate_client, data['watermark'])['deleted'] == [task_id]
+        TaskTombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(minutes=5))
+        data = changes(authenticate_client, data['watermark'])
+        assert changes(authenticate_client, data['watermark'])['deleted'] == []
+
+    def test_paging_progresses_inside_the_window(self, authenticate_client, user):
+        for i in range(5):
+            Task.objects.create(title=f'Task {i}', user=user)
+
+        seen, watermark, has_more = [], None, True
+        while has_more:
+            data = changes(authenticate_client, watermark, limit=2)
+            seen.extend(task['title'] for task in data['changes'])
+            watermark, has_more = data['watermark'], data['has_more']
+
+        assert seen == [f'Task {i}' for i in range(5)]
@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from todo_app.models import Task, Tag
+
+User = get_user_model()
+
+
+@pytest.fixture
+def tags(user):
+    return {name: Tag.objects.create(name=name, user=user) for name in ['home', 'urgent', 'work']}
+
+
+@pytest.fixture
+def tasks(user, tags):
+    layout = {
+        'Home only': ['home'],
+        'Home and urgent': ['home', 'urgent'],
+        'Everything': ['home', 'urgent', 'work'],
+        'Urgent work': ['urgent', 'work'],
+        'Untagged': [],
+    }
+    for title, names in layout.items():
+        task = Task.objects.create(title=title, user=user, status='completed' if 'work' in names else 'pending')
+        task.tags.set([tags[name] for name in names])
+
+
+def ids(*tags):
+    return ','.join(str(tag.pk) for tag in tags)
+
+
+def titles(client, **params):
+    response = client.get(reverse('task-list'), params)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data['results'] if 'results' in response.data else response.data
+    return sorted(task['title'] for task in data)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('tasks')
+class TestTagFilter:
+
+    def test_any_is_the_default(self, authenticate_client, tags):
+        assert titles(authenticate_client, tags=ids(tags['home'], tags['work'])) == [
+            'Everything', 'Home and urgent', 'Home only', 'Urgent work',
+        ]
+        assert titles(authenticate_client, tags=ids(tags['work']), tags_mode='any') == ['Everything', 'Urgent work']
+
+    def test_all(self, authenticate_client, tags):
+        assert titles(authenticate_client, tags=ids(tags['home'], tags['urgent']), tags_mode='all') == [
+            'Everything', 'Home and urgent',
+        ]
+        assert titles(authenticate_client, tags=ids(*tags.values()), tags_mode='all') == ['Everything']
+
+    def test_all_ignores_repeated_ids(self, authenticate_client, tags):
+        tag_ids = ids(tags['home'], tags['urgent'], tags['home'])
+
+        assert titles(authenticate_client, tags=tag_ids, tags_mode='all') == ['Everything', 'Home and urgent']
+
+    def test_none(self, authenticate_client, tags):
+        assert titles(authenticate_client, tags=ids(tags['home']), tags_mode='none') == ['Untagged', 'Urgent work']
+
+    def test_mode_without_tags_does_nothing(self, authenticate_client):
+        assert len(titles(authenticate_client, tags_mode='all')) == 5
+
+    def test_composes_with_other_filters_and_pagination(self, authenticate_client, tags):
+        assert titles(authenticate_client, tags=ids(tags['urgent']), status='pending') == ['Home and urgent']
+
+        response = authenticate_client.get(reverse('task-list'), {'tags': ids(tags['urgent']), 'page_size': 2})
+        seen = [task['title'] for task in response.data['results']]
+        seen += [task['title'] for task in authenticate_client.get(response.data['next']).data['results']]
+        assert sorted(seen) == ['Everything', 'Home and urgent', 'Urgent work']
+
+    def test_composes_with_search(self, authenticate_client, tags):
+        assert titles(authenticate_client, tags=ids(tags['urgent']), search='work') == ['Urgent work']
+
+    def test_other_users_tags_match_nothing(self, authenticate_client):
+        other = User.objects.create_user(username='otheruser', password='password')
+        foreign = Tag.objects.create(name='home', user=other)
+        Task.objects.create(title='Not mine', user=other).tags.add(foreign)
+
+        assert titles(authenticate_client, tags=ids(foreign)) == []
+
+    @pytest.mark.parametrize('mode', ['any', 'all', 'none'])
+    def test_no_through_table_join_or_distinct(self, authenticate_client, tags, mode):
+        with CaptureQueriesContext(connection) as queries:
+            authenticate_client.get(reverse('task-list'), {'tags': ids(tags['home'], tags['urgent']), 'tags_mode': mode})
+
+        sql = next(query['sql'] for query in queries if 'todo_app_task_tags' in query['sql'])
+        outer = sql.split('(SELECT')[0]
+        assert 'DISTINCT' not in sql
+        assert 'todo_app_task_tags' not in outer
+
+    @pytest.mark.parametrize('params', [
+        {'tags': 'abc'},
+        {'tags': '1,two'},
+        {'tags': '1.5'},
+        {'tags': '1', 'tags_mode': 'some'},
+        {'tags': ','.join(str(i) for i in range(1, 102))},
+    ])
+    def test_invalid_input(self, authenticate_client, params):
+        response = authenticate_client.get(reverse('task-list'), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) <= {'tags', 'tags_mode'}
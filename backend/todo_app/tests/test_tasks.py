@@ -104,4 +104,22 @@ class TestTasks:
         assert task.title == updated_data['title']
         assert task.description == updated_data['description']
         assert task.status == updated_data['status']
-        
\ No newline at end of file
+        
+    def test_list_tasks_ordered_by_priority_rank(self, authenticate_client, create_user):
+        client = authenticate_client
+        for priority in ['medium', 'low', 'high']:
+            Task.objects.create(title=f'{priority} task', priority=priority, user=create_user)
+
+        url = reverse('task-list')
+        response = client.get(url)
+        assert [task['priority'] for task in response.data] == ['high', 'medium', 'low']
+
+        response = client.get(url, {'ordering': 'priority'})
+        assert [task['priority'] for task in response.data] == ['low', 'medium', 'high']
+
+    def test_priority_rank_follows_queryset_updates(self, create_user):
+        task = Task.objects.create(title='Task', priority='low', user=create_user)
+        Task.objects.filter(pk=task.pk).update(priority='high')
+
+        task.refresh_from_db()
+        assert task.priority_rank == Task.PRIORITY_RANKS['high']
@@ -1,14 +1,42 @@
+import base64
+import binascii
+import json
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.fields import DateTimeField
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Task, Category, Tag
-from .serializers import TaskSerializer, CategorySerializer, TagSerializer
+from .models import Task, TaskRecurrence, Category, Tag
+from .serializers import (
+    TaskSerializer, TaskReadSerializer, CategorySerializer, TagSerializer, BulkTaskSerializer,
+    TaskOccurrenceSerializer, OccurrenceWindowSerializer, TaskRecurrenceSerializer, TaskMoveSerializer,
+)
+from .pagination import KeysetPagination
+from .recurrence import get_occurrences, get_rule, materialize
+from .positions import InvalidMove, bottom_keys, move_task
+from .bulk import BulkTaskOperations
+from .export import CSVRenderer, NDJSONRenderer, aexport_tasks, export_tasks
+from .importer import IMPORT_FORMATS, InvalidImportFile, TaskImporter
+from .caching import CollectionCacheMixin
+from .filters import TaskFilterSet, TaskOrderingFilter
+from .search import TaskSearchFilter
+from .stats import get_task_stats
+from .sync import ExpiredWatermark, InvalidWatermark, decode_watermark, get_changes
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CollectionCacheMixin, viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
     ordering_fields = ['name', 'created_at']
@@ -16,25 +44,26 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user)
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(CollectionCacheMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'priority', 'category']
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, TaskOrderingFilter]
+    filterset_class = TaskFilterSet
     search_fields = ['title', 'description']
-    ordering_fields = ['title', 'due_date', 'priority', 'status', 'created_at']
-    
-    def get_queryset(self):
-        user = self.request.user
-        queryset = Task.objects.filter(user=user)
+    ordering_fields = ['title', 'due_date', 'priority', 'status', 'position', 'created_at']
+    read_actions = ('list', 'retrieve', 'changes')
+    export_chunk_size = 1000
 
-        # ✅ Filtro por tags (por ejemplo: ?tags=1,2)
-        tag_ids = self.request.query_params.get('tags')
-        if tag_ids:
-            tag_ids = [int(tag_id) for tag_id in tag_ids.split(',')]
-            queryset = queryset.filter(tags__id__in=tag_ids).distinct()
+    def get_serializer_class(self):
+        # The browsable API renders its POST/PUT forms with a cloned request, so check the method too
+        if self.action in self.read_actions and self.request.method in SAFE_METHODS:
+            return TaskReadSerializer
+        return super().get_serializer_class()
 
-        return queryset
+    def get_queryset(self):
+        # ?tags= lo filtra TaskFilterSet
+        return Task.objects.for_user(self.request.user).with_related()
     
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
@@ -47,14 +76,190 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        if status_value != task.status:
+            task.position = bottom_keys(task.user_id, status_value)[0]
         task.status = status_value
         task.save()
         serializer = self.get_serializer(task)
         return Response(serializer.data)
 
-class TagViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            move_task(task, data.get('status', task.status), data.get('after'), data.get('before'))
+        except InvalidMove as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(task).data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = BulkTaskSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        operations = BulkTaskOperations(serializer.validated_data['operations'], self.get_serializer_context())
+        if not operations.is_valid():
+            return Response({'errors': operations.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = operations.save()
+        if results is None:
+            return Response({'errors': operations.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': results})
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        since = request.query_params.get('since')
+        try:
+            since = decode_watermark(since) if since else None
+        except ExpiredWatermark as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_410_GONE)
+        except InvalidWatermark as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 500)), 1), 1000)
+        except ValueError:
+            return Response({'error': 'Invalid limit value'}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = get_changes(request.user, since, limit)
+        changes['changes'] = self.get_serializer(changes['changes'], many=True).data
+        return Response(changes)
+
+    @action(detail=True, methods=['get', 'put', 'delete'])
+    def recurrence(self, request, pk=None):
+        task = self.get_object()
+        recurrence = TaskRecurrence.objects.filter(task=task).first()
+        if request.method == 'GET':
+            if recurrence is None:
+                raise NotFound('Task does not repeat.')
+            return Response(TaskRecurrenceSerializer(recurrence).data)
+
+        if request.method == 'DELETE':
+            if recurrence is not None:
+                with transaction.atomic():
+                    recurrence.delete()
+                    task.save(update_fields=['updated_at'])
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = TaskRecurrenceSerializer(recurrence, data=request.data, context={'task': task})
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save(task=task)
+            # Bumps updated_at, the collection version and sends task.updated
+            task.save(update_fields=['updated_at'])
+        return Response(serializer.data, status=status.HTTP_200_OK if recurrence else status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def occurrences(self, request):
+        window = OccurrenceWindowSerializer(data=request.query_params)
+        window.is_valid(raise_exception=True)
+        start, end, limit = window.validated_data['start'], window.validated_data['end'], window.validated_data['limit']
+        after = self.decode_occurrence_cursor(window.validated_data.get('cursor'))
+
+        tasks = self.filter_queryset(Task.objects.for_user(request.user))
+        # Computed occurrences are always pending
+        include_series = request.query_params.get('status') in (None, '', 'pending')
+        items, has_more = get_occurrences(tasks, start, end, limit, after, include_series)
+
+        next_link = None
+        if has_more:
+            due_date, task, occurrence = items[-1]
+            cursor = json.dumps([due_date.isoformat(), task.pk], separators=(',', ':'))
+            next_link = replace_query_param(
+                request.build_absolute_uri(), 'cursor', base64.urlsafe_b64encode(cursor.encode()).decode('ascii')
+            )
+        return Response({
+            'next': next_link,
+            'results': TaskOccurrenceSerializer(items, many=True, context=self.get_serializer_context()).data,
+        })
+
+    @staticmethod
+    def decode_occurrence_cursor(cursor):
+        if not cursor:
+            return None
+        try:
+            due_date, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            due_date = parse_datetime(due_date)
+            # Naive dates can't be compared with the occurrences' aware ones
+            if due_date is None or timezone.is_naive(due_date) or not isinstance(pk, int):
+                raise ValueError
+        except (binascii.Error, ValueError, TypeError, UnicodeError):
+            raise NotFound('Invalid cursor')
+        return due_date, pk
+
+    @action(detail=True, methods=['post'], url_path='occurrences', url_name='materialize')
+    def materialize(self, request, pk=None):
+        series = self.get_object()
+        rule = get_rule(series)
+        if rule is None:
+            return Response({'error': 'Task does not repeat'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            occurrence_date = DateTimeField().run_validation(request.data.get('occurrence_date'))
+        except ValidationError as exc:
+            return Response({'occurrence_date': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        if not rule.includes(occurrence_date):
+            return Response(
+                {'occurrence_date': ['Not an occurrence of this task.']}, status=status.HTTP_400_BAD_REQUEST
+            )
+        data = request.data.copy()
+        data.pop('occurrence_date', None)
+
+        with transaction.atomic():
+            task, created = materialize(series, occurrence_date)
+            serializer = TaskSerializer(task, data=data, partial=True, context=self.get_serializer_context())
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        return Response(get_task_stats(request.user))
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        # ?format= picks the renderer through DRF's content negotiation
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # ASGI would collect a sync iterator into a list before sending it (see todo_app.export)
+        stream = aexport_tasks if isinstance(request._request, ASGIRequest) else export_tasks
+        response = StreamingHttpResponse(
+            stream(queryset, renderer, self.export_chunk_size),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', url_name='import', parser_classes=[MultiPartParser])
+    def import_tasks(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('format') or upload.name.rpartition('.')[2].lower()
+        if file_format == 'jsonl':
+            file_format = 'ndjson'
+        if file_format not in IMPORT_FORMATS:
+            return Response({'error': 'Invalid format value'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = TaskImporter(request.user).run(upload, file_format)
+        except InvalidImportFile as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
+class TagViewSet(CollectionCacheMixin, viewsets.ModelViewSet):
     serializer_class = TagSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         return Tag.objects.filter(user=self.request.user).order_by('name')
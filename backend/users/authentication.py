@@ -0,0 +1,192 @@
+import copy
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+
+class TokenCache:
+    """
+    Token key -> (user, token) with a TTL: a bounded in-process LRU in front of a Django
+    cache shared by every process (``backend``, the ``default`` alias unless set).
+
+    The shared cache decides what is valid. Revoking a token deletes its shared entry
+    and replaces a shared generation value; a local entry is only used while the
+    generation it was stored under is still current, so a logout in one process is
+    seen by the others on their next request. A local hit costs one read of that
+    value, a miss one ``get_many`` for it and the entry. ``clear()`` also replaces
+    the epoch the shared entries were written under, which drops them all.
+
+    Only correct across processes when ``backend`` really is shared (Redis,
+    Memcached, database cache): the default LocMemCache is per process.
+    """
+    generation_key = 'auth-token:generation'
+    epoch_key = 'auth-token:epoch'
+
+    def __init__(self, max_size=1024, ttl=300, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = caches[backend or 'default']
+        # key -> (expires, generation, value)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        local = self._get_local(key)
+        if local is not None and local[0] == self.backend.get(self.generation_key):
+            return local[1]
+        shared_key = self._shared_key(key)
+        found = self.backend.get_many([self.generation_key, self.epoch_key, shared_key])
+        return self._from_shared(key, found, found.get(shared_key))
+
+    async def aget(self, key):
+        local = self._get_local(key)
+        if local is not None and local[0] == await self.backend.aget(self.generation_key):
+            return local[1]
+        shared_key = self._shared_key(key)
+        found = await self.backend.aget_many([self.generation_key, self.epoch_key, shared_key])
+        return self._from_shared(key, found, found.get(shared_key))
+
+    def set(self, key, value):
+        found = self.backend.get_many([self.generation_key, self.epoch_key])
+        epoch = found.get(self.epoch_key) or self._start(self.epoch_key)
+        self.backend.set(self._shared_key(key), (epoch, value), self.ttl)
+        self._store(key, found.get(self.generation_key), value)
+
+    async def aset(self, key, value):
+        found = await self.backend.aget_many([self.generation_key, self.epoch_key])
+        epoch = found.get(self.epoch_key) or await self._astart(self.epoch_key)
+        await self.backend.aset(self._shared_key(key), (epoch, value), self.ttl)
+        self._store(key, found.get(self.generation_key), value)
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        if keys:
+            self.backend.delete_many([self._shared_key(key) for key in keys])
+        self.backend.set(self.generation_key, uuid.uuid4().hex, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.backend.set_many({self.generation_key: uuid.uuid4().hex, self.epoch_key: uuid.uuid4().hex}, None)
+
+    def _from_shared(self, key, found, entry):
+        if entry is None:
+            return None
+        epoch, value = entry
+        if epoch != found.get(self.epoch_key):
+            return None
+        self._store(key, found.get(self.generation_key), value)
+        return value
+
+    def _start(self, name):
+        # add() keeps the value of a process that got there first
+        self.backend.add(name, uuid.uuid4().hex, None)
+        return self.backend.get(name)
+
+    async def _astart(self, name):
+        await self.backend.aadd(name, uuid.uuid4().hex, None)
+        return await self.backend.aget(name)
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, generation, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return generation, value
+                del self._entries[key]
+        return None
+
+    def _store(self, key, generation, value):
+        if generation is None:
+            # No generation yet (or it was evicted): nothing to check a local entry against
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _shared_key(key):
+        # Never put raw tokens in a shared cache
+        return 'auth-token:' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+_token_cache = None
+
+
+def get_token_cache():
+    global _token_cache
+    if _token_cache is None:
+        options = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+        _token_cache = TokenCache(
+            max_size=options.get('MAX_SIZE', 1024),
+            ttl=options.get('TTL', 300),
+            backend=options.get('BACKEND'),
+        )
+    return _token_cache
+
+
+def reset_token_cache():
+    global _token_cache
+    _token_cache = None
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that skips the token/user query
+    while the key is cached. Entries are evicted in every process when the token is
+    deleted or the user is saved or updated (see users.signals and users.models), and
+    expire after TOKEN_AUTH_CACHE['TTL'].
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return self._from_cache(cache, key, cached)
+
+        user, token = super().authenticate_credentials(key)
+        cache.set(key, (user, token))
+        return user, token
+
+    async def aauthenticate_credentials(self, key):
+        """`authenticate_credentials` for the event stream: a cached token never leaves the event loop."""
+        cache = get_token_cache()
+        cached = await cache.aget(key)
+        if cached is not None:
+            return self._from_cache(cache, key, cached)
+
+        try:
+            token = await self.get_model().objects.select_related('user').aget(key=key)
+        except self.get_model().DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        await cache.aset(key, (token.user, token))
+        return token.user, token
+
+    def _from_cache(self, cache, key, cached):
+        user, token = cached
+        if not user.is_active:
+            cache.delete(key)
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        # Each request gets its own copy so per-request mutations never leak
+        return copy.copy(user), token
@@ -1,5 +1,24 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # update() sends no post_save: evict the cached tokens of the users it changes
+        # (is_active=False...) like users.signals does for save()
+        from rest_framework.authtoken.models import Token
+        from .authentication import get_token_cache
+
+        keys = list(Token.objects.filter(user__in=self.values('pk')).values_list('key', flat=True))
+        rows = super().update(**kwargs)
+        if keys:
+            get_token_cache().delete_many(keys)
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
+
 
 # Create your models here.
 class User(AbstractUser):
@@ -7,4 +26,5 @@ class User(AbstractUser):
     # For example, you might want to add a profile picture or bio
     # profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
     # bio = models.TextField(blank=True, null=True)
-    pass
\ No newline at end of file
+
+    objects = UserManager()
\ No newline at end of file
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import get_token_cache, reset_token_cache
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    get_token_cache().delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def evict_user_tokens(sender, instance, created, **kwargs):
+    # Cached entries hold a copy of the user (is_active, username...), drop them on change
+    if created:
+        return
+    keys = list(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
+    if keys:
+        get_token_cache().delete_many(keys)
+
+
+@receiver(setting_changed)
+def reload_token_cache(setting, **kwargs):
+    if setting == 'TOKEN_AUTH_CACHE':
+        reset_token_cache()
@@ -0,0 +1,139 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from users.authentication import TokenCache, get_token_cache
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='securepassword123'
+    )
+
+
+@pytest.fixture
+def authenticate_client(user):
+    get_token_cache().clear()
+    client = APIClient()
+    token = Token.objects.create(user=user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client, token
+
+
+def me(client):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse('auth-me'))
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+
+    def test_second_request_skips_token_query(self, authenticate_client):
+        client, _ = authenticate_client
+
+        response, first = me(client)
+        assert response.status_code == status.HTTP_200_OK
+        response, second = me(client)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['username'] == 'testuser'
+        assert first == 1
+        assert second == 0
+
+    def test_logout_invalidates_cached_token(self, authenticate_client):
+        client, _ = authenticate_client
+        me(client)
+
+        response = client.post(reverse('auth-logout'))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response, _ = me(client)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deactivated_user_is_rejected(self, authenticate_client, user):
+        client, _ = authenticate_client
+        me(client)
+
+        user.is_active = False
+        user.save()
+
+        response, _ = me(client)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_invalid_token_is_not_cached(self, authenticate_client):
+        client, _ = authenticate_client
+        client.credentials(HTTP_AUTHORIZATION='Token invalid')
+
+        response, _ = me(client)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert get_token_cache().get('invalid') is None
+
+
+@pytest.mark.django_db
+class TestRevocationAcrossProcesses:
+    """A second TokenCache over the same shared backend stands in for another worker process."""
+
+    def test_logout_reaches_other_processes(self, authenticate_client):
+        client, token = authenticate_client
+        me(client)
+        other_process = TokenCache(ttl=60)
+        assert other_process.get(token.key)[1] == token
+        # Now served from that process's own LRU
+        assert other_process.get(token.key)[1] == token
+
+        client.post(reverse('auth-logout'))
+
+        assert other_process.get(token.key) is None
+
+    def test_update_deactivating_users_reaches_other_processes(self, authenticate_client, user):
+        client, token = authenticate_client
+        me(client)
+        other_process = TokenCache(ttl=60)
+        other_process.get(token.key)
+
+        User.objects.filter(pk=user.pk).update(is_active=False)
+
+        assert other_process.get(token.key) is None
+        response, _ = me(client)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_clear_drops_shared_entries(self):
+        first, second = TokenCache(ttl=60), TokenCache(ttl=60)
+        first.set('a', 1)
+        assert second.get('a') == 1
+
+        second.clear()
+
+        assert first.get('a') is None
+        assert TokenCache(ttl=60).get('a') is None
+
+
+class TestTokenCache:
+
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert list(cache._entries) == ['a', 'c']
+        # Still in the shared cache
+        assert cache.get('b') == 2
+
+    def test_entries_expire(self):
+        cache = TokenCache(max_size=2, ttl=0)
+        cache.set('a', 1)
+
+        assert cache.get('a') is None